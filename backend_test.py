@@ -5,19 +5,26 @@ Tests all Next.js API endpoints for Cloud Computing, RSS sources (AWS, Azure, GC
 translation functionality, and filtering by category, provider, and service type
 """
 
-import requests
 import json
 import time
 import sys
 from datetime import datetime
 from typing import Dict, List, Any
 
+from cache_validator import validate_cache
+from feed_cassette import default_store
+from http_metrics import TimedSession
+from readiness import refresh_timing, submit_refresh
+
 class CloudComputingBackendTester:
     def __init__(self):
         self.base_url = "http://localhost:3000"
         self.api_base = f"{self.base_url}/api"
         self.test_results = []
-        self.session = requests.Session()
+        # Every API call is timed per route (see http_metrics.py)
+        self.session = TimedSession()
+        # External feeds are replayed from recorded cassettes (see feed_cassette.py)
+        self.feeds = default_store()
         
     def log_test(self, test_name: str, success: bool, details: str = "", response_data: Any = None):
         """Log test results"""
@@ -38,6 +45,59 @@ class CloudComputingBackendTester:
             print(f"    Response: {response_data}")
         print()
 
+    def check_stats_match_recount(self, test_name: str, counters: Dict[str, int], updates: List[Dict[str, Any]],
+                                  field: str, missing_label: str):
+        """Compare counters maintained on write with a full recount of the updates"""
+        recount = {}
+        for update in updates:
+            key = update.get(field) or missing_label
+            recount[key] = recount.get(key, 0) + 1
+        
+        if counters == recount:
+            self.log_test(test_name, True, f"Counters match a full recount of {len(updates)} updates: {recount}")
+        else:
+            self.log_test(test_name, False, f"Counters {counters} differ from recount {recount}")
+
+    def verify_cloud_stats_recount(self, stats: Dict[str, Any], label: str = ""):
+        """Check /api/cloud/updates/stats counters against every stored cloud update"""
+        suffix = f" {label}" if label else ""
+        all_response = self.session.get(f"{self.api_base}/cloud/updates?limit=100000", timeout=15)
+        if all_response.status_code != 200:
+            self.log_test(f"Cloud Stats Recount{suffix}", False, f"HTTP {all_response.status_code}")
+            return
+        
+        all_updates = all_response.json().get("updates", [])
+        total = stats.get("total", 0)
+        if total != len(all_updates):
+            self.log_test(f"Cloud Stats Recount{suffix}", False,
+                        f"Stats total {total} != {len(all_updates)} stored updates")
+            return
+        
+        self.check_stats_match_recount(f"Cloud Stats Recount{suffix} (category)", stats.get("by_category", {}),
+                                       all_updates, "category", "unknown")
+        self.check_stats_match_recount(f"Cloud Stats Recount{suffix} (provider)", stats.get("by_provider", {}),
+                                       all_updates, "cloud_provider", "unknown")
+        self.check_stats_match_recount(f"Cloud Stats Recount{suffix} (service type)", stats.get("by_service_type", {}),
+                                       all_updates, "service_type", "unknown")
+
+    def verify_starlink_stats_recount(self, stats: Dict[str, Any], label: str = ""):
+        """Check /api/starlink/updates/stats counters against every stored Starlink update"""
+        suffix = f" {label}" if label else ""
+        all_response = self.session.get(f"{self.api_base}/starlink/updates?limit=100000", timeout=15)
+        if all_response.status_code != 200:
+            self.log_test(f"Starlink Stats Recount{suffix}", False, f"HTTP {all_response.status_code}")
+            return
+        
+        all_updates = all_response.json().get("updates", [])
+        total = stats.get("total", 0)
+        if total != len(all_updates):
+            self.log_test(f"Starlink Stats Recount{suffix}", False,
+                        f"Stats total {total} != {len(all_updates)} stored updates")
+            return
+        
+        self.check_stats_match_recount(f"Starlink Stats Recount{suffix}", stats.get("categories", {}),
+                                       all_updates, "category", "uncategorized")
+
     def test_health_endpoints(self):
         """Test basic health and test endpoints"""
         print("🔍 Testing Health Endpoints...")
@@ -182,13 +242,15 @@ class CloudComputingBackendTester:
 
         # Test POST /api/windows/updates/refresh (French RSS sources)
         try:
-            response = self.session.post(f"{self.api_base}/windows/updates/refresh", timeout=45)
-            if response.status_code == 200:
-                data = response.json()
+            # The refresh runs as a background job: submit it and poll its status
+            outcome = submit_refresh(self.session, f"{self.api_base}/windows/updates/refresh")
+            if outcome["ok"]:
+                data = outcome["result"]
                 if "message" in data:
                     stored = data.get("stored", 0)
                     total = data.get("total", 0)
-                    self.log_test("French RSS Refresh", True, f"Refresh response: {data.get('message')}, Stored: {stored}/{total}")
+                    self.log_test("French RSS Refresh", True, f"Refresh response: {data.get('message')}, Stored: {stored}/{total} "
+                                  f"({refresh_timing(outcome)})")
                     
                     # Verify French RSS sources were fetched
                     if stored > 0:
@@ -198,7 +260,7 @@ class CloudComputingBackendTester:
                 else:
                     self.log_test("French RSS Refresh", False, "Missing message field", data)
             else:
-                self.log_test("French RSS Refresh", False, f"HTTP {response.status_code}", response.text)
+                self.log_test("French RSS Refresh", False, outcome["error"], outcome["job"])
         except Exception as e:
             self.log_test("French RSS Refresh", False, f"Connection error: {str(e)}")
 
@@ -244,7 +306,7 @@ class CloudComputingBackendTester:
                     working_sources = 0
                     for url in rss_urls:
                         try:
-                            rss_response = self.session.get(url, timeout=10, headers={
+                            rss_response = self.feeds.get(url, timeout=10, headers={
                                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
                             })
                             if rss_response.status_code == 200:
@@ -379,6 +441,9 @@ class CloudComputingBackendTester:
                     categories = data.get("categories", {})
                     self.log_test("Get Starlink Updates Stats", True, f"Total: {total}, Categories: {list(categories.keys())}")
                     
+                    # Counters are maintained on write: they must match a full recount
+                    self.verify_starlink_stats_recount(data)
+                    
                     # Verify we have the expected 38 articles from starlink-cache.json
                     if total == 38:
                         self.log_test("Starlink Data Count Verification", True, f"Expected 38 articles, found {total}")
@@ -416,15 +481,23 @@ class CloudComputingBackendTester:
 
         # Test POST /api/starlink/updates/refresh
         try:
-            response = self.session.post(f"{self.api_base}/starlink/updates/refresh", timeout=30)
-            if response.status_code == 200:
-                data = response.json()
+            outcome = submit_refresh(self.session, f"{self.api_base}/starlink/updates/refresh")
+            if outcome["ok"]:
+                data = outcome["result"]
                 if "message" in data:
-                    self.log_test("Starlink RSS Refresh", True, f"Refresh response: {data.get('message')}")
+                    self.log_test("Starlink RSS Refresh", True, f"Refresh response: {data.get('message')} "
+                                  f"({refresh_timing(outcome)})")
+                    
+                    # Counters are maintained on write: they must still match a recount after the refresh
+                    stats_after = self.session.get(f"{self.api_base}/starlink/updates/stats", timeout=10)
+                    if stats_after.status_code == 200:
+                        self.verify_starlink_stats_recount(stats_after.json(), "After Refresh")
+                    else:
+                        self.log_test("Starlink Stats Recount After Refresh", False, f"HTTP {stats_after.status_code}")
                 else:
                     self.log_test("Starlink RSS Refresh", False, "Missing message field", data)
             else:
-                self.log_test("Starlink RSS Refresh", False, f"HTTP {response.status_code}", response.text)
+                self.log_test("Starlink RSS Refresh", False, outcome["error"], outcome["job"])
         except Exception as e:
             self.log_test("Starlink RSS Refresh", False, f"Connection error: {str(e)}")
 
@@ -432,37 +505,49 @@ class CloudComputingBackendTester:
         """Test that JSON data files are properly stored and accessible"""
         print("🔍 Testing JSON Data Storage Verification...")
         
-        # Test Windows data storage (rss-cache.json)
+        # Test Windows data storage (rss-cache.json), streamed record by record (see cache_validator.py)
         try:
-            with open("/app/data/rss-cache.json", "r") as f:
-                windows_data = json.load(f)
-                if "updates" in windows_data:
-                    updates_count = len(windows_data.get("updates", []))
-                    self.log_test("Windows JSON Storage", True, f"Found {updates_count} Windows updates in storage")
-                else:
-                    self.log_test("Windows JSON Storage", False, "Invalid Windows data structure")
+            windows_report = validate_cache("/app/data/rss-cache.json", "windows")
+            if "updates" in windows_report["keys"]:
+                self.log_test("Windows JSON Storage", True,
+                            f"Found {windows_report['records']} Windows updates in storage "
+                            f"({windows_report['records_per_s']} records/s)")
+                self.log_validation("Windows JSON Records", windows_report)
+            else:
+                self.log_test("Windows JSON Storage", False, "Invalid Windows data structure")
         except Exception as e:
             self.log_test("Windows JSON Storage", False, f"Error reading Windows data: {str(e)}")
         
         # Test Starlink data storage (starlink-cache.json)
         try:
-            with open("/app/data/starlink-cache.json", "r") as f:
-                starlink_data = json.load(f)
-                if "updates" in starlink_data and "total" in starlink_data:
-                    total_starlink = starlink_data.get("total", 0)
-                    updates_count = len(starlink_data.get("updates", []))
-                    self.log_test("Starlink JSON Storage", True, f"Found {updates_count} Starlink updates in storage (total: {total_starlink})")
-                    
-                    # Verify the expected 38 articles
-                    if total_starlink == 38:
-                        self.log_test("Starlink Storage Count", True, f"Confirmed 38 Starlink articles as expected")
-                    else:
-                        self.log_test("Starlink Storage Count", False, f"Expected 38 articles, found {total_starlink}")
+            starlink_report = validate_cache("/app/data/starlink-cache.json", "starlink")
+            if "updates" in starlink_report["keys"] and "total" in starlink_report["keys"]:
+                total_starlink = starlink_report["declared_total"]
+                updates_count = starlink_report["records"]
+                self.log_test("Starlink JSON Storage", True, f"Found {updates_count} Starlink updates in storage (total: {total_starlink})")
+                self.log_validation("Starlink JSON Records", starlink_report)
+                
+                # Verify the expected 38 articles
+                if total_starlink == 38:
+                    self.log_test("Starlink Storage Count", True, f"Confirmed 38 Starlink articles as expected")
                 else:
-                    self.log_test("Starlink JSON Storage", False, "Invalid Starlink data structure")
+                    self.log_test("Starlink Storage Count", False, f"Expected 38 articles, found {total_starlink}")
+            else:
+                self.log_test("Starlink JSON Storage", False, "Invalid Starlink data structure")
         except Exception as e:
             self.log_test("Starlink JSON Storage", False, f"Error reading Starlink data: {str(e)}")
 
+    def log_validation(self, test_name: str, report: Dict[str, Any]):
+        """Log the per-record checks of a cache_validator report"""
+        if report["valid"]:
+            self.log_test(test_name, True,
+                        f"{report['records']} records: required fields, dates and unique ids/links OK")
+        else:
+            self.log_test(test_name, False,
+                        f"Missing fields: {report['missing_fields']}, bad dates: {report['bad_dates']}, "
+                        f"duplicates: {report['duplicates']}, declared total: {report['declared_total']}",
+                        report["samples"])
+
     def test_data_quality_both_systems(self):
         """Test data quality for both Windows and Starlink systems"""
         print("🔍 Testing Data Quality for Both Systems...")
@@ -761,6 +846,9 @@ class CloudComputingBackendTester:
                     
                     self.log_test("Get Cloud Updates Stats", True, 
                         f"Total: {total}, Categories: {len(categories)}, Providers: {len(providers)}, Service Types: {len(service_types)}, Recent 7d: {recent_7}, Recent 30d: {recent_30}")
+                    
+                    # Counters are maintained on write: they must match a full recount
+                    self.verify_cloud_stats_recount(data)
                 else:
                     self.log_test("Get Cloud Updates Stats", False, f"Missing stats fields: {missing_stats}", data)
             else:
@@ -806,33 +894,43 @@ class CloudComputingBackendTester:
 
         # Test POST /api/cloud/updates/refresh
         try:
-            response = self.session.post(f"{self.api_base}/cloud/updates/refresh", timeout=60)
-            if response.status_code == 200:
-                data = response.json()
+            outcome = submit_refresh(self.session, f"{self.api_base}/cloud/updates/refresh")
+            if outcome["ok"]:
+                data = outcome["result"]
                 if "success" in data and "message" in data and "count" in data:
                     success = data.get("success", False)
                     count = data.get("count", 0)
                     message = data.get("message", "")
                     
                     if success and count > 0:
-                        self.log_test("Cloud RSS Refresh", True, f"Refresh successful: {message} ({count} updates)")
+                        self.log_test("Cloud RSS Refresh", True, f"Refresh successful: {message} ({count} updates, "
+                                      f"{refresh_timing(outcome)})")
                         
                         # Verify that cloud-cache.json was created/updated
                         try:
                             with open("/app/data/cloud-cache.json", "r") as f:
                                 cache_data = json.load(f)
-                                if len(cache_data) > 0:
-                                    self.log_test("Cloud Cache File Creation", True, f"Cache file contains {len(cache_data)} updates")
+                                # The cache used to be a bare array, it now carries updates and stats
+                                cached_updates = cache_data.get("updates", []) if isinstance(cache_data, dict) else cache_data
+                                if len(cached_updates) > 0:
+                                    self.log_test("Cloud Cache File Creation", True, f"Cache file contains {len(cached_updates)} updates")
                                 else:
                                     self.log_test("Cloud Cache File Creation", False, "Cache file is empty")
                         except Exception as cache_error:
                             self.log_test("Cloud Cache File Creation", False, f"Cache file error: {str(cache_error)}")
+                        
+                        # Counters are recomputed on write: they must match a recount after the refresh
+                        stats_after = self.session.get(f"{self.api_base}/cloud/updates/stats", timeout=10)
+                        if stats_after.status_code == 200:
+                            self.verify_cloud_stats_recount(stats_after.json(), "After Refresh")
+                        else:
+                            self.log_test("Cloud Stats Recount After Refresh", False, f"HTTP {stats_after.status_code}")
                     else:
                         self.log_test("Cloud RSS Refresh", False, f"Refresh failed or no updates: {message}")
                 else:
                     self.log_test("Cloud RSS Refresh", False, "Missing required response fields", data)
             else:
-                self.log_test("Cloud RSS Refresh", False, f"HTTP {response.status_code}", response.text)
+                self.log_test("Cloud RSS Refresh", False, outcome["error"], outcome["job"])
         except Exception as e:
             self.log_test("Cloud RSS Refresh", False, f"Connection error: {str(e)}")
 
@@ -1024,9 +1122,14 @@ class CloudComputingBackendTester:
                 if not result["success"]:
                     print(f"  - {result['test']}: {result['details']}")
         
+        self.session.recorder.print_report()
+        self.session.memo.print_report()
+        self.feeds.print_report()
+        
         # Save detailed results
         with open("/tmp/backend_test_results.json", "w") as f:
-            json.dump(self.test_results, f, indent=2, default=str)
+            json.dump({"tests": self.test_results, "latency": self.session.recorder.summary()},
+                      f, indent=2, default=str)
         
         print(f"\n📄 Detailed results saved to: /tmp/backend_test_results.json")
         
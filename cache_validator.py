@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Validation en flux des caches JSON (/app/data/*.json)
+Le tableau "updates" est lu élément par élément (json.raw_decode sur un tampon
+glissant d'environ un bloc, indenté ou compact) : les enregistrements ne sont jamais
+chargés ensemble. La mémoire reste proportionnelle au fichier pour la détection des
+doublons : O(taille / 100) bits de filtres de Bloom (~1,2 % de la taille du fichier par
+champ unique) plus O(candidats), les vrais doublons et ~1 % de faux positifs.
+Chaque enregistrement est contrôlé :
+    - champs obligatoires du schéma de la source (ceux vérifiés par les testeurs) ;
+    - dates ISO 8601 (published_date, created_at, updated_at) ;
+    - doublons d'id et de lien : un filtre de Bloom signale les candidats pendant la
+      lecture, une seconde passe compte exactement ces seuls candidats.
+Le total déclaré (total / stats.total) est comparé au nombre d'enregistrements lus.
+
+Usage:
+    python cache_validator.py                          # les trois caches de RSS_DATA_DIR
+    python cache_validator.py /tmp/big-rss-cache.json --schema windows
+    python cache_validator.py --json                   # rapport complet en JSON
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import re
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+DATA_DIR = os.environ.get("RSS_DATA_DIR", "/app/data")
+CHUNK_SIZE = 1 << 20
+MAX_SAMPLES = 10
+
+BASE_FIELDS = ["id", "title", "description", "link", "published_date", "category", "source",
+               "created_at", "updated_at"]
+SCHEMAS = {
+    "windows": {"file": "rss-cache.json", "required": BASE_FIELDS},
+    "starlink": {"file": "starlink-cache.json", "required": BASE_FIELDS},
+    "cloud": {"file": "cloud-cache.json", "required": BASE_FIELDS + ["service_type", "cloud_provider", "tags"]},
+}
+DATE_FIELDS = ["published_date", "created_at", "updated_at"]
+UNIQUE_FIELDS = ["id", "link"]
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+DECODER = json.JSONDecoder()
+
+
+class JSONStream:
+    """Sliding-window reader over a JSON text, decoding one value at a time"""
+
+    def __init__(self, f, chunk_size: int = CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        # Drop what has been consumed so the buffer stays about one chunk long
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            self.pos = WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ""
+
+    def take(self, expected: str) -> str:
+        char = self.peek()
+        if char not in expected:
+            raise ValueError(f"JSON inattendu à la position {self.pos}: {char!r} au lieu de {expected!r}")
+        self.pos += 1
+        return char
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = DECODER.raw_decode(self.buf, self.pos)
+                # A number cut by the end of the buffer decodes too: only trust values followed by something
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.fill()
+
+
+def iter_updates(path: str, meta: Dict[str, Any], chunk_size: int = CHUNK_SIZE) -> Iterator[Any]:
+    """Yield the elements of the top-level "updates" array; other top-level keys go to `meta`,
+    "updates" itself to its element count"""
+    with open(path, "r", encoding="utf-8") as f:
+        stream = JSONStream(f, chunk_size)
+        stream.take("{")
+        if stream.peek() == "}":
+            return
+        while True:
+            key = stream.value()
+            stream.take(":")
+            if key == "updates" and stream.peek() == "[":
+                stream.take("[")
+                meta[key] = 0
+                if stream.peek() == "]":
+                    stream.take("]")
+                else:
+                    while True:
+                        yield stream.value()
+                        meta[key] += 1
+                        if stream.take(",]") == "]":
+                            break
+            else:
+                meta[key] = stream.value()
+            if stream.take(",}") == "}":
+                return
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.size = max(64, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def add(self, key: str) -> bool:
+        """Add key, True if it was possibly there already"""
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        present = True
+        for i in range(self.hashes):
+            bit = (h1 + i * h2) % self.size
+            mask = 1 << (bit & 7)
+            if not self.bits[bit >> 3] & mask:
+                present = False
+                self.bits[bit >> 3] |= mask
+        return present
+
+
+def valid_date(value: Any) -> bool:
+    if not isinstance(value, str):
+        return False
+    try:
+        datetime.fromisoformat(value.replace("Z", "+00:00"))
+        return True
+    except ValueError:
+        return False
+
+
+def schema_for(path: str) -> str:
+    name = os.path.basename(path)
+    for schema, spec in SCHEMAS.items():
+        if name == spec["file"]:
+            return schema
+    return "windows"
+
+
+def validate_cache(path: str, schema: Optional[str] = None, chunk_size: int = CHUNK_SIZE,
+                   max_samples: int = MAX_SAMPLES) -> Dict[str, Any]:
+    """Stream-validate one cache file and return the report"""
+    schema = schema or schema_for(path)
+    required = SCHEMAS[schema]["required"]
+    size = os.path.getsize(path)
+    # A record is several hundred bytes: file size / 100 over-estimates the count.
+    # ~9.6 bits per expected record and field, i.e. memory grows with the file (see module doc)
+    blooms = {field: BloomFilter(max(1000, size // 100)) for field in UNIQUE_FIELDS}
+    suspects: Dict[str, set] = {field: set() for field in UNIQUE_FIELDS}
+    missing = {field: 0 for field in required}
+    bad_dates = {field: 0 for field in DATE_FIELDS}
+    not_objects = 0
+    samples: List[str] = []
+    meta: Dict[str, Any] = {}
+
+    def sample(message: str):
+        if len(samples) < max_samples:
+            samples.append(message)
+
+    start = time.perf_counter()
+    records = 0
+    for index, record in enumerate(iter_updates(path, meta, chunk_size)):
+        records += 1
+        if not isinstance(record, dict):
+            not_objects += 1
+            sample(f"#{index}: enregistrement non objet ({type(record).__name__})")
+            continue
+        for field in required:
+            if field not in record:
+                missing[field] += 1
+                sample(f"#{index}: champ {field} manquant")
+        for field in DATE_FIELDS:
+            if field in record and not valid_date(record[field]):
+                bad_dates[field] += 1
+                sample(f"#{index}: {field} invalide: {str(record[field])[:40]}")
+        for field in UNIQUE_FIELDS:
+            value = record.get(field)
+            if value is not None and blooms[field].add(str(value)):
+                suspects[field].add(str(value))
+    first_pass = time.perf_counter() - start
+
+    # Exact count of the Bloom candidates only (true duplicates + ~1% false positives)
+    duplicates = {field: 0 for field in UNIQUE_FIELDS}
+    if any(suspects.values()):
+        seen = {field: {} for field in UNIQUE_FIELDS}
+        for record in iter_updates(path, {}, chunk_size):
+            if not isinstance(record, dict):
+                continue
+            for field in UNIQUE_FIELDS:
+                value = record.get(field)
+                if value is not None and str(value) in suspects[field]:
+                    seen[field][str(value)] = seen[field].get(str(value), 0) + 1
+        for field, counts in seen.items():
+            for value, count in counts.items():
+                if count > 1:
+                    duplicates[field] += count - 1
+                    sample(f"{field} en double ({count}x): {value[:60]}")
+    duration = time.perf_counter() - start
+
+    declared = meta.get("total")
+    if declared is None and isinstance(meta.get("stats"), dict):
+        declared = meta["stats"].get("total")
+    total_mismatch = declared is not None and declared != records
+    if total_mismatch:
+        sample(f"total déclaré {declared} != {records} enregistrements")
+
+    problems = not_objects + sum(missing.values()) + sum(bad_dates.values()) + sum(duplicates.values())
+    return {
+        "path": path,
+        "schema": schema,
+        "bytes": size,
+        "records": records,
+        "keys": sorted(meta),
+        "last_updated": meta.get("lastUpdated"),
+        "declared_total": declared,
+        "missing_fields": {k: v for k, v in missing.items() if v},
+        "bad_dates": {k: v for k, v in bad_dates.items() if v},
+        "duplicates": duplicates,
+        "duplicate_candidates": {k: len(v) for k, v in suspects.items()},
+        "not_objects": not_objects,
+        "samples": samples,
+        "valid": problems == 0 and not total_mismatch,
+        "duration_s": round(duration, 3),
+        "first_pass_s": round(first_pass, 3),
+        "records_per_s": round(records / first_pass) if first_pass > 0 else 0,
+    }
+
+
+def print_report(report: Dict[str, Any]):
+    status = "✅" if report["valid"] else "❌"
+    print(f"{status} {report['path']} ({report['schema']}): {report['records']} enregistrements, "
+          f"{report['bytes'] / 1e6:.1f} Mo, {report['records_per_s']} enr/s ({report['duration_s']}s)")
+    if report["missing_fields"]:
+        print(f"    Champs manquants: {report['missing_fields']}")
+    if report["bad_dates"]:
+        print(f"    Dates invalides: {report['bad_dates']}")
+    if any(report["duplicates"].values()):
+        print(f"    Doublons: {report['duplicates']}")
+    for message in report["samples"]:
+        print(f"    - {message}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Validation en flux des caches JSON")
+    parser.add_argument("paths", nargs="*", help=f"fichiers à valider (défaut: les trois caches de {DATA_DIR})")
+    parser.add_argument("--schema", choices=sorted(SCHEMAS), default=None,
+                        help="schéma à appliquer (défaut: déduit du nom du fichier)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--json", action="store_true", help="afficher le rapport en JSON")
+    args = parser.parse_args()
+
+    paths = args.paths or [os.path.join(DATA_DIR, spec["file"]) for spec in SCHEMAS.values()]
+    reports = []
+    for path in paths:
+        if not os.path.exists(path):
+            print(f"⚠️  {path} introuvable")
+            continue
+        try:
+            report = validate_cache(path, args.schema, args.chunk_size)
+        except ValueError as e:
+            report = {"path": path, "valid": False, "error": str(e)}
+            print(f"❌ {path}: JSON invalide: {e}")
+        else:
+            if not args.json:
+                print_report(report)
+        reports.append(report)
+
+    if args.json:
+        print(json.dumps(reports, indent=2, ensure_ascii=False))
+    return 0 if reports and all(report["valid"] for report in reports) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Enregistrement / rejeu des flux RSS externes pour les testeurs Python
+La première exécution télécharge chaque flux et l'enregistre (statut, en-têtes et
+corps, compressés en gzip) ; les exécutions suivantes le rejouent depuis le disque.
+
+Politique de rafraîchissement (RSS_CASSETTE_MODE) :
+    once     rejoue si la cassette existe et a moins de RSS_CASSETTE_MAX_AGE secondes,
+             sinon télécharge et enregistre (défaut)
+    refresh  télécharge et réenregistre systématiquement
+    replay   rejoue uniquement, aucun accès réseau (cassette absente = erreur)
+    off      accès réseau direct, rien n'est lu ni écrit
+
+Les cassettes sont rangées dans RSS_CASSETTE_DIR (défaut: .feed-cassettes à la racine).
+
+Usage:
+    python feed_cassette.py                   # état des cassettes enregistrées
+    python feed_cassette.py --purge-older 86400
+"""
+
+import argparse
+import base64
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+DEFAULT_DIR = Path(__file__).resolve().parent / ".feed-cassettes"
+DEFAULT_MAX_AGE = 7 * 24 * 3600
+MODES = ("once", "refresh", "replay", "off")
+
+
+class CassetteMiss(Exception):
+    """Replay-only mode and no cassette recorded for this URL"""
+
+
+class CassetteResponse:
+    """The parts of requests.Response the testers use, rebuilt from a cassette"""
+
+    def __init__(self, url: str, status_code: int, headers: Dict[str, str], content: bytes,
+                 source: str, recorded_at: float):
+        self.url = url
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = content
+        self.source = source          # "cassette", "network" or "stale"
+        self.recorded_at = recorded_at
+
+    @property
+    def encoding(self) -> str:
+        content_type = self.headers.get("content-type", "")
+        for part in content_type.split(";"):
+            part = part.strip()
+            if part.lower().startswith("charset="):
+                return part.split("=", 1)[1].strip('"')
+        return "utf-8"
+
+    @property
+    def text(self) -> str:
+        try:
+            return self.content.decode(self.encoding, errors="replace")
+        except LookupError:
+            return self.content.decode("utf-8", errors="replace")
+
+
+class CassetteStore:
+    def __init__(self, directory: Optional[str] = None, mode: Optional[str] = None,
+                 max_age: Optional[float] = None):
+        self.directory = Path(directory or os.environ.get("RSS_CASSETTE_DIR") or DEFAULT_DIR)
+        self.mode = mode or os.environ.get("RSS_CASSETTE_MODE", "once")
+        if self.mode not in MODES:
+            raise ValueError(f"RSS_CASSETTE_MODE inconnu: {self.mode} (attendu: {', '.join(MODES)})")
+        self.max_age = max_age if max_age is not None else float(os.environ.get("RSS_CASSETTE_MAX_AGE", DEFAULT_MAX_AGE))
+        self.session = requests.Session()
+        self.lock = threading.Lock()
+        self.counters = {"hits": 0, "misses": 0, "refreshed": 0, "stale": 0, "errors": 0}
+        self.bytes_replayed = 0
+        self.bytes_downloaded = 0
+
+    def path_for(self, url: str, method: str = "GET") -> Path:
+        digest = hashlib.sha1(f"{method} {url}".encode("utf-8")).hexdigest()
+        return self.directory / f"{digest}.json.gz"
+
+    def count(self, counter: str, replayed: int = 0, downloaded: int = 0):
+        with self.lock:
+            self.counters[counter] += 1
+            self.bytes_replayed += replayed
+            self.bytes_downloaded += downloaded
+
+    def load(self, path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, path: Path, entry: Dict[str, Any]):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with gzip.open(temp_path, "wt", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(temp_path, path)
+
+    def from_entry(self, entry: Dict[str, Any], source: str) -> CassetteResponse:
+        return CassetteResponse(entry["url"], entry["status"], entry["headers"],
+                                base64.b64decode(entry["body"]), source, entry["recorded_at"])
+
+    def record(self, url: str, path: Path, headers: Optional[Dict[str, str]], timeout: float) -> CassetteResponse:
+        response = self.session.get(url, headers=headers, timeout=timeout)
+        entry = {
+            "url": url,
+            "method": "GET",
+            "recorded_at": time.time(),
+            "status": response.status_code,
+            "headers": dict(response.headers),
+            "body": base64.b64encode(response.content).decode("ascii"),
+        }
+        # Server errors are transient: do not keep them as the reference response
+        if response.status_code < 500:
+            self.save(path, entry)
+        return self.from_entry(entry, "network")
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None, timeout: float = 15):
+        """GET through the cassette store, following the configured refresh policy"""
+        if self.mode == "off":
+            response = self.session.get(url, headers=headers, timeout=timeout)
+            self.count("misses", downloaded=len(response.content))
+            return response
+
+        path = self.path_for(url)
+        entry = self.load(path) if path.exists() else None
+        fresh = entry is not None and time.time() - entry["recorded_at"] <= self.max_age
+
+        if entry is not None and (self.mode == "replay" or (self.mode == "once" and fresh)):
+            response = self.from_entry(entry, "cassette")
+            self.count("hits", replayed=len(response.content))
+            return response
+        if self.mode == "replay":
+            self.count("errors")
+            raise CassetteMiss(f"Aucune cassette pour {url} (mode replay)")
+
+        try:
+            response = self.record(url, path, headers, timeout)
+        except requests.RequestException:
+            if entry is None:
+                self.count("errors")
+                raise
+            # Network unavailable: an old recording is better than nothing
+            response = self.from_entry(entry, "stale")
+            self.count("stale", replayed=len(response.content))
+            return response
+
+        self.count("refreshed" if entry is not None else "misses", downloaded=len(response.content))
+        return response
+
+    def report(self) -> Dict[str, Any]:
+        with self.lock:
+            lookups = sum(self.counters.values())
+            return {
+                "mode": self.mode,
+                "directory": str(self.directory),
+                **self.counters,
+                "hit_rate": (self.counters["hits"] + self.counters["stale"]) / lookups if lookups else 0,
+                "bytes_replayed": self.bytes_replayed,
+                "bytes_downloaded": self.bytes_downloaded,
+            }
+
+    def print_report(self):
+        report = self.report()
+        if not any(report[key] for key in self.counters):
+            return
+        print(f"📼 Cassettes flux RSS ({report['mode']}, {report['directory']}): "
+              f"{report['hits']} rejouées, {report['misses']} enregistrées, {report['refreshed']} rafraîchies, "
+              f"{report['stale']} périmées rejouées, {report['errors']} erreurs "
+              f"- hit rate {report['hit_rate'] * 100:.0f}%, "
+              f"{report['bytes_replayed']} octets rejoués / {report['bytes_downloaded']} téléchargés")
+
+
+_default_store: Optional[CassetteStore] = None
+_default_lock = threading.Lock()
+
+
+def default_store() -> CassetteStore:
+    """Store shared by every tester of the process (configured from the environment)"""
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = CassetteStore()
+        return _default_store
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="État des cassettes de flux RSS")
+    parser.add_argument("--dir", default=None, help="répertoire des cassettes (défaut: RSS_CASSETTE_DIR)")
+    parser.add_argument("--purge-older", type=float, default=None, metavar="SECONDS",
+                        help="supprimer les cassettes enregistrées il y a plus de SECONDS secondes")
+    args = parser.parse_args()
+
+    store = CassetteStore(args.dir, mode="replay")
+    now = time.time()
+    paths = sorted(store.directory.glob("*.json.gz")) if store.directory.exists() else []
+    print(f"📼 {len(paths)} cassettes dans {store.directory}")
+    for path in paths:
+        entry = store.load(path)
+        if entry is None:
+            print(f"  ❌ {path.name}: illisible")
+            continue
+        age = now - entry["recorded_at"]
+        print(f"  {entry['status']}  {age / 3600:7.1f}h  {path.stat().st_size:8d} o  {entry['url']}")
+        if args.purge_older is not None and age > args.purge_older:
+            path.unlink()
+            print("      🗑️  supprimée")
@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+"""
+Serveur de flux RSS/Atom local pour des refresh reproductibles sans réseau
+Remplace les sources réelles (Microsoft, Le Monde Informatique, IT-Connect, LeMagIT,
+AWS, Google, SpaceNews...) : l'application y est redirigée avec
+
+    RSS_FEED_BASE_URL=http://localhost:8765
+
+qui transforme https://<host>/<path> en http://localhost:8765/feeds/<host>/<path>.
+Chaque flux est synthétique et déterministe (mêmes titres et liens à chaque requête),
+ou rejoué depuis un fichier enregistré (--recordings).
+
+Réglages par flux : nombre d'items, taille des descriptions, latence, taux d'erreur,
+corps envoyé au goutte-à-goutte, validateurs HTTP. Avec validators (par défaut), chaque
+flux porte un ETag (empreinte du corps) et un Last-Modified (dernier changement de
+configuration) ; If-None-Match / If-Modified-Since qui correspondent reçoivent un 304
+sans corps, compté dans not_modified. Les réglages se changent aussi à chaud :
+
+    GET  /_stub/stats      compteurs par flux
+    GET  /_stub/config     configuration courante
+    POST /_stub/config     {"defaults": {...}, "overrides": {"lemagit": {...}}}
+    POST /_stub/reset      remise à zéro des compteurs
+
+Usage:
+    python feed_stub_server.py --port 8765
+    python feed_stub_server.py --items 50 --latency-ms 200 --error-rate 0.1
+    python feed_stub_server.py --config stub.json --recordings ./recorded-feeds
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+from urllib.request import urlopen
+from xml.sax.saxutils import escape
+
+DEFAULT_SETTINGS = {
+    "items": 20,             # items per feed
+    "payload_bytes": 400,    # approximate size of each description
+    "latency_ms": 0,         # delay before the response headers
+    "error_rate": 0.0,       # share of requests answered with HTTP 503
+    "slow_drip_ms": 0,       # delay between two body chunks (0 = send at once)
+    "chunk_bytes": 1024,     # size of the slow-drip chunks
+    "format": "rss",         # rss or atom
+    "validators": True,      # ETag / Last-Modified, 304 on matching conditional requests
+}
+
+# Vocabulary per family of sources, so that each fetcher's relevance filter keeps the items
+TOPICS = {
+    "starlink": {
+        "hosts": ("spacenews", "teslarati", "space.com", "spacex", "starlink"),
+        "subjects": ["Starlink", "SpaceX Falcon 9", "Starship", "Dragon crew", "satellite internet"],
+        "verbs": ["launch", "mission update", "constellation expansion", "booster landing", "orbit test"],
+    },
+    "cloud": {
+        "hosts": ("aws", "azure", "google", "cloud"),
+        "subjects": ["AWS Lambda", "Azure Kubernetes Service", "Google Cloud Run", "serverless", "cloud infrastructure"],
+        "verbs": ["new feature", "security update", "general availability", "pricing change", "region launch"],
+    },
+    "windows": {
+        "hosts": (),
+        "subjects": ["Windows Server 2025", "Windows 11 24H2", "Active Directory", "Hyper-V", "Microsoft 365"],
+        "verbs": ["mise à jour de sécurité", "nouvelle fonctionnalité", "correctif cumulatif", "déploiement en entreprise", "migration"],
+    },
+}
+
+
+def topic_for(host: str) -> str:
+    for name, topic in TOPICS.items():
+        if any(marker in host for marker in topic["hosts"]):
+            return name
+    return "windows"
+
+
+def recording_name(feed_key: str) -> str:
+    """File name of a recorded feed body for host/path?query"""
+    return re.sub(r"[^A-Za-z0-9._-]", "_", feed_key) + ".xml"
+
+
+def build_feed(feed_key: str, settings: Dict[str, Any], anchor: datetime) -> bytes:
+    """Deterministic synthetic feed: same key and settings give the same document"""
+    host = feed_key.split("/", 1)[0]
+    topic = TOPICS[topic_for(host)]
+    rng = random.Random(hashlib.sha1(feed_key.encode("utf-8")).hexdigest())
+    filler = ("Lorem ipsum infrastructure cloud sécurité mise à jour déploiement. " * 64)
+    items = []
+    for i in range(settings["items"]):
+        subject = rng.choice(topic["subjects"])
+        verb = rng.choice(topic["verbs"])
+        title = f"{subject} : {verb} #{i + 1}"
+        link = f"https://{feed_key.rstrip('/')}/stub-item-{i + 1}"
+        published = anchor - timedelta(hours=i * 3 + rng.randint(0, 2))
+        body_size = max(0, settings["payload_bytes"] - len(title))
+        description = f"{title}. " + filler[: body_size]
+        items.append((title, link, published, description))
+
+    if settings["format"] == "atom":
+        entries = "".join(
+            f"<entry><title>{escape(t)}</title><link href=\"{escape(l)}\"/><id>{escape(l)}</id>"
+            f"<updated>{p.isoformat().replace('+00:00', 'Z')}</updated><summary>{escape(d)}</summary></entry>"
+            for t, l, p, d in items
+        )
+        document = (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            f'<feed xmlns="http://www.w3.org/2005/Atom"><title>Stub {escape(feed_key)}</title>'
+            f'<updated>{anchor.isoformat().replace("+00:00", "Z")}</updated>{entries}</feed>'
+        )
+    else:
+        entries = "".join(
+            f"<item><title>{escape(t)}</title><link>{escape(l)}</link>"
+            f"<pubDate>{format_datetime(p, usegmt=True)}</pubDate>"
+            f"<description>{escape(d)}</description></item>"
+            for t, l, p, d in items
+        )
+        document = (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            f'<rss version="2.0"><channel><title>Stub {escape(feed_key)}</title>'
+            f'<link>https://{escape(feed_key)}</link>{entries}</channel></rss>'
+        )
+    return document.encode("utf-8")
+
+
+class FeedStubState:
+    """Settings and counters shared by the request handler threads"""
+
+    def __init__(self, defaults: Optional[Dict[str, Any]] = None,
+                 overrides: Optional[Dict[str, Dict[str, Any]]] = None,
+                 recordings_dir: Optional[str] = None, seed: int = 42):
+        self.lock = threading.Lock()
+        self.defaults = {**DEFAULT_SETTINGS, **(defaults or {})}
+        self.overrides = dict(overrides or {})
+        self.recordings_dir = recordings_dir
+        self.rng = random.Random(seed)
+        # Publication dates are anchored on the start hour so titles/dates stay stable during a run
+        self.anchor = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+        # Last-Modified of every feed: a configuration change may change the documents
+        self.modified = self.anchor
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.feeds: Dict[str, Dict[str, int]] = {}
+            self.started = time.time()
+
+    def settings_for(self, feed_key: str) -> Dict[str, Any]:
+        """Defaults, then every override whose pattern is a substring of host/path"""
+        with self.lock:
+            settings = dict(self.defaults)
+            for pattern, values in self.overrides.items():
+                if pattern in feed_key:
+                    settings.update(values)
+        return settings
+
+    def should_fail(self, error_rate: float) -> bool:
+        with self.lock:
+            return error_rate > 0 and self.rng.random() < error_rate
+
+    def record(self, feed_key: str, status: int, sent: int, duration_ms: float):
+        with self.lock:
+            counters = self.feeds.setdefault(feed_key, {"requests": 0, "errors": 0, "not_modified": 0, "bytes": 0,
+                                                        "total_ms": 0.0})
+            counters["requests"] += 1
+            counters["bytes"] += sent
+            counters["total_ms"] += duration_ms
+            if status == 304:
+                counters["not_modified"] += 1
+            if status >= 400:
+                counters["errors"] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            feeds = {key: {**value, "total_ms": round(value["total_ms"], 1)} for key, value in self.feeds.items()}
+            return {
+                "uptime_s": round(time.time() - self.started, 1),
+                "requests": sum(f["requests"] for f in feeds.values()),
+                "errors": sum(f["errors"] for f in feeds.values()),
+                "not_modified": sum(f["not_modified"] for f in feeds.values()),
+                "bytes": sum(f["bytes"] for f in feeds.values()),
+                "feeds": feeds,
+            }
+
+    def config(self) -> Dict[str, Any]:
+        with self.lock:
+            return {"defaults": dict(self.defaults), "overrides": dict(self.overrides),
+                    "recordings_dir": self.recordings_dir}
+
+    def update_config(self, payload: Dict[str, Any]):
+        with self.lock:
+            # HTTP dates have a one-second resolution: make sure the new date is later
+            self.modified = max(datetime.now(timezone.utc).replace(microsecond=0),
+                                self.modified + timedelta(seconds=1))
+            self.defaults.update(payload.get("defaults", {}))
+            if payload.get("replace_overrides"):
+                self.overrides = {}
+            self.overrides.update(payload.get("overrides", {}))
+
+    def recorded_body(self, feed_key: str) -> Optional[bytes]:
+        if not self.recordings_dir:
+            return None
+        path = os.path.join(self.recordings_dir, recording_name(feed_key))
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            return f.read()
+
+
+class FeedStubHandler(BaseHTTPRequestHandler):
+    server_version = "FeedStub/1.0"
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def state(self) -> FeedStubState:
+        return self.server.state
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def send_json(self, payload: Any, status: int = 200):
+        body = json.dumps(payload, indent=2, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        if path == "/_stub/stats":
+            return self.send_json(self.state.snapshot())
+        if path == "/_stub/config":
+            return self.send_json(self.state.config())
+        if path.startswith("/feeds/"):
+            return self.serve_feed(self.path[len("/feeds/"):])
+        self.send_json({"error": "not found"}, 404)
+
+    def do_POST(self):
+        path = urlsplit(self.path).path
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        if path == "/_stub/reset":
+            self.state.reset()
+            return self.send_json({"reset": True})
+        if path == "/_stub/config":
+            try:
+                self.state.update_config(json.loads(raw or b"{}"))
+            except ValueError as e:
+                return self.send_json({"error": str(e)}, 400)
+            return self.send_json(self.state.config())
+        self.send_json({"error": "not found"}, 404)
+
+    def not_modified(self, etag: str, last_modified: datetime) -> bool:
+        """If-None-Match wins over If-Modified-Since when both are sent (RFC 9110)"""
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            return if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since:
+            try:
+                return last_modified <= parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def serve_feed(self, feed_key: str):
+        start = time.perf_counter()
+        settings = self.state.settings_for(feed_key)
+
+        if settings["latency_ms"] > 0:
+            time.sleep(settings["latency_ms"] / 1000)
+
+        if self.state.should_fail(settings["error_rate"]):
+            body = b"Service Unavailable (stub)"
+            self.send_response(503)
+            self.send_header("Content-Type", "text/plain")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            self.state.record(feed_key, 503, len(body), (time.perf_counter() - start) * 1000)
+            return
+
+        body = self.state.recorded_body(feed_key) or build_feed(feed_key, settings, self.state.anchor)
+        content_type = "application/atom+xml" if settings["format"] == "atom" else "application/rss+xml"
+        etag = f'"{hashlib.sha1(body).hexdigest()[:16]}"'
+        last_modified = self.state.modified
+
+        if settings["validators"] and self.not_modified(etag, last_modified):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", format_datetime(last_modified, usegmt=True))
+            self.end_headers()
+            self.state.record(feed_key, 304, 0, (time.perf_counter() - start) * 1000)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if settings["validators"]:
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", format_datetime(last_modified, usegmt=True))
+        self.end_headers()
+
+        sent = 0
+        try:
+            if settings["slow_drip_ms"] > 0:
+                chunk = max(1, settings["chunk_bytes"])
+                for offset in range(0, len(body), chunk):
+                    self.wfile.write(body[offset:offset + chunk])
+                    self.wfile.flush()
+                    sent += len(body[offset:offset + chunk])
+                    time.sleep(settings["slow_drip_ms"] / 1000)
+            else:
+                self.wfile.write(body)
+                sent = len(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # Client gave up (deadline reached): count what was sent
+            self.close_connection = True
+        self.state.record(feed_key, 200, sent, (time.perf_counter() - start) * 1000)
+
+
+def fetch_stub_stats(base_url: str, timeout: float = 5) -> Optional[Dict[str, Any]]:
+    """Counters of a running stub, or None when it cannot be reached"""
+    try:
+        with urlopen(f"{base_url.rstrip('/')}/_stub/stats", timeout=timeout) as response:
+            return json.loads(response.read().decode("utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+class FeedStubServer:
+    """Run the stub in a background thread (usable as a context manager)"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, state: Optional[FeedStubState] = None,
+                 verbose: bool = False):
+        self.state = state or FeedStubState()
+        self.httpd = ThreadingHTTPServer((host, port), FeedStubHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.state = self.state
+        self.httpd.verbose = verbose
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def feed_url(self, url: str) -> str:
+        """Stub URL for a real feed URL, as rewritten by RSS_FEED_BASE_URL"""
+        parts = urlsplit(url)
+        query = f"?{parts.query}" if parts.query else ""
+        return f"{self.base_url}/feeds/{parts.netloc}{parts.path}{query}"
+
+    def start(self) -> "FeedStubServer":
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serveur local de flux RSS/Atom synthétiques ou enregistrés")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--items", type=int, default=DEFAULT_SETTINGS["items"])
+    parser.add_argument("--payload-bytes", type=int, default=DEFAULT_SETTINGS["payload_bytes"])
+    parser.add_argument("--latency-ms", type=int, default=DEFAULT_SETTINGS["latency_ms"])
+    parser.add_argument("--error-rate", type=float, default=DEFAULT_SETTINGS["error_rate"])
+    parser.add_argument("--slow-drip-ms", type=int, default=DEFAULT_SETTINGS["slow_drip_ms"])
+    parser.add_argument("--chunk-bytes", type=int, default=DEFAULT_SETTINGS["chunk_bytes"])
+    parser.add_argument("--format", choices=["rss", "atom"], default=DEFAULT_SETTINGS["format"])
+    parser.add_argument("--no-validators", dest="validators", action="store_false",
+                        help="ni ETag ni Last-Modified, jamais de 304")
+    parser.add_argument("--config", help="fichier JSON {\"defaults\": {...}, \"overrides\": {\"motif\": {...}}}")
+    parser.add_argument("--recordings", help="répertoire de flux enregistrés servis tels quels")
+    parser.add_argument("--seed", type=int, default=42, help="graine du tirage des erreurs")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    defaults = {
+        "items": args.items,
+        "payload_bytes": args.payload_bytes,
+        "latency_ms": args.latency_ms,
+        "error_rate": args.error_rate,
+        "slow_drip_ms": args.slow_drip_ms,
+        "chunk_bytes": args.chunk_bytes,
+        "format": args.format,
+        "validators": args.validators,
+    }
+    overrides = {}
+    if args.config:
+        with open(args.config, "r", encoding="utf-8") as f:
+            config = json.load(f)
+        defaults.update(config.get("defaults", {}))
+        overrides = config.get("overrides", {})
+
+    server = FeedStubServer(args.host, args.port, FeedStubState(defaults, overrides, args.recordings, args.seed),
+                            verbose=args.verbose)
+    print(f"🛰️  Feed stub à l'écoute sur {server.base_url}")
+    print(f"    Lancer l'application avec RSS_FEED_BASE_URL={server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Arrêt du feed stub")
+        server.httpd.server_close()
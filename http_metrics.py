@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Mesure de latence des appels HTTP des testeurs
+TimedSession remplace requests.Session : chaque appel est chronométré et regroupé
+par méthode et gabarit de route (ex. "GET /api/windows/updates?category=*&limit=*"),
+puis le rapport final donne count, min, p50, p90, p99 et max par route.
+Les latences sont rangées dans des histogrammes logarithmiques (LogHistogram) :
+mémoire fixe, précision relative de 1 %, fusion exacte entre processus.
+Avec RSS_TEST_MEMO=1 les GET passent par le cache de response_memo.py ; les
+réponses servies depuis ce cache ne sont pas chronométrées.
+"""
+
+import math
+import re
+from array import array
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+
+from response_memo import ResponseMemo, default_memo
+
+# Path segments that identify one resource rather than a route (ids, hashes, uuids)
+ID_SEGMENT = re.compile(r"^(\d+|[0-9a-f]{8,}|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})$", re.I)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def route_template(method: str, url: str) -> str:
+    """METHOD /path?key=*&... with query values and id-like path segments masked"""
+    parts = urlsplit(url)
+    segments = ["*" if ID_SEGMENT.match(segment) else segment for segment in parts.path.split("/")]
+    path = "/".join(segments) or "/"
+    keys = sorted({key for key, _ in parse_qsl(parts.query, keep_blank_values=True)})
+    query = "&".join(f"{key}=*" for key in keys)
+    return f"{method.upper()} {path}" + (f"?{query}" if query else "")
+
+
+class LogHistogram:
+    """Latency histogram (ms) with logarithmic buckets.
+
+    Memory is fixed by the range and the precision (about 1800 counters for 10 µs..10 min
+    at 1 %), whatever the number of samples. Each value is reported with at most
+    `precision / 2` relative error, and two histograms with the same layout merge
+    exactly by adding their counters, so merged percentiles are those of the union.
+    """
+
+    def __init__(self, lowest: float = 0.01, highest: float = 600000.0, precision: float = 0.01):
+        self.lowest = lowest
+        self.highest = highest
+        self.precision = precision
+        self.log_base = math.log1p(precision)
+        # Bucket 0 holds values <= lowest, bucket i covers (lowest*(1+p)^(i-1), lowest*(1+p)^i]
+        self.counts = array("Q", [0]) * (math.ceil(math.log(highest / lowest) / self.log_base) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def layout(self):
+        return (self.lowest, self.highest, self.precision)
+
+    def bucket(self, value: float) -> int:
+        if value <= self.lowest:
+            return 0
+        return min(len(self.counts) - 1, math.ceil(math.log(value / self.lowest) / self.log_base))
+
+    def record(self, value: float):
+        self.counts[self.bucket(value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: "LogHistogram"):
+        if other.layout() != self.layout():
+            raise ValueError("histogrammes de disposition différente")
+        for index, count in enumerate(other.counts):
+            if count:
+                self.counts[index] += count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def percentile(self, pct: float) -> float:
+        """Nearest-rank percentile, as the middle of the bucket holding that rank"""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(pct / 100 * self.count))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                value = self.lowest * math.exp((index - 0.5) * self.log_base) if index else self.lowest
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def stats(self) -> Dict[str, Any]:
+        if not self.count:
+            return {"min_ms": 0, "p50_ms": 0, "p90_ms": 0, "p99_ms": 0, "max_ms": 0}
+        return {
+            "min_ms": round(self.min, 2),
+            "p50_ms": round(self.percentile(50), 2),
+            "p90_ms": round(self.percentile(90), 2),
+            "p99_ms": round(self.percentile(99), 2),
+            "max_ms": round(self.max, 2),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Sparse, JSON/pickle-friendly form (non-empty buckets only)"""
+        return {
+            "layout": list(self.layout()),
+            "counts": {index: count for index, count in enumerate(self.counts) if count},
+            "count": self.count,
+            "total": self.total,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LogHistogram":
+        histogram = cls(*data["layout"])
+        for index, count in data["counts"].items():
+            histogram.counts[int(index)] = count
+        histogram.count = data["count"]
+        histogram.total = data["total"]
+        if data["count"]:
+            histogram.min = data["min"]
+            histogram.max = data["max"]
+        return histogram
+
+
+class LatencyRecorder:
+    """Latency histogram per route template, safe to share between threads and mergeable"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms: Dict[str, LogHistogram] = {}
+        self.errors: Dict[str, int] = {}
+
+    def record(self, route: str, duration_ms: float, ok: bool = True):
+        with self.lock:
+            histogram = self.histograms.get(route)
+            if histogram is None:
+                histogram = self.histograms[route] = LogHistogram()
+            histogram.record(duration_ms)
+            if not ok:
+                self.errors[route] = self.errors.get(route, 0) + 1
+
+    def merge(self, other: "LatencyRecorder"):
+        with self.lock:
+            for route, histogram in other.histograms.items():
+                self.histograms.setdefault(route, LogHistogram()).merge(histogram)
+            for route, errors in other.errors.items():
+                self.errors[route] = self.errors.get(route, 0) + errors
+
+    def overall(self) -> Dict[str, Any]:
+        """Percentiles over every route together"""
+        combined = LogHistogram()
+        with self.lock:
+            for histogram in self.histograms.values():
+                combined.merge(histogram)
+        return combined.stats()
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        with self.lock:
+            return {
+                route: {"count": histogram.count, "errors": self.errors.get(route, 0), **histogram.stats()}
+                for route, histogram in sorted(self.histograms.items())
+            }
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "histograms": {route: histogram.to_dict() for route, histogram in self.histograms.items()},
+                "errors": dict(self.errors),
+            }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencyRecorder":
+        recorder = cls()
+        recorder.histograms = {route: LogHistogram.from_dict(h) for route, h in data["histograms"].items()}
+        recorder.errors = dict(data["errors"])
+        return recorder
+
+    def print_report(self, title: str = "⏱️  LATENCE PAR ROUTE"):
+        summary = self.summary()
+        if not summary:
+            return
+        width = max(len(route) for route in summary)
+        print(f"\n{title}")
+        print(f"  {'Route'.ljust(width)}  {'n':>5} {'err':>4} {'min':>8} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}")
+        for route, stats in summary.items():
+            print(f"  {route.ljust(width)}  {stats['count']:>5} {stats['errors']:>4} "
+                  f"{stats['min_ms']:>8.1f} {stats['p50_ms']:>8.1f} {stats['p90_ms']:>8.1f} "
+                  f"{stats['p99_ms']:>8.1f} {stats['max_ms']:>8.1f}")
+        print("  (ms)")
+
+
+class TimedSession(requests.Session):
+    """requests.Session that records the latency of every call in a LatencyRecorder"""
+
+    def __init__(self, recorder: Optional[LatencyRecorder] = None, memo: Optional[ResponseMemo] = None):
+        super().__init__()
+        self.recorder = recorder or LatencyRecorder()
+        self.memo = memo or default_memo()
+
+    def request(self, method, url, *args, memo: bool = True, **kwargs):
+        # Only plain GETs (query string in the URL) can be answered by the memo
+        memoizable = memo and method.upper() == "GET" and not args and kwargs.get("params") is None
+        if memoizable:
+            cached = self.memo.get(url)
+            if cached is not None:
+                return cached
+
+        route = route_template(method, url)
+        start = time.perf_counter()
+        try:
+            response = super().request(method, url, *args, **kwargs)
+        except Exception:
+            # Timeouts and connection errors count as failed calls of that route
+            self.recorder.record(route, (time.perf_counter() - start) * 1000, ok=False)
+            raise
+        finally:
+            if method.upper() not in ("GET", "HEAD", "OPTIONS"):
+                self.memo.invalidate(method, url)
+        self.recorder.record(route, (time.perf_counter() - start) * 1000, ok=response.status_code < 400)
+        if memoizable:
+            self.memo.store(url, response)
+        return response
@@ -485,7 +485,7 @@ initialize_rss_data() {
     
     # Tentative d'initialisation des flux RSS
     print_info "Lancement de la première récupération RSS..."
-    if curl -s -X POST http://localhost/api/windows/updates/refresh | grep -q "stored"; then
+    if curl -s -X POST "http://localhost/api/windows/updates/refresh?wait=true" | grep -q "stored"; then
         print_success "Données RSS initialisées avec succès"
     else
         print_info "Les données RSS seront initialisées au premier accès à la page"
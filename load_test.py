@@ -0,0 +1,763 @@
+#!/usr/bin/env python3
+"""
+Test de charge des endpoints de lecture /api/*/updates
+
+Mode boucle fermée (closed) : N utilisateurs virtuels enchaînent requête puis temps
+de réflexion pendant une durée fixe.
+Mode boucle ouverte (open) : les requêtes partent à débit constant, que le serveur
+suive ou non. La latence est mesurée depuis l'heure de départ prévue de chaque
+requête (correction de l'omission coordonnée) : quand Node bloque sur un parse JSON,
+les requêtes en retard comptent tout le temps passé à attendre. Plusieurs débits
+sont essayés et le rapport donne le plus haut débit qui tient la cible p99.
+Mode interférence (interference) : lectures à débit constant sur /api/windows/updates
+et /stats, puis POST /refresh (de préférence contre le feed stub local) ; p99, taux
+d'erreur et réponses non JSON de la fenêtre du refresh sont comparés à la fenêtre de
+référence qui la précède. C'est ce que subissent les autres visiteurs quand quelqu'un
+clique sur RefreshButton.
+
+Le rapport donne débit, taux d'erreur et percentiles de latence par endpoint ;
+un fichier SLO fait échouer la commande (code de sortie 1) dès qu'un objectif est dépassé.
+
+Usage:
+    python load_test.py closed --users 20 --duration 60 --think-time exp:0.5
+    python load_test.py closed --start-server --slo load_slo.json
+    python load_test.py closed --endpoints windows --think-time uniform:0.1,0.3
+    python load_test.py open --rates 50 200 1000 --p99-target-ms 500
+    python load_test.py open --rates 100 --duration 60 --endpoints windows starlink
+    python load_test.py open --rates 500 1000 2000 --workers 16
+    python load_test.py interference --rate 50 --baseline 15 --start-server --local-feed-stub
+
+--workers répartit les utilisateurs (ou le débit) sur plusieurs processus pour ne pas
+être limité par le GIL ; chaque processus enregistre ses latences dans des histogrammes
+logarithmiques à mémoire fixe, fusionnés sans perte à la fin.
+
+Temps de réflexion (--think-time):
+    none             aucune pause
+    const:0.2        0,2 s fixes
+    uniform:0.1,0.5  uniforme entre 0,1 et 0,5 s
+    exp:0.5          exponentielle de moyenne 0,5 s
+"""
+
+import argparse
+import contextlib
+import json
+import math
+import os
+import random
+import signal
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+
+from feed_stub_server import FeedStubServer, fetch_stub_stats
+from http_metrics import LatencyRecorder, route_template
+from readiness import expire_feed_cache, submit_refresh
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+RESULTS_FILE = "/tmp/load_test_results.json"
+
+# Read endpoints covered by the testers, per section
+ENDPOINTS = {
+    "windows": [
+        "/api/windows/updates?limit=20",
+        "/api/windows/updates?category=security&limit=20",
+        "/api/windows/updates/latest?limit=10",
+        "/api/windows/updates/stats",
+        "/api/windows/updates/categories",
+    ],
+    "starlink": [
+        "/api/starlink/updates?limit=20",
+        "/api/starlink/updates/latest?limit=10",
+        "/api/starlink/updates/stats",
+        "/api/starlink/updates/categories",
+    ],
+    "cloud": [
+        "/api/cloud/updates?limit=20",
+        "/api/cloud/updates/latest?limit=10",
+        "/api/cloud/updates/stats",
+        "/api/cloud/updates/categories",
+    ],
+}
+
+# Endpoints hit by NextJSPortfolioTester (default set of the open-loop mode)
+ENDPOINTS["nextjs"] = [
+    "/api/test",
+    "/api/windows/updates",
+    "/api/windows/updates?limit=5",
+    "/api/windows/updates?limit=10",
+    "/api/windows/updates?category=security",
+    "/api/windows/updates/latest?limit=5",
+    "/api/windows/updates/stats",
+    "/api/windows/updates/categories",
+]
+
+# Reads a visitor makes while someone else clicks RefreshButton (interference mode)
+ENDPOINTS["interference"] = [
+    "/api/windows/updates",
+    "/api/windows/updates/stats",
+]
+
+SLO_BOUNDS = ("p50_ms", "p90_ms", "p99_ms", "max_ms", "error_rate")
+
+
+def select_endpoints(sections: List[str]) -> List[str]:
+    paths = []
+    for section in sections:
+        paths.extend(ENDPOINTS[section])
+    return paths
+
+
+def parse_think_time(spec: str) -> Callable[[random.Random], float]:
+    """Think-time sampler from 'none', 'const:S', 'uniform:A,B' or 'exp:MEAN' (seconds)"""
+    kind, _, args = spec.partition(":")
+    values = [float(v) for v in args.split(",")] if args else []
+    if kind == "none":
+        return lambda rng: 0.0
+    if kind == "const" and len(values) == 1:
+        return lambda rng: values[0]
+    if kind == "uniform" and len(values) == 2:
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "exp" and len(values) == 1 and values[0] > 0:
+        return lambda rng: rng.expovariate(1 / values[0])
+    raise ValueError(f"temps de réflexion invalide: {spec}")
+
+
+def summarize(recorder: LatencyRecorder, duration_s: float) -> Dict[str, Any]:
+    """Per-endpoint throughput, error rate and latency percentiles"""
+    endpoints = recorder.summary()
+    for stats in endpoints.values():
+        stats["error_rate"] = round(stats["errors"] / stats["count"], 4) if stats["count"] else 0
+        stats["throughput_rps"] = round(stats["count"] / duration_s, 2) if duration_s else 0
+    total_count = sum(stats["count"] for stats in endpoints.values())
+    total_errors = sum(stats["errors"] for stats in endpoints.values())
+    return {
+        "endpoints": endpoints,
+        "total": {
+            "count": total_count,
+            "errors": total_errors,
+            "error_rate": round(total_errors / total_count, 4) if total_count else 0,
+            "throughput_rps": round(total_count / duration_s, 2) if duration_s else 0,
+            **recorder.overall(),
+        },
+    }
+
+
+def print_report(report: Dict[str, Any]):
+    endpoints = report["endpoints"]
+    if not endpoints:
+        print("Aucune requête envoyée")
+        return
+    width = max(len(name) for name in endpoints)
+    print(f"\n  {'Endpoint'.ljust(width)}  {'n':>7} {'rps':>8} {'err%':>6} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}")
+    for name, stats in endpoints.items():
+        print(f"  {name.ljust(width)}  {stats['count']:>7} {stats['throughput_rps']:>8.1f} "
+              f"{stats['error_rate'] * 100:>6.2f} {stats['p50_ms']:>8.1f} {stats['p90_ms']:>8.1f} "
+              f"{stats['p99_ms']:>8.1f} {stats['max_ms']:>8.1f}")
+    total = report["total"]
+    print(f"  (ms)\n\n📊 Total: {total['count']} requêtes, {total['throughput_rps']:.1f} req/s, "
+          f"{total['error_rate'] * 100:.2f}% d'erreurs")
+
+
+def check_slo(report: Dict[str, Any], slo: Dict[str, Any]) -> List[str]:
+    """Breached objectives, as readable messages.
+
+    SLO file format:
+        {"defaults": {"p99_ms": 1000, "error_rate": 0.01},
+         "endpoints": {"GET /api/windows/updates/stats": {"p99_ms": 300}},
+         "total": {"min_throughput_rps": 20, "error_rate": 0.005}}
+    Bounds (p50_ms, p90_ms, p99_ms, max_ms, error_rate) are maxima, min_throughput_rps a minimum.
+    """
+    breaches = []
+
+    def check(name: str, stats: Dict[str, Any], objectives: Dict[str, Any]):
+        for key in SLO_BOUNDS:
+            if key in objectives and stats.get(key, 0) > objectives[key]:
+                breaches.append(f"{name}: {key}={stats[key]} > {objectives[key]}")
+        if "min_throughput_rps" in objectives and stats.get("throughput_rps", 0) < objectives["min_throughput_rps"]:
+            breaches.append(f"{name}: throughput_rps={stats.get('throughput_rps', 0)} < {objectives['min_throughput_rps']}")
+
+    defaults = slo.get("defaults", {})
+    overrides = slo.get("endpoints", {})
+    for name, stats in report["endpoints"].items():
+        check(name, stats, {**defaults, **overrides.get(name, {})})
+    for name in overrides:
+        if name not in report["endpoints"]:
+            breaches.append(f"{name}: aucune requête mesurée")
+    if "total" in slo:
+        check("total", report["total"], slo["total"])
+    return breaches
+
+
+class LocalServer:
+    """Next.js server started for the duration of the load test"""
+
+    def __init__(self, base_url: str, command: str, timeout: float = 120, env: Optional[Dict[str, str]] = None):
+        self.base_url = base_url
+        self.command = command
+        self.timeout = timeout
+        self.env = env
+        self.process: Optional[subprocess.Popen] = None
+
+    def start(self):
+        print(f"🚀 Démarrage du serveur: {self.command}")
+        self.process = subprocess.Popen(self.command, shell=True, cwd=REPO_ROOT,
+                                        stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT,
+                                        start_new_session=True, env={**os.environ, **(self.env or {})})
+        deadline = time.monotonic() + self.timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"le serveur s'est arrêté (code {self.process.returncode}); "
+                                   f"'npm run build' a-t-il été lancé ?")
+            try:
+                if requests.get(f"{self.base_url}/api/test", timeout=2).status_code == 200:
+                    print(f"✅ Serveur prêt sur {self.base_url}")
+                    return
+            except requests.RequestException:
+                pass
+            time.sleep(0.5)
+        self.stop()
+        raise RuntimeError(f"serveur non prêt après {self.timeout:.0f}s")
+
+    def stop(self):
+        if self.process and self.process.poll() is None:
+            # npm spawns next as a child: stop the whole process group
+            os.killpg(self.process.pid, signal.SIGTERM)
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                os.killpg(self.process.pid, signal.SIGKILL)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def perf_time(wall_time: float) -> float:
+    """perf_counter() value of a time.time() instant, to share a start time between processes"""
+    return time.perf_counter() + (wall_time - time.time())
+
+
+def run_in_workers(shard: Callable[..., Any], shard_args: List[tuple]) -> List[Any]:
+    """Run shard(*args) once per entry, each in its own process (in-process when alone)"""
+    if len(shard_args) == 1:
+        return [shard(*shard_args[0])]
+    with ProcessPoolExecutor(max_workers=len(shard_args)) as pool:
+        futures = [pool.submit(shard, *args) for args in shard_args]
+        return [future.result() for future in futures]
+
+
+def start_time(workers: int) -> float:
+    # Leave the worker processes time to start so that they all begin together
+    return time.time() + (1.0 if workers > 1 else 0.05)
+
+
+class ClosedLoopLoad:
+    """N virtual users, each sending one request at a time followed by a think time"""
+
+    def __init__(self, base_url: str, paths: List[str], users: int, duration: float,
+                 think_time: str = "exp:0.5", timeout: float = 10, seed: int = 42, workers: int = 1):
+        self.base_url = base_url
+        self.paths = paths
+        self.users = users
+        self.duration = duration
+        self.think_time = think_time
+        self.timeout = timeout
+        self.seed = seed
+        self.workers = max(1, min(workers, users))
+
+    def config(self) -> Dict[str, Any]:
+        return {"base_url": self.base_url, "paths": self.paths, "users": self.users, "duration": self.duration,
+                "think_time": self.think_time, "timeout": self.timeout, "seed": self.seed}
+
+    def virtual_user(self, user_id: int, start: float, deadline: float, recorder: LatencyRecorder,
+                     think_time: Callable[[random.Random], float]):
+        rng = random.Random(self.seed + user_id)
+        session = requests.Session()
+        delay = start - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        while time.perf_counter() < deadline:
+            path = rng.choice(self.paths)
+            sent = time.perf_counter()
+            try:
+                ok = session.get(f"{self.base_url}{path}", timeout=self.timeout).status_code < 400
+            except requests.RequestException:
+                ok = False
+            recorder.record(route_template("GET", path), (time.perf_counter() - sent) * 1000, ok)
+
+            pause = min(think_time(rng), max(0.0, deadline - time.perf_counter()))
+            if pause > 0:
+                time.sleep(pause)
+
+    def run_users(self, user_ids: List[int], start_at: float) -> LatencyRecorder:
+        """Run the given virtual users in this process, from start_at for `duration` seconds"""
+        recorder = LatencyRecorder()
+        think_time = parse_think_time(self.think_time)
+        start = perf_time(start_at)
+        deadline = start + self.duration
+        threads = [threading.Thread(target=self.virtual_user, args=(i, start, deadline, recorder, think_time),
+                                    daemon=True)
+                   for i in user_ids]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return recorder
+
+    def run(self) -> Dict[str, Any]:
+        print(f"🔁 Boucle fermée: {self.users} utilisateurs, {self.duration:.0f}s, {len(self.paths)} endpoints, "
+              f"{self.workers} processus")
+        start_at = start_time(self.workers)
+        shards = [(self.config(), list(range(worker, self.users, self.workers)), start_at)
+                  for worker in range(self.workers)]
+        recorder = LatencyRecorder()
+        for data in run_in_workers(closed_loop_shard, shards):
+            recorder.merge(LatencyRecorder.from_dict(data))
+        elapsed = time.time() - start_at
+        return {"mode": "closed", "users": self.users, "workers": self.workers,
+                "duration_s": round(elapsed, 2), **summarize(recorder, elapsed)}
+
+
+class OpenLoopLoad:
+    """Requests sent at a constant arrival rate, independently of the response times"""
+
+    def __init__(self, base_url: str, paths: List[str], duration: float, timeout: float = 10,
+                 max_in_flight: int = 256, seed: int = 42, workers: int = 1):
+        self.base_url = base_url
+        self.paths = paths
+        self.duration = duration
+        self.timeout = timeout
+        self.max_in_flight = max_in_flight
+        self.seed = seed
+        self.workers = max(1, workers)
+        self.local = threading.local()
+
+    def config(self) -> Dict[str, Any]:
+        return {"base_url": self.base_url, "paths": self.paths, "duration": self.duration,
+                "timeout": self.timeout, "max_in_flight": self.max_in_flight, "seed": self.seed}
+
+    def session(self) -> requests.Session:
+        if not hasattr(self.local, "session"):
+            self.local.session = requests.Session()
+        return self.local.session
+
+    def run_shard(self, rate: float, worker: int, workers: int, start_at: float) -> Dict[str, Any]:
+        """Send requests worker, worker + workers, ... of the schedule, request i being due at t0 + i / rate"""
+        rng = random.Random(self.seed + worker)
+        recorder = LatencyRecorder()   # from the intended start: what a user would see
+        service = LatencyRecorder()    # from the actual send: what the server took
+        send_lag = LatencyRecorder()   # intended start -> actual send (client or server queueing)
+
+        def send(path: str, intended: float):
+            sent = time.perf_counter()
+            try:
+                ok = self.session().get(f"{self.base_url}{path}", timeout=self.timeout).status_code < 400
+            except requests.RequestException:
+                ok = False
+            end = time.perf_counter()
+            route = route_template("GET", path)
+            recorder.record(route, (end - intended) * 1000, ok)
+            service.record(route, (end - sent) * 1000, ok)
+            send_lag.record("all", max(0.0, sent - intended) * 1000)
+
+        interval = 1 / rate
+        total = max(1, int(rate * self.duration))
+        scheduled = 0
+        with ThreadPoolExecutor(max_workers=max(1, math.ceil(self.max_in_flight / workers))) as executor:
+            t0 = perf_time(start_at)
+            for i in range(worker, total, workers):
+                intended = t0 + i * interval
+                delay = intended - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                # A saturated pool queues the task: its latency still counts from `intended`
+                executor.submit(send, rng.choice(self.paths), intended)
+                scheduled += 1
+            dispatch_s = time.perf_counter() - t0
+        return {"recorder": recorder.to_dict(), "service": service.to_dict(), "send_lag": send_lag.to_dict(),
+                "scheduled": scheduled, "dispatch_s": dispatch_s}
+
+    def run_rate(self, rate: float) -> Dict[str, Any]:
+        start_at = start_time(self.workers)
+        shards = [(self.config(), rate, worker, self.workers, start_at) for worker in range(self.workers)]
+        recorder, service, send_lag = LatencyRecorder(), LatencyRecorder(), LatencyRecorder()
+        scheduled = 0
+        dispatch_s = 0.0
+        for data in run_in_workers(open_loop_shard, shards):
+            recorder.merge(LatencyRecorder.from_dict(data["recorder"]))
+            service.merge(LatencyRecorder.from_dict(data["service"]))
+            send_lag.merge(LatencyRecorder.from_dict(data["send_lag"]))
+            scheduled += data["scheduled"]
+            dispatch_s = max(dispatch_s, data["dispatch_s"])
+        elapsed = time.time() - start_at
+
+        report = summarize(recorder, elapsed)
+        report["total"].update({
+            "target_rps": rate,
+            "dispatch_rps": round(scheduled / max(dispatch_s, 1 / rate), 2),
+            "service_p99_ms": service.overall()["p99_ms"],
+            "send_lag_p99_ms": send_lag.overall()["p99_ms"],
+        })
+        return report
+
+    def sweep(self, rates: List[float], p99_target_ms: float, max_error_rate: float = 0.01,
+              refine: int = 2, cooldown: float = 2.0) -> Dict[str, Any]:
+        """Increase the rate until p99 (or the error rate) breaks the target, then bisect"""
+        print(f"📈 Boucle ouverte: {len(self.paths)} endpoints, {self.duration:.0f}s par débit, {self.workers} processus, "
+              f"cible p99 ≤ {p99_target_ms:.0f} ms")
+        runs = []
+        best = None
+        last = None
+        first_failure = None
+
+        def attempt(rate: float) -> bool:
+            if runs:
+                time.sleep(cooldown)   # let the server drain the previous run
+            report = self.run_rate(rate)
+            total = report["total"]
+            passed = total["p99_ms"] <= p99_target_ms and total["error_rate"] <= max_error_rate
+            runs.append({"rate": rate, "passed": passed, **total})
+            print(f"    {rate:>7.0f} req/s → p99 {total['p99_ms']:.1f} ms (service {total['service_p99_ms']:.1f} ms), "
+                  f"{total['error_rate'] * 100:.2f}% erreurs {'✅' if passed else '❌'}")
+            nonlocal best, last
+            last = report
+            if passed and (best is None or rate > best[0]):
+                best = (rate, report)
+            return passed
+
+        for rate in sorted(rates):
+            if not attempt(rate):
+                first_failure = rate
+                break
+        for _ in range(refine):
+            if best is None or first_failure is None:
+                break
+            middle = round((best[0] + first_failure) / 2)
+            if middle in (best[0], first_failure):
+                break
+            if not attempt(middle):
+                first_failure = middle
+
+        capacity = best[0] if best else 0
+        shown = best[1] if best else last
+        print(f"\n🎯 Capacité: {capacity:.0f} req/s avec p99 ≤ {p99_target_ms:.0f} ms"
+              + ("" if best else " (aucun débit testé ne tient la cible)"))
+        return {
+            "mode": "open",
+            "p99_target_ms": p99_target_ms,
+            "max_error_rate": max_error_rate,
+            "duration_s_per_rate": self.duration,
+            "workers": self.workers,
+            "runs": runs,
+            "capacity_rps": capacity,
+            # Per-endpoint detail of the highest rate within target
+            **shown,
+        }
+
+
+class RefreshInterference:
+    """Steady open-loop reads while POST /refresh runs, compared with the windows before and after"""
+
+    PHASES = ("baseline", "refresh", "after")
+
+    def __init__(self, base_url: str, paths: List[str], rate: float, baseline: float, after: float,
+                 timeout: float = 10, refresh_path: str = "/api/windows/updates/refresh", refreshes: int = 1,
+                 refresh_timeout: float = 300, feed_stub: Optional[str] = None, max_in_flight: int = 256,
+                 seed: int = 42):
+        self.base_url = base_url
+        self.paths = paths
+        self.rate = rate
+        self.baseline = baseline
+        self.after = after
+        self.timeout = timeout
+        self.refresh_path = refresh_path
+        self.refreshes = refreshes
+        self.refresh_timeout = refresh_timeout
+        self.feed_stub = feed_stub
+        self.max_in_flight = max_in_flight
+        self.seed = seed
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.recorders = {phase: LatencyRecorder() for phase in self.PHASES}
+        self.anomalies = {phase: {"non_json": 0, "timeouts": 0} for phase in self.PHASES}
+        self.phase = "baseline"
+
+    def session(self) -> requests.Session:
+        if not hasattr(self.local, "session"):
+            self.local.session = requests.Session()
+        return self.local.session
+
+    def count(self, phase: str, anomaly: str):
+        with self.lock:
+            self.anomalies[phase][anomaly] += 1
+
+    def send(self, path: str, intended: float, phase: str):
+        ok = False
+        try:
+            response = self.session().get(f"{self.base_url}{path}", timeout=self.timeout)
+            ok = response.status_code < 400
+            if ok:
+                try:
+                    response.json()
+                except ValueError:
+                    # A 200 with an HTML error page or a truncated body still breaks the page
+                    ok = False
+                    self.count(phase, "non_json")
+        except requests.Timeout:
+            self.count(phase, "timeouts")
+        except requests.RequestException:
+            pass
+        # Requests are attributed to the window they were due in
+        self.recorders[phase].record(route_template("GET", path), (time.perf_counter() - intended) * 1000, ok)
+
+    def dispatch(self, stop: threading.Event):
+        rng = random.Random(self.seed)
+        interval = 1 / self.rate
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            t0 = time.perf_counter()
+            i = 0
+            while not stop.is_set():
+                intended = t0 + i * interval
+                delay = intended - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                executor.submit(self.send, rng.choice(self.paths), intended, self.phase)
+                i += 1
+
+    def refresh(self) -> Dict[str, Any]:
+        # Submit the job and poll it: the refresh window lasts until the job is done
+        outcome = submit_refresh(requests.Session(), f"{self.base_url}{self.refresh_path}", self.refresh_timeout)
+        data = outcome["result"]
+        result = {"status": outcome["http_status"], "ok": outcome["ok"], "stored": data.get("stored"),
+                  "fetched": data.get("total"), "fetch_ms": (data.get("fetch") or {}).get("duration_ms"),
+                  "feed_cache_hits": (data.get("transfer") or {}).get("cache_hits", 0),
+                  "queue_s": outcome["queue_s"], "run_s": outcome["run_s"],
+                  "duration_s": round(outcome["total_s"], 3)}
+        if outcome["error"]:
+            result["error"] = outcome["error"]
+        return result
+
+    def run(self) -> Dict[str, Any]:
+        print(f"🔄 Interférence refresh: {self.rate:.0f} req/s sur {len(self.paths)} endpoints, "
+              f"{self.baseline:.0f}s de référence, {self.refreshes} refresh, {self.after:.0f}s après")
+        stop = threading.Event()
+        dispatcher = threading.Thread(target=self.dispatch, args=(stop,), daemon=True)
+        dispatcher.start()
+
+        time.sleep(self.baseline)
+        # Without this, feeds read less than NEXT_PUBLIC_RSS_FEED_CACHE_TTL_MS ago never reach the stub
+        expire_feed_cache(requests.Session(), f"{self.base_url}/api")
+        stub_before = fetch_stub_stats(self.feed_stub) if self.feed_stub else None
+        self.phase = "refresh"
+        refresh_start = time.perf_counter()
+        refreshes = [self.refresh() for _ in range(self.refreshes)]
+        refresh_window = time.perf_counter() - refresh_start
+        self.phase = "after"
+        stub_after = fetch_stub_stats(self.feed_stub) if self.feed_stub else None
+        time.sleep(self.after)
+        stop.set()
+        dispatcher.join()
+
+        durations = {"baseline": self.baseline, "refresh": refresh_window, "after": self.after}
+        windows = {}
+        for phase in self.PHASES:
+            summary = summarize(self.recorders[phase], durations[phase])
+            summary["total"].update(self.anomalies[phase])
+            summary["duration_s"] = round(durations[phase], 3)
+            windows[phase] = summary
+
+        feed = None
+        if stub_before and stub_after:
+            feed = {"requests": stub_after["requests"] - stub_before["requests"],
+                    "not_modified": stub_after.get("not_modified", 0) - stub_before.get("not_modified", 0),
+                    "bytes": stub_after["bytes"] - stub_before["bytes"],
+                    "cache_hits": sum(r.get("feed_cache_hits") or 0 for r in refreshes)}
+            if feed["requests"] or feed["cache_hits"]:
+                print(f"    feed stub: {feed['requests']} requêtes ({feed['not_modified']} en 304), "
+                      f"{feed['bytes'] / 1e3:.0f} Ko servis pendant le refresh, {feed['cache_hits']} flux en cache")
+            else:
+                print("⚠️  Aucun appel au feed stub pendant le refresh: le serveur utilise-t-il RSS_FEED_BASE_URL ?")
+
+        base, during = windows["baseline"]["total"], windows["refresh"]["total"]
+        comparison = {
+            "p99_ratio": round(during["p99_ms"] / base["p99_ms"], 2) if base["p99_ms"] else None,
+            "p99_delta_ms": round(during["p99_ms"] - base["p99_ms"], 2),
+            "error_rate_delta": round(during["error_rate"] - base["error_rate"], 4),
+            "non_json": during["non_json"],
+        }
+        print_interference(windows, refreshes, comparison)
+        return {
+            "mode": "interference",
+            "rate": self.rate,
+            "refreshes": refreshes,
+            "feed_stub": feed,
+            "windows": windows,
+            "comparison": comparison,
+            # Per-endpoint detail (and SLO checks) of the refresh window
+            "endpoints": windows["refresh"]["endpoints"],
+            "total": windows["refresh"]["total"],
+        }
+
+
+def print_interference(windows: Dict[str, Any], refreshes: List[Dict[str, Any]], comparison: Dict[str, Any]):
+    for i, refresh in enumerate(refreshes, 1):
+        print(f"    refresh {i}: HTTP {refresh['status']}, {refresh['duration_s']:.2f}s"
+              + (f" (file {refresh['queue_s']:.2f}s)" if refresh.get("queue_s") is not None else "")
+              + (f", {refresh['stored']} stockées" if refresh.get("stored") is not None else "")
+              + (f" ({refresh['error']})" if refresh.get("error") else ""))
+    print(f"\n  {'Fenêtre':<10} {'durée':>7} {'n':>7} {'rps':>8} {'err%':>6} {'non-JSON':>9} {'timeouts':>9} "
+          f"{'p50':>8} {'p99':>8} {'max':>8}")
+    for phase, window in windows.items():
+        total = window["total"]
+        print(f"  {phase:<10} {window['duration_s']:>6.1f}s {total['count']:>7} {total['throughput_rps']:>8.1f} "
+              f"{total['error_rate'] * 100:>6.2f} {total['non_json']:>9} {total['timeouts']:>9} "
+              f"{total['p50_ms']:>8.1f} {total['p99_ms']:>8.1f} {total['max_ms']:>8.1f}")
+    ratio = f"x{comparison['p99_ratio']}" if comparison["p99_ratio"] is not None else "n/a"
+    print(f"  (ms)\n\n📉 Pendant le refresh: p99 {ratio} ({comparison['p99_delta_ms']:+.1f} ms), "
+          f"erreurs {comparison['error_rate_delta'] * 100:+.2f} pt, {comparison['non_json']} réponses non JSON")
+
+
+def closed_loop_shard(config: Dict[str, Any], user_ids: List[int], start_at: float) -> Dict[str, Any]:
+    """Worker process entry point of the closed-loop mode"""
+    return ClosedLoopLoad(**config).run_users(user_ids, start_at).to_dict()
+
+
+def open_loop_shard(config: Dict[str, Any], rate: float, worker: int, workers: int,
+                    start_at: float) -> Dict[str, Any]:
+    """Worker process entry point of the open-loop mode"""
+    return OpenLoopLoad(**config).run_shard(rate, worker, workers, start_at)
+
+
+def run_with_server(args, run: Callable[[], Dict[str, Any]], env: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    if not args.start_server:
+        return run()
+    with LocalServer(args.base_url, args.server_command, args.server_timeout, env):
+        return run()
+
+
+def finish(report: Dict[str, Any], args) -> int:
+    """Print, save and check the report against the SLO file; returns the exit code"""
+    print_report(report)
+    exit_code = 0
+    if args.slo:
+        with open(args.slo, "r", encoding="utf-8") as f:
+            breaches = check_slo(report, json.load(f))
+        report["slo"] = {"file": args.slo, "breaches": breaches}
+        if breaches:
+            print(f"\n❌ SLO non respectés ({len(breaches)}):")
+            for breach in breaches:
+                print(f"  - {breach}")
+            exit_code = 1
+        else:
+            print(f"\n✅ SLO respectés ({args.slo})")
+
+    report["timestamp"] = datetime.now().isoformat()
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2, default=str)
+    print(f"\n📄 Detailed results saved to: {args.output}")
+    return exit_code
+
+
+def main() -> int:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--base-url", default="http://localhost:3000")
+    common.add_argument("--endpoints", nargs="+", choices=list(ENDPOINTS),
+                        help="sections à charger (défaut: windows starlink cloud, nextjs en boucle ouverte)")
+    common.add_argument("--timeout", type=float, default=10, help="timeout par requête (s)")
+    common.add_argument("--slo", help="fichier JSON d'objectifs (code de sortie 1 si dépassés)")
+    common.add_argument("--output", default=RESULTS_FILE)
+    common.add_argument("--start-server", action="store_true", help="démarrer le serveur Next.js local")
+    common.add_argument("--server-command", default="npm run start")
+    common.add_argument("--server-timeout", type=float, default=120)
+    common.add_argument("--seed", type=int, default=42)
+    common.add_argument("--workers", type=int, default=1,
+                        help="processus générateurs de charge (histogrammes fusionnés à la fin)")
+
+    parser = argparse.ArgumentParser(description="Test de charge des endpoints /api/*/updates")
+    modes = parser.add_subparsers(dest="mode", required=True)
+
+    closed = modes.add_parser("closed", parents=[common], help="N utilisateurs virtuels avec temps de réflexion")
+    closed.add_argument("--users", type=int, default=10)
+    closed.add_argument("--duration", type=float, default=30, help="durée du test (s)")
+    closed.add_argument("--think-time", default="exp:0.5", metavar="SPEC",
+                        help="none, const:S, uniform:A,B ou exp:MEAN (défaut exp:0.5)")
+    closed.set_defaults(endpoints=["windows", "starlink", "cloud"])
+
+    open_loop = modes.add_parser("open", parents=[common], help="débit constant, balayage des débits")
+    open_loop.add_argument("--rates", type=float, nargs="+", default=[50, 100, 200, 500, 1000],
+                           help="débits cibles (req/s), essayés par ordre croissant")
+    open_loop.add_argument("--duration", type=float, default=20, help="durée de chaque palier (s)")
+    open_loop.add_argument("--p99-target-ms", type=float, default=500)
+    open_loop.add_argument("--max-error-rate", type=float, default=0.01)
+    open_loop.add_argument("--refine", type=int, default=2,
+                           help="paliers de dichotomie entre le dernier débit tenu et le premier raté")
+    open_loop.add_argument("--cooldown", type=float, default=2.0, help="pause entre deux paliers (s)")
+    open_loop.add_argument("--max-in-flight", type=int, default=256, help="requêtes simultanées max côté client")
+    open_loop.set_defaults(endpoints=["nextjs"])
+
+    interference = modes.add_parser("interference", parents=[common],
+                                    help="lectures à débit constant pendant un POST /refresh")
+    interference.add_argument("--rate", type=float, default=50, help="débit de lecture (req/s)")
+    interference.add_argument("--baseline", type=float, default=15, help="fenêtre de référence avant le refresh (s)")
+    interference.add_argument("--after", type=float, default=10, help="fenêtre observée après le refresh (s)")
+    interference.add_argument("--refreshes", type=int, default=1, help="refresh enchaînés dans la fenêtre refresh")
+    interference.add_argument("--refresh-path", default="/api/windows/updates/refresh")
+    interference.add_argument("--refresh-timeout", type=float, default=300)
+    interference.add_argument("--feed-stub", default=os.environ.get("RSS_FEED_BASE_URL"),
+                              help="URL du feed stub utilisé par le serveur (vérifie qu'il est bien appelé)")
+    interference.add_argument("--local-feed-stub", action="store_true",
+                              help="avec --start-server: lancer un feed stub local et y brancher le serveur")
+    interference.add_argument("--max-in-flight", type=int, default=256)
+    interference.set_defaults(endpoints=["interference"])
+
+    args = parser.parse_args()
+    paths = select_endpoints(args.endpoints)
+    if args.mode == "closed":
+        try:
+            parse_think_time(args.think_time)
+        except ValueError as e:
+            parser.error(str(e))
+
+    print("🚀 Test de charge RSS")
+    print("=" * 70)
+    try:
+        if args.mode == "closed":
+            load = ClosedLoopLoad(args.base_url, paths, args.users, args.duration, args.think_time,
+                                  args.timeout, args.seed, args.workers)
+            report = run_with_server(args, load.run)
+            report["think_time"] = args.think_time
+        elif args.mode == "open":
+            load = OpenLoopLoad(args.base_url, paths, args.duration, args.timeout, args.max_in_flight,
+                                args.seed, args.workers)
+            report = run_with_server(args, lambda: load.sweep(args.rates, args.p99_target_ms,
+                                                              args.max_error_rate, args.refine, args.cooldown))
+        else:
+            with contextlib.ExitStack() as stack:
+                env = None
+                if args.local_feed_stub:
+                    stub = stack.enter_context(FeedStubServer())
+                    args.feed_stub = stub.base_url
+                    env = {"RSS_FEED_BASE_URL": stub.base_url}
+                    print(f"🧪 Feed stub local: {stub.base_url}")
+                load = RefreshInterference(args.base_url, paths, args.rate, args.baseline, args.after,
+                                           args.timeout, args.refresh_path, args.refreshes, args.refresh_timeout,
+                                           args.feed_stub, args.max_in_flight, args.seed)
+                report = run_with_server(args, load.run, env)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return 2
+    print("=" * 70)
+    return finish(report, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
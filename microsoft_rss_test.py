@@ -5,20 +5,27 @@ Tests spécialisés pour Next.js avec focus sur la qualité des traductions,
 récupération multi-sources, formatage des données et fonctionnement refresh
 """
 
-import requests
 import json
-import time
 import sys
 import re
+import os
 from datetime import datetime
 from typing import Dict, List, Any
 
+from feed_cassette import default_store
+from feed_stub_server import fetch_stub_stats
+from http_metrics import TimedSession
+from readiness import expire_feed_cache, refresh_timing, submit_refresh, wait_for_stats_change
+
 class MicrosoftRSSSystemTester:
     def __init__(self):
         self.base_url = "http://localhost:3000"
         self.api_base = f"{self.base_url}/api"
         self.test_results = []
-        self.session = requests.Session()
+        # Chaque appel API est chronométré par route (voir http_metrics.py)
+        self.session = TimedSession()
+        # Flux externes rejoués depuis les cassettes enregistrées (voir feed_cassette.py)
+        self.feeds = default_store()
         
         # Sources RSS Microsoft attendues
         self.expected_sources = [
@@ -252,28 +259,30 @@ class MicrosoftRSSSystemTester:
             # Obtenir les stats avant refresh
             stats_before = self.session.get(f"{self.api_base}/windows/updates/stats", timeout=10)
             before_total = 0
+            before_last_updated = None
             if stats_before.status_code == 200:
                 before_data = stats_before.json()
                 before_total = before_data.get("total", 0)
+                before_last_updated = before_data.get("last_updated")
             
             # Déclencher le refresh
-            print("    Déclenchement du refresh RSS...")
-            refresh_response = self.session.post(f"{self.api_base}/windows/updates/refresh", timeout=60)
+            print("    Déclenchement du refresh RSS (job en arrière-plan)...")
+            outcome = submit_refresh(self.session, f"{self.api_base}/windows/updates/refresh")
             
-            if refresh_response.status_code == 200:
-                refresh_data = refresh_response.json()
+            if outcome["ok"]:
+                refresh_data = outcome["result"]
                 stored = refresh_data.get("stored", 0)
                 total_fetched = refresh_data.get("total", 0)
                 
                 if stored > 0 and total_fetched > 0:
                     self.log_test("RSS Refresh Execution", True, 
-                                f"Refresh réussi: {stored} stockées sur {total_fetched} récupérées")
+                                f"Refresh réussi: {stored} stockées sur {total_fetched} récupérées "
+                                f"({refresh_timing(outcome)})")
                     
-                    # Vérifier que les données ont été mises à jour
-                    time.sleep(3)
-                    stats_after = self.session.get(f"{self.api_base}/windows/updates/stats", timeout=10)
-                    if stats_after.status_code == 200:
-                        after_data = stats_after.json()
+                    # Vérifier que les données ont été mises à jour, dès que /stats reflète le refresh
+                    after_data = wait_for_stats_change(self.session, f"{self.api_base}/windows/updates/stats",
+                                                       before_last_updated)
+                    if after_data is not None:
                         after_total = after_data.get("total", 0)
                         
                         if after_total >= before_total:
@@ -282,17 +291,178 @@ class MicrosoftRSSSystemTester:
                         else:
                             self.log_test("RSS Refresh Data Update", False, 
                                         f"Données non mises à jour: {before_total} → {after_total}")
+                        
+                        # Les compteurs sont maintenus à l'écriture : ils doivent égaler un recomptage complet
+                        all_response = self.session.get(f"{self.api_base}/windows/updates?limit=100000", timeout=20)
+                        if all_response.status_code == 200:
+                            all_updates = all_response.json().get("updates", [])
+                            recount = {}
+                            for update in all_updates:
+                                category = update.get("category") or "unknown"
+                                recount[category] = recount.get(category, 0) + 1
+                            by_category = after_data.get("by_category", {})
+                            if after_total == len(all_updates) and by_category == recount:
+                                self.log_test("RSS Refresh Stats Consistency", True,
+                                            f"Compteurs identiques au recomptage: {recount}")
+                            else:
+                                self.log_test("RSS Refresh Stats Consistency", False,
+                                            f"Stats {after_total} {by_category} ≠ recomptage {len(all_updates)} {recount}")
+                        else:
+                            self.log_test("RSS Refresh Stats Consistency", False,
+                                        f"HTTP {all_response.status_code}")
                     else:
-                        self.log_test("RSS Refresh Data Update", False, "Impossible de vérifier les données après refresh")
+                        self.log_test("RSS Refresh Data Update", False,
+                                    "last_updated inchangé dans /stats après le refresh (délai dépassé)")
                 else:
                     self.log_test("RSS Refresh Execution", False, 
                                 f"Refresh inefficace: {stored} stockées, {total_fetched} récupérées")
             else:
-                self.log_test("RSS Refresh Execution", False, 
-                            f"HTTP {refresh_response.status_code}: {refresh_response.text}")
+                self.log_test("RSS Refresh Execution", False, outcome["error"], outcome["job"])
         except Exception as e:
             self.log_test("RSS Refresh Execution", False, f"Error: {str(e)}")
 
+    def test_refresh_budget(self, margin_s: float = 10.0):
+        """Le refresh récupère les sources en parallèle et respecte son budget de temps"""
+        print("🔍 Test du budget de temps du refresh RSS...")
+        
+        # Serveur lancé avec RSS_FEED_BASE_URL=<stub> : les flux viennent du feed stub local
+        stub_url = os.environ.get("RSS_FEED_BASE_URL")
+        # Feeds read less than NEXT_PUBLIC_RSS_FEED_CACHE_TTL_MS ago would not reach the upstream
+        expire_feed_cache(self.session, self.api_base)
+        stub_before = fetch_stub_stats(stub_url) if stub_url else None
+        
+        try:
+            outcome = submit_refresh(self.session, f"{self.api_base}/windows/updates/refresh")
+            # Time spent running the job (fetch, merge, write), without the wait for a job slot
+            wall_time = outcome["run_s"] if outcome["run_s"] is not None else outcome["total_s"]
+            
+            if not outcome["ok"]:
+                self.log_test("RSS Refresh Budget", False, outcome["error"], outcome["job"])
+                return
+            
+            fetch_info = outcome["result"].get("fetch")
+            if not fetch_info:
+                self.log_test("RSS Refresh Budget", False, "Champ 'fetch' absent de la réponse refresh")
+                return
+            
+            budget_s = fetch_info.get("budget_ms", 0) / 1000
+            timeout_ms = fetch_info.get("timeout_ms", 0)
+            sources = fetch_info.get("sources", [])
+            
+            # The fetch phase must end within the budget; the job also includes the merge and the write
+            within_budget = (not fetch_info.get("budget_exceeded")
+                             and fetch_info.get("duration_ms", 0) <= fetch_info.get("budget_ms", 0)
+                             and wall_time <= budget_s + margin_s)
+            self.log_test("RSS Refresh Budget", within_budget,
+                        f"Fetch {fetch_info.get('duration_ms')} ms, job {wall_time:.2f}s ({refresh_timing(outcome)}), "
+                        f"budget {budget_s:.0f}s, {fetch_info.get('concurrency')} sources en parallèle max")
+            
+            slow_sources = [s for s in sources if timeout_ms and s.get("duration_ms", 0) > timeout_ms + 1000]
+            timings = ", ".join(f"{s.get('key')}={s.get('duration_ms')}ms/{s.get('status')}" for s in sources)
+            self.log_test("RSS Refresh Per-Source Deadline", bool(sources) and not slow_sources,
+                        f"{len(sources)} sources: {timings}",
+                        slow_sources or None)
+            
+            # Sequential fetching would take roughly the sum of the per-source durations
+            sequential_ms = sum(s.get("duration_ms", 0) for s in sources)
+            if len(sources) > 1 and sequential_ms > 0:
+                self.log_test("RSS Refresh Concurrency", fetch_info.get("duration_ms", 0) < sequential_ms,
+                            f"{fetch_info.get('duration_ms')} ms au total pour {sequential_ms} ms cumulés par source")
+            
+            if stub_url:
+                stub_after = fetch_stub_stats(stub_url)
+                served = (stub_after or {}).get("requests", 0) - (stub_before or {}).get("requests", 0)
+                # A feed still in the feed cache was served by the stub in an earlier cycle
+                cached = sum(1 for s in sources if s.get("cache") == "hit")
+                self.log_test("RSS Refresh Uses Feed Stub", stub_after is not None and served + cached >= len(sources),
+                            f"{served} requêtes servies par {stub_url} et {cached} flux en cache "
+                            f"pour {len(sources)} sources")
+        except Exception as e:
+            self.log_test("RSS Refresh Budget", False, f"Error: {str(e)}")
+
+    def test_conditional_refresh(self, kinds=("windows", "starlink", "cloud")):
+        """Un second refresh sur des flux inchangés ne télécharge aucun corps (304 partout)"""
+        print("🔍 Test des GET conditionnels du refresh...")
+
+        stub_url = os.environ.get("RSS_FEED_BASE_URL")
+        if not stub_url:
+            print("⚠️  GET conditionnels non vérifiés: RSS_FEED_BASE_URL (feed stub) non défini\n")
+            return
+
+        for kind in kinds:
+            name = f"{kind.capitalize()} Conditional Refresh"
+            refresh_url = f"{self.api_base}/{kind}/updates/refresh"
+            try:
+                # The first refresh stores the validators (ETag / Last-Modified) of every feed
+                first = submit_refresh(self.session, refresh_url)
+                if not first["ok"]:
+                    self.log_test(name, False, f"Premier refresh: {first['error']}", first["job"])
+                    continue
+
+                # Past the TTL, as the next scheduled refresh would be: every feed is revalidated
+                expired = expire_feed_cache(self.session, self.api_base)
+                stub_before = fetch_stub_stats(stub_url)
+                second = submit_refresh(self.session, refresh_url)
+                stub_after = fetch_stub_stats(stub_url)
+                if expired is None:
+                    self.log_test(name, False, f"Cache de flux non expiré: POST {self.api_base}/refresh/feed-cache "
+                                  f"(serveur lancé sans RSS_FEED_BASE_URL ?)")
+                    continue
+                if not second["ok"] or stub_before is None or stub_after is None:
+                    self.log_test(name, False, second["error"] or f"Feed stub {stub_url} injoignable", second["job"])
+                    continue
+
+                served = stub_after["requests"] - stub_before["requests"]
+                not_modified = stub_after.get("not_modified", 0) - stub_before.get("not_modified", 0)
+                downloaded = stub_after["bytes"] - stub_before["bytes"]
+                transfer = second["result"].get("transfer") or {}
+                # Every feed is requested again and every request is a 304
+                self.log_test(name, served > 0 and downloaded == 0 and not_modified == served
+                              and transfer.get("bytes_downloaded") == 0
+                              and bool(transfer.get("feeds")) and transfer.get("feeds_skipped") == transfer.get("feeds"),
+                              f"{served} requêtes au feed stub, {not_modified} réponses 304, {downloaded} octets servis; "
+                              f"refresh: {transfer.get('feeds_skipped')}/{transfer.get('feeds')} flux non téléchargés "
+                              f"({transfer.get('cache_hits')} en cache), {transfer.get('bytes_downloaded')} octets téléchargés",
+                              transfer or None)
+            except Exception as e:
+                self.log_test(name, False, f"Error: {str(e)}")
+
+    def test_shared_feed_cache(self):
+        """Les flux communs aux veilles Windows et Cloud ne sont téléchargés qu'une fois par fenêtre"""
+        print("🔍 Test du cache de flux partagé entre fetchers...")
+
+        stub_url = os.environ.get("RSS_FEED_BASE_URL")
+        if not stub_url:
+            print("⚠️  Cache de flux partagé non vérifié: RSS_FEED_BASE_URL (feed stub) non défini\n")
+            return
+
+        try:
+            # Windows revalidates the shared feeds, Cloud then finds them fresh in the cache
+            expire_feed_cache(self.session, self.api_base)
+            stub_before = fetch_stub_stats(stub_url)
+            windows = submit_refresh(self.session, f"{self.api_base}/windows/updates/refresh")
+            cloud = submit_refresh(self.session, f"{self.api_base}/cloud/updates/refresh")
+            stub_after = fetch_stub_stats(stub_url)
+            if not windows["ok"] or not cloud["ok"] or stub_before is None or stub_after is None:
+                self.log_test("Shared Feed Cache", False,
+                              windows["error"] or cloud["error"] or f"Feed stub {stub_url} injoignable")
+                return
+
+            # Each URL costs at most one request (download or revalidation) for both refreshes
+            before = stub_before.get("feeds", {})
+            repeated = {feed: stats["requests"] - before.get(feed, {}).get("requests", 0)
+                        for feed, stats in stub_after.get("feeds", {}).items()}
+            repeated = {feed: count for feed, count in repeated.items() if count > 1}
+            transfer = cloud["result"].get("transfer") or {}
+            cache = transfer.get("cache") or {}
+            self.log_test("Shared Feed Cache", not repeated and transfer.get("cache_hits", 0) > 0,
+                          f"refresh Cloud: {transfer.get('cache_hits')}/{transfer.get('feeds')} flux en cache "
+                          f"(taux {transfer.get('cache_hit_rate')}); cache du processus: {cache.get('entries')} "
+                          f"entrées, taux de succès {cache.get('hit_rate')}",
+                          repeated or None)
+        except Exception as e:
+            self.log_test("Shared Feed Cache", False, f"Error: {str(e)}")
+
     def test_external_rss_sources(self):
         """Test d'accessibilité des sources RSS externes réelles"""
         print("🔍 Test des sources RSS externes...")
@@ -311,7 +481,7 @@ class MicrosoftRSSSystemTester:
         
         for source_name, url in rss_sources.items():
             try:
-                response = requests.get(url, timeout=15, headers={
+                response = self.feeds.get(url, timeout=15, headers={
                     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
                 })
                 
@@ -467,6 +637,9 @@ class MicrosoftRSSSystemTester:
         self.test_translation_quality()
         self.test_data_formatting_quality()
         self.test_refresh_functionality()
+        self.test_refresh_budget()
+        self.test_conditional_refresh()
+        self.test_shared_feed_cache()
         self.test_external_rss_sources()
         self.test_filtering_functionality()
         self.test_data_consistency()
@@ -506,9 +679,14 @@ class MicrosoftRSSSystemTester:
                 if not result["success"]:
                     print(f"  - {result['test']}: {result['details']}")
         
+        self.session.recorder.print_report()
+        self.session.memo.print_report()
+        self.feeds.print_report()
+        
         # Sauvegarder les résultats détaillés
         with open("/tmp/microsoft_rss_test_results.json", "w", encoding='utf-8') as f:
-            json.dump(self.test_results, f, indent=2, default=str, ensure_ascii=False)
+            json.dump({"tests": self.test_results, "latency": self.session.recorder.summary()},
+                      f, indent=2, default=str, ensure_ascii=False)
         
         print(f"\n📄 Résultats détaillés sauvegardés: /tmp/microsoft_rss_test_results.json")
         
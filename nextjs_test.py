@@ -4,19 +4,27 @@ Comprehensive Testing for Next.js Windows RSS Portfolio System
 Tests all Next.js API routes, RSS fetching, JSON storage, and translation functionality
 """
 
-import requests
 import json
+import os
 import time
 import sys
 from datetime import datetime
 from typing import Dict, List, Any
 
+from cache_validator import validate_cache
+from feed_cassette import default_store
+from http_metrics import TimedSession, percentile
+from readiness import fetch_stats, refresh_timing, submit_refresh, wait_for_stats_change
+
 class NextJSPortfolioTester:
     def __init__(self):
         self.base_url = "http://localhost:3000"
         self.api_base = f"{self.base_url}/api"
         self.test_results = []
-        self.session = requests.Session()
+        # Every API call is timed per route (see http_metrics.py)
+        self.session = TimedSession()
+        # External feeds are replayed from recorded cassettes (see feed_cassette.py)
+        self.feeds = default_store()
         
     def log_test(self, test_name: str, success: bool, details: str = "", response_data: Any = None):
         """Log test results"""
@@ -172,24 +180,84 @@ class NextJSPortfolioTester:
         except Exception as e:
             self.log_test("Get Latest Updates", False, f"Connection error: {str(e)}")
 
+    def test_warm_cache_latency(self, samples: int = 20):
+        """Compare GET latency with a cold and a warm storage cache"""
+        print("🔍 Testing Storage Cache Latency (cold vs warm)...")
+        
+        data_file = "/app/data/rss-cache.json"
+        # Touching the cache file changes its mtime, which forces the server to re-parse it
+        can_force_cold = os.path.exists(data_file) and os.access(data_file, os.W_OK)
+        endpoints = [
+            "/windows/updates",
+            "/windows/updates/latest?limit=10",
+            "/windows/updates/stats"
+        ]
+        
+        for endpoint in endpoints:
+            test_name = f"Warm Cache Latency GET {endpoint}"
+            try:
+                def timed_get():
+                    start = time.perf_counter()
+                    response = self.session.get(f"{self.api_base}{endpoint}", timeout=15, memo=False)
+                    elapsed = (time.perf_counter() - start) * 1000
+                    if response.status_code != 200:
+                        raise RuntimeError(f"HTTP {response.status_code}")
+                    return elapsed
+                
+                cold = []
+                if can_force_cold:
+                    for _ in range(samples):
+                        os.utime(data_file)
+                        cold.append(timed_get())
+                
+                timed_get()  # warm-up
+                warm = [timed_get() for _ in range(samples)]
+                
+                warm_p95 = percentile(warm, 95)
+                if cold:
+                    cold_p95 = percentile(cold, 95)
+                    self.log_test(test_name, warm_p95 <= cold_p95,
+                                f"p95 cold: {cold_p95:.1f} ms, p95 warm: {warm_p95:.1f} ms")
+                else:
+                    self.log_test(test_name, True,
+                                f"p95 warm: {warm_p95:.1f} ms (cold run skipped, {data_file} not writable)")
+            except Exception as e:
+                self.log_test(test_name, False, f"Error: {str(e)}")
+        
+        try:
+            stats = self.session.get(f"{self.api_base}/windows/updates/stats", timeout=10).json()
+            cache = stats.get("cache")
+            if cache:
+                self.log_test("Storage Cache Counters", True,
+                            f"hits: {cache.get('hits')}, misses: {cache.get('misses')}, hit rate: {cache.get('hit_rate', 0):.1%}")
+            else:
+                self.log_test("Storage Cache Counters", False, "No cache counters in /stats response", stats)
+        except Exception as e:
+            self.log_test("Storage Cache Counters", False, f"Error: {str(e)}")
+
     def test_windows_updates_refresh(self):
         """Test POST /api/windows/updates/refresh"""
         print("🔍 Testing Windows Updates Refresh Endpoint...")
         
         try:
-            response = self.session.post(f"{self.api_base}/windows/updates/refresh", timeout=30)
-            if response.status_code == 200:
-                data = response.json()
+            stats_url = f"{self.api_base}/windows/updates/stats"
+            stats_before = fetch_stats(self.session, stats_url) or {}
+            # 202 + job id: follow the job instead of holding the request for the whole refresh
+            outcome = submit_refresh(self.session, f"{self.api_base}/windows/updates/refresh")
+            if outcome["ok"]:
+                data = outcome["result"]
                 if "message" in data and "timestamp" in data:
                     stored = data.get("stored", 0)
                     total = data.get("total", 0)
-                    self.log_test("RSS Refresh", True, f"Refresh completed: {stored}/{total} updates stored")
+                    self.log_test("RSS Refresh", True, f"Refresh completed: {stored}/{total} updates stored "
+                                  f"({refresh_timing(outcome)})")
                     
-                    # Wait a bit and check if data is available
-                    time.sleep(3)
-                    stats_response = self.session.get(f"{self.api_base}/windows/updates/stats", timeout=10)
-                    if stats_response.status_code == 200:
-                        stats_data = stats_response.json()
+                    # Nothing stored means nothing to wait for; otherwise wait until /stats shows the new save
+                    if stored > 0:
+                        stats_data = wait_for_stats_change(self.session, stats_url, stats_before.get("last_updated"))
+                    else:
+                        stats_data = fetch_stats(self.session, stats_url)
+                    if stats_data is not None:
                         total_after = stats_data.get("total", 0)
                         self.log_test("RSS Refresh Data Verification", True, f"Total updates after refresh: {total_after}")
                     else:
@@ -197,7 +265,7 @@ class NextJSPortfolioTester:
                 else:
                     self.log_test("RSS Refresh", False, "Missing required fields", data)
             else:
-                self.log_test("RSS Refresh", False, f"HTTP {response.status_code}", response.text)
+                self.log_test("RSS Refresh", False, outcome["error"], outcome["job"])
         except Exception as e:
             self.log_test("RSS Refresh", False, f"Connection error: {str(e)}")
 
@@ -206,31 +274,27 @@ class NextJSPortfolioTester:
         print("🔍 Testing JSON Storage Functionality...")
         
         try:
-            # Check if data file exists
-            import os
+            # Every record is checked while streaming the file (see cache_validator.py)
             data_file = "/app/data/rss-cache.json"
             
             if os.path.exists(data_file):
-                with open(data_file, 'r') as f:
-                    data = json.load(f)
+                report = validate_cache(data_file, "windows")
                     
-                if "updates" in data and "lastUpdated" in data:
-                    updates_count = len(data.get("updates", []))
-                    last_updated = data.get("lastUpdated")
-                    self.log_test("JSON Storage File", True, f"Found {updates_count} updates, last updated: {last_updated}")
+                if "updates" in report["keys"] and "lastUpdated" in report["keys"]:
+                    self.log_test("JSON Storage File", True,
+                                f"Found {report['records']} updates, last updated: {report['last_updated']} "
+                                f"({report['records_per_s']} records/s)")
                     
                     # Test data structure
-                    if updates_count > 0:
-                        first_update = data["updates"][0]
-                        required_fields = ["title", "description", "link", "published_date", "category"]
-                        missing_fields = [field for field in required_fields if field not in first_update]
-                        
-                        if not missing_fields:
-                            self.log_test("JSON Data Structure", True, "All required fields present in stored data")
-                        else:
-                            self.log_test("JSON Data Structure", False, f"Missing fields: {missing_fields}")
-                    else:
+                    if report["records"] == 0:
                         self.log_test("JSON Data Structure", True, "No data to validate structure (empty storage)")
+                    elif report["valid"]:
+                        self.log_test("JSON Data Structure", True,
+                                    f"All {report['records']} records have the required fields, valid dates, no duplicates")
+                    else:
+                        self.log_test("JSON Data Structure", False,
+                                    f"Missing fields: {report['missing_fields']}, bad dates: {report['bad_dates']}, "
+                                    f"duplicates: {report['duplicates']}", report["samples"])
                 else:
                     self.log_test("JSON Storage File", False, "Invalid JSON structure")
             else:
@@ -252,7 +316,7 @@ class NextJSPortfolioTester:
         
         for name, url in sources:
             try:
-                response = requests.get(url, timeout=15, headers={
+                response = self.feeds.get(url, timeout=15, headers={
                     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
                 })
                 
@@ -408,6 +472,7 @@ class NextJSPortfolioTester:
         self.test_windows_updates_stats()
         self.test_windows_updates_categories()
         self.test_windows_updates_latest()
+        self.test_warm_cache_latency()
         self.test_windows_updates_refresh()
         self.test_json_storage_functionality()
         self.test_rss_sources_accessibility()
@@ -437,9 +502,14 @@ class NextJSPortfolioTester:
                 if not result["success"]:
                     print(f"  - {result['test']}: {result['details']}")
         
+        self.session.recorder.print_report()
+        self.session.memo.print_report()
+        self.feeds.print_report()
+        
         # Save detailed results
         with open("/tmp/nextjs_test_results.json", "w") as f:
-            json.dump(self.test_results, f, indent=2, default=str)
+            json.dump({"tests": self.test_results, "latency": self.session.recorder.summary()},
+                      f, indent=2, default=str)
         
         print(f"\n📄 Detailed results saved to: /tmp/nextjs_test_results.json")
         
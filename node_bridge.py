@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Exécution de scripts Node.js depuis les testeurs Python
+Permet d'appeler directement les modules de src/lib (stockage, fetchers)
+sans passer par le serveur Next.js
+"""
+
+import json
+import os
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent
+RESULT_MARKER = "__NODE_BRIDGE_RESULT__"
+
+
+def lib_module_url(module_name: str) -> str:
+    """file:// URL of a module in src/lib, usable in a dynamic import()"""
+    return (REPO_ROOT / "src" / "lib" / module_name).as_uri()
+
+
+def run_node(script: str, cwd: Optional[str] = None, timeout: int = 120,
+             env: Optional[Dict[str, str]] = None) -> Any:
+    """Run an ES module snippet with node and return the value it emits.
+
+    The snippet reports its result by calling `emit(value)`, which prints the
+    JSON-encoded value behind a marker so that module logs do not interfere.
+    """
+    wrapped = (
+        f"const emit = (value) => console.log('{RESULT_MARKER}' + JSON.stringify(value));\n"
+        f"{script}\n"
+    )
+    process_env = {**os.environ, **(env or {})}
+    completed = subprocess.run(
+        ["node", "--no-warnings", "--input-type=module", "-e", wrapped],
+        cwd=cwd, env=process_env, capture_output=True, text=True, timeout=timeout,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"node exited with {completed.returncode}: {completed.stderr.strip()[-2000:]}")
+
+    for line in reversed(completed.stdout.splitlines()):
+        if line.startswith(RESULT_MARKER):
+            return json.loads(line[len(RESULT_MARKER):])
+    raise RuntimeError("node script did not emit a result")
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Test de robustesse de la persistance JSON (rss-cache.json, starlink-cache.json, cloud-cache.json)
+Des threads lisent et parsent en boucle les fichiers de /app/data pendant que les
+refresh Windows, Starlink et Cloud sont déclenchés à répétition : toute lecture
+tronquée ou non parsable signale une écriture non atomique.
+
+Usage:
+    python persistence_stress_test.py
+    python persistence_stress_test.py --rounds 10 --readers 4 --data-dir ./data
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List
+
+import requests
+
+from readiness import submit_refresh
+
+DATA_DIR = os.environ.get("RSS_DATA_DIR", "/app/data")
+CACHE_FILES = ["rss-cache.json", "starlink-cache.json", "cloud-cache.json"]
+REFRESH_ENDPOINTS = ["windows/updates/refresh", "starlink/updates/refresh", "cloud/updates/refresh"]
+
+
+class ReadCounters:
+    """Outcome of every read, shared by the reader threads"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reads = 0
+        self.parsed = 0
+        self.missing = 0
+        self.torn = 0
+        self.torn_samples: List[Dict[str, Any]] = []
+
+    def record(self, outcome: str, path: str = "", error: str = "", size: int = 0):
+        with self.lock:
+            self.reads += 1
+            if outcome == "parsed":
+                self.parsed += 1
+            elif outcome == "missing":
+                self.missing += 1
+            else:
+                self.torn += 1
+                if len(self.torn_samples) < 20:
+                    self.torn_samples.append({"file": os.path.basename(path), "size": size, "error": error})
+
+
+def read_loop(paths: List[str], counters: ReadCounters, stop: threading.Event):
+    """Read and parse every cache file until told to stop"""
+    while not stop.is_set():
+        for path in paths:
+            try:
+                with open(path, "rb") as f:
+                    raw = f.read()
+            except FileNotFoundError:
+                counters.record("missing")
+                continue
+            try:
+                json.loads(raw.decode("utf-8"))
+                counters.record("parsed")
+            except (UnicodeDecodeError, ValueError) as e:
+                counters.record("torn", path, str(e)[:120], len(raw))
+
+
+class PersistenceStressTester:
+    def __init__(self, base_url: str = "http://localhost:3000", data_dir: str = DATA_DIR):
+        self.base_url = base_url
+        self.api_base = f"{self.base_url}/api"
+        self.data_dir = data_dir
+        self.test_results = []
+        self.session = requests.Session()
+
+    def log_test(self, test_name: str, success: bool, details: str = "", response_data: Any = None):
+        """Log test results"""
+        result = {
+            "test": test_name,
+            "success": success,
+            "details": details,
+            "timestamp": datetime.now().isoformat(),
+            "response_data": response_data
+        }
+        self.test_results.append(result)
+
+        status = "✅ PASS" if success else "❌ FAIL"
+        print(f"{status} {test_name}")
+        if details:
+            print(f"    Details: {details}")
+        if not success and response_data:
+            print(f"    Response: {response_data}")
+        print()
+
+    def cache_paths(self) -> List[str]:
+        return [os.path.join(self.data_dir, name) for name in CACHE_FILES]
+
+    def test_reads_during_refreshes(self, rounds: int = 5, readers: int = 2):
+        """Parse the cache files in a tight loop while refreshes rewrite them"""
+        print(f"🔍 Lectures concurrentes pendant {rounds} cycles de refresh...")
+
+        paths = self.cache_paths()
+        counters = ReadCounters()
+        stop = threading.Event()
+        threads = [threading.Thread(target=read_loop, args=(paths, counters, stop), daemon=True)
+                   for _ in range(readers)]
+        for thread in threads:
+            thread.start()
+
+        refresh_errors = []
+        start = time.perf_counter()
+        try:
+            for round_number in range(1, rounds + 1):
+                for endpoint in REFRESH_ENDPOINTS:
+                    # Each refresh runs as a job: wait for it so the rounds do not overlap
+                    outcome = submit_refresh(self.session, f"{self.api_base}/{endpoint}")
+                    if not outcome["ok"]:
+                        refresh_errors.append(f"round {round_number} {endpoint}: {outcome['error']}")
+                print(f"    Round {round_number}/{rounds}: {counters.reads} lectures, {counters.torn} corrompues")
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join(timeout=10)
+        duration = time.perf_counter() - start
+
+        self.log_test("Refresh Cycles Completed", not refresh_errors,
+                      f"{rounds * len(REFRESH_ENDPOINTS) - len(refresh_errors)}/{rounds * len(REFRESH_ENDPOINTS)} refresh OK",
+                      refresh_errors[:10] or None)
+
+        self.log_test("No Torn Reads", counters.torn == 0 and counters.parsed > 0,
+                      f"{counters.reads} lectures en {duration:.1f}s "
+                      f"({counters.reads / duration if duration else 0:.0f}/s): {counters.parsed} parsées, "
+                      f"{counters.torn} tronquées/invalides, {counters.missing} fichiers absents",
+                      counters.torn_samples or None)
+
+    def test_no_leftover_temp_files(self):
+        """Atomic writes go through temp files that must be renamed away"""
+        leftovers = [os.path.basename(p) for p in glob.glob(os.path.join(self.data_dir, "*.tmp"))]
+        self.log_test("No Leftover Temp Files", not leftovers,
+                      f"{len(leftovers)} fichiers temporaires dans {self.data_dir}", leftovers or None)
+
+    def test_compact_format(self):
+        """Cache files are written without indentation"""
+        for path in self.cache_paths():
+            name = os.path.basename(path)
+            if not os.path.exists(path):
+                self.log_test(f"Compact Format {name}", False, "Fichier absent")
+                continue
+            with open(path, "r", encoding="utf-8") as f:
+                head = f.read(4096)
+            indented = "\n  " in head
+            self.log_test(f"Compact Format {name}", not indented,
+                          f"{os.path.getsize(path)} octets, {'indenté' if indented else 'compact'}")
+
+    def run_all_tests(self, rounds: int = 5, readers: int = 2):
+        print("🚀 Test de robustesse de la persistance JSON")
+        print(f"📁 Répertoire surveillé: {self.data_dir}")
+        print("=" * 70)
+
+        start_time = datetime.now()
+
+        self.test_reads_during_refreshes(rounds, readers)
+        self.test_no_leftover_temp_files()
+        self.test_compact_format()
+
+        duration = (datetime.now() - start_time).total_seconds()
+
+        total_tests = len(self.test_results)
+        passed_tests = sum(1 for result in self.test_results if result["success"])
+        failed_tests = total_tests - passed_tests
+
+        print("=" * 70)
+        print("🎯 PERSISTENCE STRESS TEST SUMMARY")
+        print(f"Total Tests: {total_tests}")
+        print(f"✅ Passed: {passed_tests}")
+        print(f"❌ Failed: {failed_tests}")
+        print(f"⏱️  Duration: {duration:.2f} seconds")
+
+        if failed_tests > 0:
+            print("\n❌ FAILED TESTS:")
+            for result in self.test_results:
+                if not result["success"]:
+                    print(f"  - {result['test']}: {result['details']}")
+
+        with open("/tmp/persistence_stress_results.json", "w") as f:
+            json.dump(self.test_results, f, indent=2, default=str)
+
+        print(f"\n📄 Detailed results saved to: /tmp/persistence_stress_results.json")
+
+        return passed_tests, failed_tests, self.test_results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Lectures concurrentes des caches JSON pendant les refresh")
+    parser.add_argument("--base-url", default="http://localhost:3000")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--rounds", type=int, default=5, help="nombre de cycles de refresh (Windows, Starlink, Cloud)")
+    parser.add_argument("--readers", type=int, default=2, help="nombre de threads lecteurs")
+    args = parser.parse_args()
+
+    tester = PersistenceStressTester(args.base_url, args.data_dir)
+    passed, failed, results = tester.run_all_tests(args.rounds, args.readers)
+
+    sys.exit(0 if failed == 0 else 1)
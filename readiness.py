@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Attente d'un état prêt après un refresh, sans pause fixe
+Au lieu d'un time.sleep(N) « pour la persistance », les testeurs attendent un
+événement observable et repartent dès qu'il se produit :
+    - changement de mtime/taille d'un fichier de /app/data (ex. rss-cache.json) ;
+    - changement du champ last_updated renvoyé par /api/*/updates/stats ;
+    - fin d'un job de refresh (POST */refresh répond 202, le statut se lit sur
+      /api/refresh/jobs/<id>) : submit_refresh() soumet puis suit le job.
+Le cache de flux du serveur sert sans requête tout flux lu depuis moins de
+NEXT_PUBLIC_RSS_FEED_CACHE_TTL_MS : expire_feed_cache() le périme avant un refresh
+dont on compte les requêtes au feed stub (chaque flux est alors revalidé).
+Les sondages suivent un backoff exponentiel (50 ms, 100 ms, ... plafonné à 1 s) et
+s'arrêtent à une échéance : None est alors renvoyé et le test décide du verdict.
+"""
+
+import os
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import urljoin
+
+import requests
+
+from http_metrics import TimedSession
+
+DEFAULT_TIMEOUT = 30.0
+REFRESH_TIMEOUT = 300.0
+
+
+def wait_until(condition: Callable[[], Any], timeout: float = DEFAULT_TIMEOUT, initial: float = 0.05,
+               max_interval: float = 1.0, factor: float = 2.0) -> Optional[Any]:
+    """Poll condition() with exponential backoff until it returns a truthy value or the deadline passes"""
+    deadline = time.monotonic() + timeout
+    interval = initial
+    while True:
+        value = condition()
+        if value:
+            return value
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        time.sleep(min(interval, remaining))
+        interval = min(interval * factor, max_interval)
+
+
+def file_signature(path: str) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, size) of a file, None when it does not exist"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def wait_for_file_change(path: str, previous: Optional[Tuple[int, int]],
+                         timeout: float = DEFAULT_TIMEOUT) -> Optional[Tuple[int, int]]:
+    """New signature of `path` once it differs from `previous` (atomic renames included)"""
+    def changed():
+        signature = file_signature(path)
+        return signature if signature is not None and signature != previous else None
+    return wait_until(changed, timeout)
+
+
+def fetch_stats(session: requests.Session, stats_url: str) -> Optional[Dict[str, Any]]:
+    # Each poll must reach the server, not the per-run response memo
+    kwargs = {"memo": False} if isinstance(session, TimedSession) else {}
+    try:
+        response = session.get(stats_url, timeout=10, **kwargs)
+    except requests.RequestException:
+        return None
+    return response.json() if response.status_code == 200 else None
+
+
+def wait_for_stats_change(session: requests.Session, stats_url: str, previous: Optional[str],
+                          field: str = "last_updated", timeout: float = DEFAULT_TIMEOUT) -> Optional[Dict[str, Any]]:
+    """Stats payload once stats[field] differs from `previous` (the value read before the refresh)"""
+    def changed():
+        stats = fetch_stats(session, stats_url)
+        return stats if stats is not None and stats.get(field) != previous else None
+    return wait_until(changed, timeout)
+
+
+def submit_refresh(session: requests.Session, refresh_url: str,
+                   timeout: float = REFRESH_TIMEOUT) -> Dict[str, Any]:
+    """POST a refresh job and follow its status until it succeeds, fails or `timeout` passes.
+
+    Returns {"ok", "http_status", "job", "result", "queue_s", "run_s", "total_s", "error"}:
+    result is the refresh payload (stored, total...), queue_s the wait for a job slot and
+    run_s the fetch + store time. A server that still answers 200 synchronously is accepted.
+    """
+    outcome = {"ok": False, "http_status": None, "job": None, "result": {}, "queue_s": None, "run_s": None,
+               "total_s": None, "error": None}
+    start = time.perf_counter()
+    try:
+        response = session.post(refresh_url, timeout=30)
+        outcome["http_status"] = response.status_code
+        body = response.json()
+    except (requests.RequestException, ValueError) as e:
+        outcome["error"] = str(e)
+        outcome["total_s"] = time.perf_counter() - start
+        return outcome
+
+    if response.status_code == 200:
+        outcome.update(ok=True, result=body, run_s=time.perf_counter() - start)
+    elif response.status_code != 202:
+        outcome["error"] = body.get("error") or f"HTTP {response.status_code}"
+    else:
+        status_url = urljoin(refresh_url, body["status_url"])
+        job = wait_until(lambda: finished_job(session, status_url), timeout, initial=0.1)
+        outcome["job"] = job or body
+        if job is None:
+            outcome["error"] = f"job {body['id']} non terminé après {timeout:.0f}s"
+        elif job["status"] == "failed":
+            outcome["error"] = job.get("error") or "job en échec"
+        else:
+            outcome.update(ok=True, result=job.get("result") or {})
+        final = job or body
+        outcome["queue_s"] = final["queue_ms"] / 1000
+        outcome["run_s"] = final["run_ms"] / 1000 if final.get("run_ms") is not None else None
+    outcome["total_s"] = time.perf_counter() - start
+
+    # The data changed after the POST went through the memo: drop what was read meanwhile
+    if isinstance(session, TimedSession):
+        session.memo.invalidate("POST", refresh_url)
+    return outcome
+
+
+def expire_feed_cache(session: requests.Session, api_base: str) -> Optional[int]:
+    """POST /api/refresh/feed-cache: the next refresh revalidates every feed upstream (conditional GET).
+
+    Only enabled on a server started with RSS_FEED_BASE_URL (feed stub). Returns the number of
+    cache entries expired, None when the route is disabled or the server does not answer.
+    """
+    try:
+        response = session.post(f"{api_base}/refresh/feed-cache", timeout=10)
+        return response.json().get("expired") if response.status_code == 200 else None
+    except (requests.RequestException, ValueError):
+        return None
+
+
+def finished_job(session: requests.Session, status_url: str) -> Optional[Dict[str, Any]]:
+    """Job status once it has succeeded or failed, None while queued or running"""
+    job = fetch_stats(session, status_url)
+    return job if job is not None and job.get("status") in ("succeeded", "failed") else None
+
+
+def refresh_timing(outcome: Dict[str, Any]) -> str:
+    """"file 0.0s, exécution 4.2s" for test details"""
+    if outcome["queue_s"] is None:
+        return f"synchrone {outcome['total_s']:.1f}s"
+    run = f"{outcome['run_s']:.1f}s" if outcome["run_s"] is not None else "n/a"
+    return f"file {outcome['queue_s']:.1f}s, exécution {run}"
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Tempête de refresh : 20 POST simultanés sur chaque route /refresh
+Les refresh sont coalescés côté serveur (src/lib/refresh-jobs.js, single-flight.js) :
+les appels simultanés doivent recevoir le même id de job et partager son résultat.
+Pour chaque route :
+    - un refresh seul sert de référence (durée, requêtes vers le feed stub par cycle) ;
+    - N appelants soumettent ensemble (barrière) puis suivent le job jusqu'à sa fin ;
+    - on vérifie un seul job (même id), un seul cycle de fetch amont (compteurs du
+      feed stub), le même résultat pour tous, aucune perte (total des stats, cache
+      valide) et une latence bornée pour chaque appelant (facteur x durée de référence).
+
+Le serveur doit être lancé avec RSS_FEED_BASE_URL pointant vers le feed stub pour que
+le nombre de cycles amont soit vérifiable ; sans stub, seul l'id de job partagé compte.
+Le cache de flux est expiré (POST /api/refresh/feed-cache) avant la référence et avant la
+tempête, et un cycle se compte en flux consultés : requêtes au stub + flux encore en cache
+(transfer.cache_hits des jobs), quel que soit NEXT_PUBLIC_RSS_FEED_CACHE_TTL_MS.
+
+Usage:
+    python refresh_storm_test.py --feed-stub http://localhost:8765
+    python refresh_storm_test.py --callers 50 --stub-latency-ms 500 --kinds windows
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from cache_validator import SCHEMAS, validate_cache
+from feed_stub_server import fetch_stub_stats
+from readiness import expire_feed_cache, submit_refresh
+
+DATA_DIR = os.environ.get("RSS_DATA_DIR", "/app/data")
+KINDS = ["windows", "starlink", "cloud"]
+
+
+class RefreshStormTester:
+    def __init__(self, base_url: str = "http://localhost:3000", feed_stub: Optional[str] = None,
+                 data_dir: str = DATA_DIR, callers: int = 20, latency_factor: float = 2.0,
+                 stub_latency_ms: int = 200):
+        self.base_url = base_url
+        self.api_base = f"{self.base_url}/api"
+        self.feed_stub = feed_stub.rstrip("/") if feed_stub else None
+        self.data_dir = data_dir
+        self.callers = callers
+        self.latency_factor = latency_factor
+        self.stub_latency_ms = stub_latency_ms
+        self.test_results = []
+        self.session = requests.Session()
+
+    def log_test(self, test_name: str, success: bool, details: str = "", response_data: Any = None):
+        """Log test results"""
+        result = {
+            "test": test_name,
+            "success": success,
+            "details": details,
+            "timestamp": datetime.now().isoformat(),
+            "response_data": response_data
+        }
+        self.test_results.append(result)
+
+        status = "✅ PASS" if success else "❌ FAIL"
+        print(f"{status} {test_name}")
+        if details:
+            print(f"    Details: {details}")
+        if not success and response_data:
+            print(f"    Response: {response_data}")
+        print()
+
+    def stub_requests(self) -> Optional[int]:
+        stats = fetch_stub_stats(self.feed_stub) if self.feed_stub else None
+        return stats["requests"] if stats else None
+
+    def configure_stub(self, defaults: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Apply stub defaults, return the previous ones"""
+        if not self.feed_stub:
+            return None
+        try:
+            previous = self.session.get(f"{self.feed_stub}/_stub/config", timeout=5).json()["defaults"]
+            self.session.post(f"{self.feed_stub}/_stub/config", json={"defaults": defaults}, timeout=5)
+            return previous
+        except (requests.RequestException, ValueError, KeyError):
+            return None
+
+    def stats_total(self, kind: str) -> Optional[int]:
+        try:
+            response = self.session.get(f"{self.api_base}/{kind}/updates/stats", timeout=30)
+            return response.json().get("total") if response.status_code == 200 else None
+        except (requests.RequestException, ValueError):
+            return None
+
+    def cache_hits(self, outcomes: List[Dict[str, Any]]) -> int:
+        """Feeds served by the feed cache, once per distinct job"""
+        jobs = {(o["job"] or {}).get("id"): (o["result"].get("transfer") or {}).get("cache_hits", 0)
+                for o in outcomes if o["ok"]}
+        return sum(jobs.values())
+
+    def post_refresh(self, kind: str) -> Dict[str, Any]:
+        """Submit and follow a refresh job on a session of its own"""
+        return submit_refresh(requests.Session(), f"{self.api_base}/{kind}/updates/refresh")
+
+    def storm(self, kind: str) -> List[Dict[str, Any]]:
+        """Fire `callers` submissions at once"""
+        barrier = threading.Barrier(self.callers)
+        results: List[Optional[Dict[str, Any]]] = [None] * self.callers
+
+        def caller(index: int):
+            barrier.wait()
+            results[index] = self.post_refresh(kind)
+
+        threads = [threading.Thread(target=caller, args=(i,), daemon=True) for i in range(self.callers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_refresh_storm(self, kind: str):
+        """N simultaneous refreshes of one kind share a single fetch/save cycle"""
+        print(f"🌩️  Tempête de {self.callers} refresh {kind}...")
+
+        # Reference: one refresh alone, every feed revalidated or served by the feed cache
+        expire_feed_cache(self.session, self.api_base)
+        stub_before = self.stub_requests()
+        reference = self.post_refresh(kind)
+        stub_after = self.stub_requests()
+        if not reference["ok"]:
+            self.log_test(f"{kind} Reference Refresh", False, reference["error"], reference["job"])
+            return
+        cycle_requests = stub_after - stub_before if stub_before is not None and stub_after is not None else None
+        cycle_feeds = (cycle_requests + self.cache_hits([reference])) if cycle_requests is not None else None
+        total_before = self.stats_total(kind)
+
+        expire_feed_cache(self.session, self.api_base)
+        stub_before = self.stub_requests()
+        start = time.perf_counter()
+        results = self.storm(kind)
+        duration = time.perf_counter() - start
+        stub_after = self.stub_requests()
+        total_after = self.stats_total(kind)
+
+        ok = [r for r in results if r["ok"]]
+        self.log_test(f"{kind} Storm Responses", len(ok) == self.callers,
+                      f"{len(ok)}/{self.callers} jobs terminés avec succès en {duration:.2f}s",
+                      [r["error"] for r in results if not r["ok"]][:5] or None)
+        if not ok:
+            return
+
+        job_ids = {(r["job"] or {}).get("id") for r in ok}
+        callers = sorted({(r["job"] or {}).get("callers") for r in ok}, key=str)
+        self.log_test(f"{kind} Single Job", len(job_ids) == 1 and None not in job_ids,
+                      f"{len(job_ids)} job(s) pour {len(ok)} appelants, callers={callers}, "
+                      f"file max {max(r['queue_s'] or 0 for r in ok):.2f}s")
+
+        if cycle_feeds is not None and stub_before is not None and stub_after is not None:
+            storm_requests = stub_after - stub_before
+            storm_feeds = storm_requests + self.cache_hits(ok)
+            cycles = storm_feeds / cycle_feeds if cycle_feeds else 0
+            self.log_test(f"{kind} Single Upstream Cycle", cycle_requests > 0 and storm_feeds == cycle_feeds,
+                          f"{storm_requests} requêtes au feed stub pendant la tempête (+{storm_feeds - storm_requests} "
+                          f"flux en cache), {cycle_feeds} flux par cycle dont {cycle_requests} requêtes "
+                          f"({cycles:.1f} cycles)")
+        else:
+            print(f"⚠️  Cycles amont non vérifiés: feed stub {'injoignable' if self.feed_stub else 'non fourni'}\n")
+
+        shared = {json.dumps(r["result"], sort_keys=True) for r in ok}
+        self.log_test(f"{kind} Shared Result", len(shared) == 1,
+                      f"{len(shared)} résultat(s) distinct(s) pour {len(ok)} appelants")
+
+        lost = total_before is None or total_after is None or total_after < total_before
+        details = f"total avant {total_before}, après {total_after}"
+        path = os.path.join(self.data_dir, SCHEMAS[kind]["file"])
+        report = None
+        if os.path.exists(path):
+            report = validate_cache(path, kind)
+            details += f"; {report['records']} enregistrements dans {SCHEMAS[kind]['file']}"
+        self.log_test(f"{kind} No Lost Updates", not lost and (report is None or report["valid"]), details,
+                      report["samples"] if report and not report["valid"] else None)
+
+        # A caller waits for at most one cycle, started at the latest when it arrived
+        bound = self.latency_factor * reference["total_s"] + 1.0
+        latencies = sorted(r["total_s"] for r in results)
+        self.log_test(f"{kind} Bounded Latency", latencies[-1] <= bound,
+                      f"max {latencies[-1]:.2f}s, médiane {latencies[len(latencies) // 2]:.2f}s, "
+                      f"borne {bound:.2f}s (référence {reference['total_s']:.2f}s)")
+
+    def run_all_tests(self, kinds: List[str] = KINDS):
+        print("🚀 Tempête de refresh concurrents")
+        print(f"🌐 Serveur: {self.base_url}, feed stub: {self.feed_stub or 'non fourni'}")
+        print("=" * 70)
+
+        start_time = datetime.now()
+        # Slower feeds widen the window in which the callers must coalesce
+        previous = self.configure_stub({"latency_ms": self.stub_latency_ms})
+        try:
+            for kind in kinds:
+                self.test_refresh_storm(kind)
+        finally:
+            if previous is not None:
+                self.configure_stub(previous)
+
+        duration = (datetime.now() - start_time).total_seconds()
+
+        total_tests = len(self.test_results)
+        passed_tests = sum(1 for result in self.test_results if result["success"])
+        failed_tests = total_tests - passed_tests
+
+        print("=" * 70)
+        print("🎯 REFRESH STORM TEST SUMMARY")
+        print(f"Total Tests: {total_tests}")
+        print(f"✅ Passed: {passed_tests}")
+        print(f"❌ Failed: {failed_tests}")
+        print(f"⏱️  Duration: {duration:.2f} seconds")
+
+        if failed_tests > 0:
+            print("\n❌ FAILED TESTS:")
+            for result in self.test_results:
+                if not result["success"]:
+                    print(f"  - {result['test']}: {result['details']}")
+
+        with open("/tmp/refresh_storm_results.json", "w") as f:
+            json.dump(self.test_results, f, indent=2, default=str)
+
+        print(f"\n📄 Detailed results saved to: /tmp/refresh_storm_results.json")
+
+        return passed_tests, failed_tests, self.test_results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="POST /refresh simultanés et coalescing côté serveur")
+    parser.add_argument("--base-url", default="http://localhost:3000")
+    parser.add_argument("--feed-stub", default=os.environ.get("RSS_FEED_BASE_URL"),
+                        help="URL du feed stub utilisé par le serveur (compte les cycles de fetch)")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--kinds", nargs="+", choices=KINDS, default=KINDS)
+    parser.add_argument("--callers", type=int, default=20, help="POST simultanés par route")
+    parser.add_argument("--latency-factor", type=float, default=2.0,
+                        help="latence max tolérée, en multiple du refresh de référence")
+    parser.add_argument("--stub-latency-ms", type=int, default=200,
+                        help="latence du feed stub pendant le test (élargit la fenêtre de coalescing)")
+    args = parser.parse_args()
+
+    tester = RefreshStormTester(args.base_url, args.feed_stub, args.data_dir, args.callers,
+                                args.latency_factor, args.stub_latency_ms)
+    passed, failed, results = tester.run_all_tests(args.kinds)
+
+    sys.exit(0 if failed == 0 else 1)
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Mémoïsation des réponses GET pendant une exécution des testeurs (opt-in)
+Avec RSS_TEST_MEMO=1, les sessions TimedSession partagent un cache en lecture :
+    - une URL déjà lue est resservie sans appel réseau ;
+    - pour les listes /api/{windows,starlink,cloud}/updates et /windows/updates/latest,
+      une réponse de limite plus grande (ex. limit=100) sert aussi les limites plus
+      petites avec les mêmes filtres, par découpage de la liste ;
+    - tout POST */refresh invalide les entrées de la ressource (updates, stats,
+      categories...), toute autre requête non GET vide le cache.
+Le rapport final donne le nombre de requêtes et d'octets économisés.
+Les modifications faites hors de ces sessions (autre processus, fichiers touchés à la
+main) ne sont pas vues : les tests de latence passent memo=False.
+"""
+
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from requests.structures import CaseInsensitiveDict
+
+
+class Superset:
+    """How a list route slices a larger-limit response down to a smaller limit"""
+
+    def __init__(self, default_limit: int, derive: Callable[[Dict[str, Any], int], Dict[str, Any]],
+                 unsafe_params: Tuple[str, ...] = ()):
+        self.default_limit = default_limit
+        self.derive = derive
+        # Parameters applied after the limit by the route: the slice would not be equivalent
+        self.unsafe_params = unsafe_params
+
+
+def sliced(payload: Dict[str, Any], size: int, **fields: Callable[[Dict[str, Any], list], Any]) -> Dict[str, Any]:
+    updates = payload["updates"][:size]
+    derived = {**payload, "updates": updates}
+    for field, value in fields.items():
+        derived[field] = value(payload, updates)
+    return derived
+
+
+SUPERSETS = {
+    # total = number of returned updates; ?version= filters after the limit
+    "/api/windows/updates": Superset(
+        50, lambda p, n: sliced(p, n, total=lambda _, u: len(u)), unsafe_params=("version",)),
+    "/api/windows/updates/latest": Superset(
+        10, lambda p, n: sliced(p, n, count=lambda _, u: len(u))),
+    "/api/starlink/updates": Superset(
+        10, lambda p, n: sliced(p, n, total=lambda _, u: len(u), limit=lambda _, u: n)),
+    # total = number of matching updates, independent of the limit
+    "/api/cloud/updates": Superset(
+        50, lambda p, n: sliced(p, n, limit=lambda _, u: n)),
+}
+
+
+class MemoResponse:
+    """The parts of requests.Response the testers use, served from the memo"""
+
+    def __init__(self, url: str, status_code: int, headers: Dict[str, str], content: bytes):
+        self.url = url
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = content
+        self.from_memo = True
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self, **kwargs):
+        # Parsed again on every call: testers may modify what they get
+        return json.loads(self.content, **kwargs)
+
+
+class Entry:
+    def __init__(self, path: str, status_code: int, headers: Dict[str, str], content: bytes, limit: Optional[int]):
+        self.path = path
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.limit = limit
+        self.payload: Optional[Dict[str, Any]] = None
+
+    def parsed(self) -> Dict[str, Any]:
+        if self.payload is None:
+            self.payload = json.loads(self.content)
+        return self.payload
+
+    def complete(self) -> bool:
+        """Fewer updates than the limit: the response already holds every matching update"""
+        return self.limit is not None and len(self.parsed().get("updates", [])) < self.limit
+
+
+def split_url(url: str) -> Tuple[str, Dict[str, str]]:
+    parts = urlsplit(url)
+    return parts.path.rstrip("/") or "/", dict(parse_qsl(parts.query, keep_blank_values=True))
+
+
+def requested_limit(path: str, params: Dict[str, str]) -> Optional[int]:
+    """Effective limit of a superset-capable request, None when slicing would not be exact"""
+    rule = SUPERSETS.get(path)
+    if rule is None or any(param in params for param in rule.unsafe_params):
+        return None
+    if "limit" not in params:
+        return rule.default_limit
+    value = params["limit"]
+    return int(value) if value.isdigit() and int(value) > 0 else None
+
+
+class ResponseMemo:
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.exact: Dict[str, Entry] = {}
+        # (path, filters without limit) -> entries of that list, any limit
+        self.lists: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], Dict[int, Entry]] = {}
+        self.counters = {"lookups": 0, "hits": 0, "superset_hits": 0, "invalidations": 0}
+        self.bytes_saved = 0
+
+    @staticmethod
+    def key(url: str) -> str:
+        path, params = split_url(url)
+        return f"{path}?{'&'.join(f'{k}={v}' for k, v in sorted(params.items()))}"
+
+    @staticmethod
+    def list_key(path: str, params: Dict[str, str]):
+        return path, tuple(sorted((k, v) for k, v in params.items() if k != "limit"))
+
+    def get(self, url: str) -> Optional[MemoResponse]:
+        if not self.enabled:
+            return None
+        path, params = split_url(url)
+        with self.lock:
+            self.counters["lookups"] += 1
+            entry = self.exact.get(self.key(url))
+            if entry is not None:
+                self.counters["hits"] += 1
+                self.bytes_saved += len(entry.content)
+                return MemoResponse(url, entry.status_code, entry.headers, entry.content)
+
+            limit = requested_limit(path, params)
+            if limit is None:
+                return None
+            candidates = [e for n, e in self.lists.get(self.list_key(path, params), {}).items()
+                          if n >= limit or e.complete()]
+            if not candidates:
+                return None
+            entry = min(candidates, key=lambda e: e.limit)
+            content = json.dumps(SUPERSETS[path].derive(entry.parsed(), limit), ensure_ascii=False).encode("utf-8")
+            self.counters["superset_hits"] += 1
+            self.bytes_saved += len(content)
+            return MemoResponse(url, entry.status_code, entry.headers, content)
+
+    def store(self, url: str, response):
+        """Keep successful JSON responses"""
+        if not self.enabled or response.status_code != 200:
+            return
+        if "json" not in response.headers.get("content-type", ""):
+            return
+        path, params = split_url(url)
+        limit = requested_limit(path, params)
+        # The body is stored decoded and derived bodies have their own length
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in ("content-length", "content-encoding")}
+        entry = Entry(path, response.status_code, headers, response.content, limit)
+        with self.lock:
+            self.exact[self.key(url)] = entry
+            if limit is not None:
+                self.lists.setdefault(self.list_key(path, params), {})[limit] = entry
+
+    def invalidate(self, method: str, url: str):
+        """POST .../refresh drops its resource, any other write drops everything"""
+        if not self.enabled:
+            return
+        path, _ = split_url(url)
+        prefix = path[:-len("/refresh")] if method.upper() == "POST" and path.endswith("/refresh") else ""
+        with self.lock:
+            self.counters["invalidations"] += 1
+            self.exact = {k: e for k, e in self.exact.items() if prefix and not e.path.startswith(prefix)}
+            self.lists = {k: v for k, v in self.lists.items() if prefix and not k[0].startswith(prefix)}
+
+    def report(self) -> Dict[str, Any]:
+        with self.lock:
+            saved = self.counters["hits"] + self.counters["superset_hits"]
+            return {
+                **self.counters,
+                "requests_saved": saved,
+                "bytes_saved": self.bytes_saved,
+                "hit_rate": saved / self.counters["lookups"] if self.counters["lookups"] else 0,
+            }
+
+    def print_report(self):
+        if not self.enabled:
+            return
+        report = self.report()
+        print(f"🧠 Mémoïsation GET: {report['requests_saved']}/{report['lookups']} requêtes évitées "
+              f"({report['hits']} identiques, {report['superset_hits']} par sous-ensemble), "
+              f"{report['bytes_saved']} octets économisés, {report['invalidations']} invalidations")
+
+
+_default_memo: Optional[ResponseMemo] = None
+_default_lock = threading.Lock()
+
+
+def default_memo() -> ResponseMemo:
+    """Memo shared by every session of the process, enabled by RSS_TEST_MEMO=1"""
+    global _default_memo
+    with _default_lock:
+        if _default_memo is None:
+            _default_memo = ResponseMemo(os.environ.get("RSS_TEST_MEMO", "0").lower() in ("1", "true", "yes"))
+        return _default_memo
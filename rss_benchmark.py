@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Benchmarks du système RSS (stockage JSON et refresh)
+Mesure la durée du refresh Windows, le volume écrit sur disque et la latence
+des requêtes filtrées par catégorie pour différentes tailles de cache rss-cache.json
+
+Usage:
+    python rss_benchmark.py                       # tailles 100, 1000, 10000
+    python rss_benchmark.py --sizes 100 1000 --server-pid 1234
+    python rss_benchmark.py --bench categories --requests 50
+    python rss_benchmark.py --bench refresh --feed-stub http://localhost:8765
+    python rss_benchmark.py --bench scaling --sizes 1000 10000 100000 1000000 \
+        --server-pid 1234 --plot /tmp/scaling.png
+
+Le benchmark scaling remplit les trois caches avec synthetic_cache.py et mesure,
+pour chaque route et chaque taille, la latence (premier appel et p50/p95) et la
+mémoire résidente du serveur.
+
+Pour des refresh reproductibles, lancer feed_stub_server.py et démarrer l'application
+avec RSS_FEED_BASE_URL pointant sur le stub (--feed-stub ajoute alors ses compteurs).
+Le cache de flux du serveur est expiré avant chaque refresh (POST /api/refresh/feed-cache) :
+chaque taille de cache paie le même cycle amont, revalidations comprises, et les flux
+encore servis par le cache sont comptés à part (feed_cache_hits).
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from feed_stub_server import fetch_stub_stats
+from http_metrics import percentile
+from readiness import expire_feed_cache, submit_refresh
+from synthetic_cache import FILES, WINDOWS_CATEGORIES, write_cache
+
+DATA_DIR = os.environ.get("RSS_DATA_DIR", "/app/data")
+DEFAULT_SIZES = [100, 1000, 10000]
+
+QUERY_CATEGORIES = ["security", "feature", "server", "general"]
+
+# Routes measured by the scaling benchmark, per cache
+SCALING_ROUTES = {
+    "windows": ["/windows/updates?limit=20", "/windows/updates?category=security&limit=20",
+                "/windows/updates/latest?limit=10", "/windows/updates/stats", "/windows/updates/categories"],
+    "starlink": ["/starlink/updates?limit=10", "/starlink/updates?category=spacex&limit=10",
+                 "/starlink/updates/latest?limit=5", "/starlink/updates/stats", "/starlink/updates/categories"],
+    "cloud": ["/cloud/updates?limit=20", "/cloud/updates?provider=AWS&limit=20",
+              "/cloud/updates/latest?limit=5", "/cloud/updates/stats", "/cloud/updates/categories"],
+}
+
+
+def read_process_write_bytes(pid: Optional[int]) -> Optional[int]:
+    """Bytes the server process has written to storage so far (Linux only)"""
+    if not pid:
+        return None
+    try:
+        with open(f"/proc/{pid}/io", "r") as f:
+            for line in f:
+                if line.startswith("write_bytes:"):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+def read_process_rss_kb(pid: Optional[int]) -> Optional[int]:
+    """Resident memory of the server process in kB (Linux only)"""
+    if not pid:
+        return None
+    try:
+        with open(f"/proc/{pid}/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+class RSSBenchmark:
+    def __init__(self, base_url: str = "http://localhost:3000", data_dir: str = DATA_DIR,
+                 server_pid: Optional[int] = None, feed_stub_url: Optional[str] = None):
+        self.base_url = base_url
+        self.api_base = f"{self.base_url}/api"
+        self.data_dir = data_dir
+        self.server_pid = server_pid
+        self.feed_stub_url = feed_stub_url
+        self.results: List[Dict[str, Any]] = []
+        self.session = requests.Session()
+
+    @property
+    def windows_cache_file(self) -> str:
+        return os.path.join(self.data_dir, "rss-cache.json")
+
+    def log_result(self, name: str, metrics: Dict[str, Any]):
+        self.results.append({"benchmark": name, "timestamp": datetime.now().isoformat(), **metrics})
+        summary = ", ".join(f"{key}={value}" for key, value in metrics.items())
+        print(f"📏 {name}: {summary}")
+
+    def bench_refresh(self, sizes: List[int]):
+        """POST /api/windows/updates/refresh against caches of increasing size"""
+        print("🔍 Benchmark refresh Windows par taille de cache...")
+
+        for size in sizes:
+            seeded_bytes = write_cache(self.windows_cache_file, "windows", size)
+            written_before = read_process_write_bytes(self.server_pid)
+            expire_feed_cache(self.session, self.api_base)
+            stub_before = fetch_stub_stats(self.feed_stub_url) if self.feed_stub_url else None
+
+            outcome = submit_refresh(self.session, f"{self.api_base}/windows/updates/refresh")
+            if outcome["http_status"] is None:
+                self.log_result(f"refresh cache={size}", {"error": outcome["error"]})
+                continue
+            data = outcome["result"]
+
+            written_after = read_process_write_bytes(self.server_pid)
+            file_bytes = os.path.getsize(self.windows_cache_file)
+            if written_before is not None and written_after is not None:
+                bytes_written = written_after - written_before
+                bytes_source = "proc_io"
+            else:
+                # Without /proc access, assume a single rewrite of the cache file
+                bytes_written = file_bytes
+                bytes_source = "file_size"
+
+            metrics = {
+                "cache_size": size,
+                "http_status": outcome["http_status"],
+                "job_ok": outcome["ok"],
+                "duration_s": round(outcome["total_s"], 3),
+                "queue_s": round(outcome["queue_s"], 3) if outcome["queue_s"] is not None else None,
+                "run_s": round(outcome["run_s"], 3) if outcome["run_s"] is not None else None,
+                "fetch_ms": (data.get("fetch") or {}).get("duration_ms"),
+                "fetched": data.get("total", 0),
+                "stored": data.get("stored", 0),
+                "seeded_bytes": seeded_bytes,
+                "bytes_written": bytes_written,
+                "bytes_written_source": bytes_source,
+                "final_file_bytes": file_bytes,
+                "feed_cache_hits": (data.get("transfer") or {}).get("cache_hits"),
+            }
+            stub_after = fetch_stub_stats(self.feed_stub_url) if self.feed_stub_url else None
+            if stub_before and stub_after:
+                metrics["feed_requests"] = stub_after["requests"] - stub_before["requests"]
+                metrics["feed_bytes"] = stub_after["bytes"] - stub_before["bytes"]
+            self.log_result(f"refresh cache={size}", metrics)
+
+    def bench_category_queries(self, sizes: List[int], requests_per_query: int = 30, limit: int = 20):
+        """GET /api/windows/updates?category=... latency for each cache size"""
+        print("🔍 Benchmark requêtes par catégorie...")
+
+        for size in sizes:
+            # Half of the entries use the queried categories, the rest the real ones
+            write_cache(self.windows_cache_file, "windows", size,
+                        categories=QUERY_CATEGORIES + WINDOWS_CATEGORIES)
+            for category in QUERY_CATEGORIES + [None]:
+                query = f"?limit={limit}" + (f"&category={category}" if category else "")
+                samples = []
+                errors = 0
+                returned = 0
+                # First request pays for parsing the new file, measure the warm path
+                try:
+                    self.session.get(f"{self.api_base}/windows/updates{query}", timeout=30)
+                except Exception:
+                    pass
+                for _ in range(requests_per_query):
+                    start = time.perf_counter()
+                    try:
+                        response = self.session.get(f"{self.api_base}/windows/updates{query}", timeout=30)
+                        if response.status_code != 200:
+                            errors += 1
+                            continue
+                        returned = len(response.json().get("updates", []))
+                    except Exception:
+                        errors += 1
+                        continue
+                    samples.append((time.perf_counter() - start) * 1000)
+
+                self.log_result(f"GET /api/windows/updates{query} cache={size}", {
+                    "cache_size": size,
+                    "category": category or "all",
+                    "requests": requests_per_query,
+                    "errors": errors,
+                    "returned": returned,
+                    "p50_ms": round(percentile(samples, 50), 2),
+                    "p95_ms": round(percentile(samples, 95), 2),
+                    "max_ms": round(max(samples), 2) if samples else 0,
+                })
+
+    def timed_get(self, path: str) -> Optional[float]:
+        start = time.perf_counter()
+        try:
+            response = self.session.get(f"{self.api_base}{path}", timeout=120)
+        except Exception:
+            return None
+        if response.status_code != 200:
+            return None
+        return (time.perf_counter() - start) * 1000
+
+    def bench_scaling(self, sizes: List[int], requests_per_route: int = 30,
+                      kinds: Optional[List[str]] = None):
+        """Latency of each route and server RSS against the size of each synthetic cache"""
+        print("🔍 Benchmark de montée en charge des trois caches...")
+
+        for kind in kinds or list(SCALING_ROUTES):
+            path = os.path.join(self.data_dir, FILES[kind])
+            for size in sizes:
+                file_bytes = write_cache(path, kind, size)
+                for route in SCALING_ROUTES[kind]:
+                    # The first request after the rewrite re-parses the file
+                    cold = self.timed_get(route)
+                    samples = [ms for ms in (self.timed_get(route) for _ in range(requests_per_route)) if ms is not None]
+                    self.log_result(f"scaling {kind} cache={size} GET {route}", {
+                        "kind": kind,
+                        "route": route,
+                        "cache_size": size,
+                        "file_bytes": file_bytes,
+                        "errors": requests_per_route - len(samples) + (cold is None),
+                        "cold_ms": round(cold, 2) if cold is not None else None,
+                        "p50_ms": round(percentile(samples, 50), 2),
+                        "p95_ms": round(percentile(samples, 95), 2),
+                        "server_rss_kb": read_process_rss_kb(self.server_pid),
+                    })
+
+    def plot_scaling(self, output: str):
+        """One chart per cache: p50 latency per route and server RSS against cache size"""
+        rows = [r for r in self.results if r["benchmark"].startswith("scaling ")]
+        if not rows:
+            return
+        try:
+            import matplotlib
+            matplotlib.use("Agg")
+            import matplotlib.pyplot as plt
+        except ImportError:
+            print("⚠️  matplotlib non installé: graphique ignoré (résultats dans le JSON)")
+            return
+
+        kinds = list(dict.fromkeys(r["kind"] for r in rows))
+        fig, axes = plt.subplots(len(kinds), 1, figsize=(9, 4 * len(kinds)), squeeze=False)
+        for ax, kind in zip(axes[:, 0], kinds):
+            kind_rows = [r for r in rows if r["kind"] == kind]
+            for route in dict.fromkeys(r["route"] for r in kind_rows):
+                points = [(r["cache_size"], r["p50_ms"]) for r in kind_rows if r["route"] == route]
+                ax.plot(*zip(*points), marker="o", label=route)
+            ax.set_xscale("log")
+            ax.set_xlabel("entrées dans le cache")
+            ax.set_ylabel("latence p50 (ms)")
+            ax.set_title(kind)
+            ax.legend(fontsize="small", loc="upper left")
+            rss = {r["cache_size"]: r["server_rss_kb"] for r in kind_rows if r["server_rss_kb"]}
+            if rss:
+                ax_rss = ax.twinx()
+                ax_rss.plot(list(rss), [kb / 1024 for kb in rss.values()], "k--", label="RSS serveur")
+                ax_rss.set_ylabel("RSS serveur (Mo)")
+        fig.tight_layout()
+        fig.savefig(output)
+        print(f"📈 Graphique enregistré: {output}")
+
+    def run_all(self, sizes: List[int], benches: Optional[List[str]] = None, requests_per_query: int = 30,
+                plot: Optional[str] = None):
+        print("🚀 Démarrage des benchmarks RSS")
+        print("=" * 70)
+
+        # None: the file did not exist and is removed afterwards
+        backups = {}
+        for name in FILES.values():
+            path = os.path.join(self.data_dir, name)
+            backups[path] = path + ".bench-backup" if os.path.exists(path) else None
+            if backups[path]:
+                shutil.copy2(path, backups[path])
+
+        benches = benches or ["refresh", "categories"]
+        try:
+            if "refresh" in benches:
+                self.bench_refresh(sizes)
+            if "categories" in benches:
+                self.bench_category_queries(sizes, requests_per_query)
+            if "scaling" in benches:
+                self.bench_scaling(sizes, requests_per_query)
+                if plot:
+                    self.plot_scaling(plot)
+        finally:
+            for path, backup in backups.items():
+                if backup:
+                    shutil.move(backup, path)
+                    print(f"\n♻️  Cache d'origine restauré: {path}")
+                elif os.path.exists(path):
+                    os.remove(path)
+
+        print("=" * 70)
+        with open("/tmp/rss_benchmark_results.json", "w") as f:
+            json.dump(self.results, f, indent=2, default=str)
+        print("📄 Detailed results saved to: /tmp/rss_benchmark_results.json")
+        return self.results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks du stockage et du refresh RSS")
+    parser.add_argument("--base-url", default="http://localhost:3000")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--bench", nargs="+", choices=["refresh", "categories", "scaling"],
+                        default=["refresh", "categories"])
+    parser.add_argument("--requests", type=int, default=30,
+                        help="nombre de requêtes mesurées par catégorie (ou par route) et par taille")
+    parser.add_argument("--plot", default=None, metavar="PNG",
+                        help="graphique latence / RSS serveur du benchmark scaling (matplotlib)")
+    parser.add_argument("--server-pid", type=int, default=None,
+                        help="PID du serveur Next.js pour mesurer les octets écrits via /proc/<pid>/io")
+    parser.add_argument("--feed-stub", default=os.environ.get("RSS_FEED_BASE_URL"),
+                        help="URL du feed stub utilisé par le serveur (requêtes et octets servis par refresh)")
+    args = parser.parse_args()
+
+    benchmark = RSSBenchmark(args.base_url, args.data_dir, args.server_pid, args.feed_stub)
+    results = benchmark.run_all(args.sizes, args.bench, args.requests, args.plot)
+    sys.exit(0 if all("error" not in r for r in results) else 1)
@@ -4,19 +4,25 @@ Test complet du système RSS amélioré pour le portfolio de veille technologiqu
 Tests spécifiques selon les exigences de la review request
 """
 
-import requests
 import json
-import time
 import os
-from datetime import datetime
+import tempfile
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Any
 
+from http_metrics import TimedSession
+from node_bridge import lib_module_url, run_node
+from readiness import (fetch_stats, file_signature, refresh_timing, submit_refresh, wait_for_file_change,
+                       wait_for_stats_change)
+from synthetic_cache import build_windows_cache, iso
+
 class RSSSystemTester:
     def __init__(self):
         self.base_url = "http://localhost:3000"
         self.api_base = f"{self.base_url}/api"
         self.test_results = []
-        self.session = requests.Session()
+        # Every API call is timed per route (see http_metrics.py)
+        self.session = TimedSession()
         
     def log_test(self, test_name: str, success: bool, details: str = "", response_data: Any = None):
         """Log test results"""
@@ -98,20 +104,20 @@ class RSSSystemTester:
 
         # Test POST /api/windows/updates/refresh
         try:
-            response = self.session.post(f"{self.api_base}/windows/updates/refresh", timeout=30)
-            if response.status_code == 200:
-                data = response.json()
+            outcome = submit_refresh(self.session, f"{self.api_base}/windows/updates/refresh")
+            if outcome["ok"]:
+                data = outcome["result"]
                 if "message" in data and "stored" in data and "total" in data:
                     stored = data.get("stored", 0)
                     total = data.get("total", 0)
                     self.log_test("POST /api/windows/updates/refresh", True, 
-                                f"Stored {stored}/{total} updates")
+                                f"Stored {stored}/{total} updates ({refresh_timing(outcome)})")
                 else:
                     self.log_test("POST /api/windows/updates/refresh", False, 
                                 "Missing required fields", data)
             else:
                 self.log_test("POST /api/windows/updates/refresh", False, 
-                            f"HTTP {response.status_code}", response.text)
+                            outcome["error"], outcome["job"])
         except Exception as e:
             self.log_test("POST /api/windows/updates/refresh", False, f"Error: {str(e)}")
 
@@ -269,24 +275,28 @@ class RSSSystemTester:
         except Exception as e:
             self.log_test("Data Storage Structure", False, f"Error reading cache file: {str(e)}")
 
+        # Test de déduplication sur un cache synthétique de 10k entrées
+        self.check_bulk_dedup_on_large_cache(10000)
+
         # Test de persistence après refresh
         try:
             # Récupérer les stats avant refresh
-            stats_before = self.session.get(f"{self.api_base}/windows/updates/stats", timeout=10)
-            before_total = 0
-            if stats_before.status_code == 200:
-                before_total = stats_before.json().get("total", 0)
+            stats_url = f"{self.api_base}/windows/updates/stats"
+            stats_before = fetch_stats(self.session, stats_url) or {}
+            before_total = stats_before.get("total", 0)
             
             # Effectuer un refresh
-            refresh_response = self.session.post(f"{self.api_base}/windows/updates/refresh", timeout=30)
+            outcome = submit_refresh(self.session, f"{self.api_base}/windows/updates/refresh")
             
-            if refresh_response.status_code == 200:
-                # Vérifier les stats après refresh
-                time.sleep(2)  # Attendre un peu pour la persistence
-                stats_after = self.session.get(f"{self.api_base}/windows/updates/stats", timeout=10)
+            if outcome["ok"]:
+                # Vérifier les stats après refresh, dès que la sauvegarde est visible
+                if outcome["result"].get("stored", 0) > 0:
+                    stats_after = wait_for_stats_change(self.session, stats_url, stats_before.get("last_updated"))
+                else:
+                    stats_after = fetch_stats(self.session, stats_url)
                 
-                if stats_after.status_code == 200:
-                    after_total = stats_after.json().get("total", 0)
+                if stats_after is not None:
+                    after_total = stats_after.get("total", 0)
                     
                     if after_total >= before_total:
                         self.log_test("Data Persistence After Refresh", True, 
@@ -299,21 +309,91 @@ class RSSSystemTester:
                                 "Could not verify stats after refresh")
             else:
                 self.log_test("Data Persistence After Refresh", False, 
-                            "Refresh operation failed")
+                            f"Refresh operation failed: {outcome['error']}")
                 
         except Exception as e:
             self.log_test("Data Persistence After Refresh", False, f"Error: {str(e)}")
 
+    def check_bulk_dedup_on_large_cache(self, cache_size: int):
+        """Vérifier la déduplication de saveWindowsUpdatesBulk sur un gros cache"""
+        test_name = f"Bulk Dedup on {cache_size} Entries"
+        try:
+            cache = build_windows_cache(cache_size)
+            existing = cache["updates"]
+            old_created = (datetime.now(timezone.utc) - timedelta(days=30)).replace(microsecond=0)
+            old_created_at = iso(old_created)
+            for update in existing:
+                update["created_at"] = old_created_at
+
+            # Entrées plus récentes que tout le cache pour survivre à la limite de 1000
+            fresh_date = iso(datetime.now(timezone.utc) + timedelta(minutes=1))
+            by_title = [{**existing[i], "link": f"https://bench.local/moved/{i}", "published_date": fresh_date}
+                        for i in range(0, 50)]
+            by_link = [{**existing[i], "title": f"Titre renommé {i}", "published_date": fresh_date}
+                       for i in range(50, 100)]
+            new_items = [{"title": f"Nouvelle entrée {i}", "link": f"https://bench.local/new/{i}",
+                          "description": "", "category": "security", "source": "Benchmark",
+                          "published_date": fresh_date} for i in range(50)]
+            for item in by_title + by_link:
+                item.pop("created_at", None)
+                item.pop("updated_at", None)
+            batch = by_title + by_link + new_items + [dict(item) for item in new_items[:10]]
+
+            with tempfile.TemporaryDirectory() as workdir:
+                os.makedirs(os.path.join(workdir, "data"))
+                with open(os.path.join(workdir, "data", "rss-cache.json"), "w", encoding="utf-8") as f:
+                    json.dump(cache, f)
+                with open(os.path.join(workdir, "batch.json"), "w", encoding="utf-8") as f:
+                    json.dump(batch, f)
+
+                result = run_node(f"""
+import fs from 'fs';
+const {{ storage }} = await import('{lib_module_url("storage.js")}');
+const batch = JSON.parse(fs.readFileSync('batch.json', 'utf-8'));
+const start = process.hrtime.bigint();
+const counts = await storage.saveWindowsUpdatesBulk(batch);
+const elapsedMs = Number(process.hrtime.bigint() - start) / 1e6;
+const saved = JSON.parse(fs.readFileSync('data/rss-cache.json', 'utf-8'));
+emit({{ counts, elapsedMs, updates: saved.updates.map(u => [u.title, u.link, u.created_at]) }});
+""", cwd=workdir)
+
+            counts = result["counts"] or {}
+            stored = result["updates"]
+            titles = [u[0] for u in stored]
+            links = [u[1] for u in stored]
+            created = {u[1]: u[2] for u in stored}
+            problems = []
+            if counts.get("added") != 50 or counts.get("updated") != 110:
+                problems.append(f"counts {counts} (expected added=50, updated=110)")
+            if len(set(titles)) != len(titles) or len(set(links)) != len(links):
+                problems.append("duplicate titles or links after merge")
+            kept = [item["link"] for item in by_title + by_link]
+            if any(link not in created or
+                   datetime.fromisoformat(created[link].replace("Z", "+00:00")) != old_created
+                   for link in kept):
+                problems.append("created_at not preserved on updated entries")
+
+            if problems:
+                self.log_test(test_name, False, "; ".join(problems))
+            else:
+                self.log_test(test_name, True,
+                              f"added=50, updated=110, merge in {result['elapsedMs']:.1f} ms, "
+                              f"{len(stored)} entries kept")
+        except Exception as e:
+            self.log_test(test_name, False, f"Error: {str(e)}")
+
     def test_rss_refresh_functionality(self):
         """Tester la fonctionnalité refresh RSS"""
         print("🔍 Testing RSS Refresh Functionality...")
         
         try:
             # Test du refresh avec vérification détaillée
-            response = self.session.post(f"{self.api_base}/windows/updates/refresh", timeout=45)
+            cache_file = "/app/data/rss-cache.json"
+            cache_before = file_signature(cache_file)
+            outcome = submit_refresh(self.session, f"{self.api_base}/windows/updates/refresh")
             
-            if response.status_code == 200:
-                data = response.json()
+            if outcome["ok"]:
+                data = outcome["result"]
                 
                 if "message" in data and "stored" in data and "total" in data:
                     stored = data.get("stored", 0)
@@ -322,7 +402,7 @@ class RSSSystemTester:
                     # Vérifier que des données ont été récupérées
                     if total > 0:
                         self.log_test("RSS Refresh Data Retrieval", True, 
-                                    f"Retrieved {total} articles from RSS sources")
+                                    f"Retrieved {total} articles from RSS sources ({refresh_timing(outcome)})")
                         
                         # Vérifier que des données ont été stockées
                         if stored > 0:
@@ -335,9 +415,10 @@ class RSSSystemTester:
                         self.log_test("RSS Refresh Data Retrieval", False, 
                                     "No articles retrieved from RSS sources")
                         
-                    # Vérifier la mise à jour du cache JSON
-                    time.sleep(2)
-                    cache_file = "/app/data/rss-cache.json"
+                    # Vérifier la mise à jour du cache JSON, dès que le fichier a été réécrit
+                    if stored > 0 and wait_for_file_change(cache_file, cache_before) is None:
+                        self.log_test("RSS Refresh Cache Write", False,
+                                    f"{cache_file} non réécrit après le refresh (délai dépassé)")
                     if os.path.exists(cache_file):
                         with open(cache_file, 'r', encoding='utf-8') as f:
                             cache_data = json.load(f)
@@ -358,7 +439,7 @@ class RSSSystemTester:
                                 "Missing required fields in refresh response", data)
             else:
                 self.log_test("RSS Refresh Functionality", False, 
-                            f"HTTP {response.status_code}", response.text)
+                            outcome["error"], outcome["job"])
                 
         except Exception as e:
             self.log_test("RSS Refresh Functionality", False, f"Error: {str(e)}")
@@ -399,9 +480,13 @@ class RSSSystemTester:
                 if not result["success"]:
                     print(f"  - {result['test']}: {result['details']}")
         
+        self.session.recorder.print_report()
+        self.session.memo.print_report()
+        
         # Save detailed results
         with open("/tmp/rss_system_test_results.json", "w") as f:
-            json.dump(self.test_results, f, indent=2, default=str)
+            json.dump({"tests": self.test_results, "latency": self.session.recorder.summary()},
+                      f, indent=2, default=str)
         
         print(f"\n📄 Detailed results saved to: /tmp/rss_system_test_results.json")
         
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Exécution parallèle des suites de tests
+Découvre les méthodes test_* de chaque classe de testeur et les répartit en deux groupes :
+    partagées   lectures seules et indépendantes, exécutées en parallèle sur un pool
+    exclusives  refresh (POST */refresh), écriture dans /app/data, mesures de temps :
+                exécutées seules, une à la fois, après le groupe partagé
+Chaque méthode tourne sur sa propre instance du testeur ; sa sortie est capturée par
+thread et affichée d'un bloc à la fin de la méthode, puis le rapport final reprend le
+format pass/fail des testeurs avec le temps gagné sur une exécution séquentielle.
+
+Usage:
+    python run_suites.py                        # toutes les suites, 8 workers
+    python run_suites.py --suites backend nextjs --workers 4
+    python run_suites.py --list                 # plan d'exécution sans lancer les tests
+    python run_suites.py --all-methods          # aussi les test_* absents de run_all_tests
+"""
+
+import argparse
+import importlib
+import inspect
+import io
+import json
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from feed_cassette import default_store
+from http_metrics import LatencyRecorder
+from response_memo import default_memo
+
+# name -> (module, tester class, method listing the tests in their usual order)
+SUITES = {
+    "backend": ("backend_test", "CloudComputingBackendTester", "run_all_tests"),
+    "microsoft": ("microsoft_rss_test", "MicrosoftRSSSystemTester", "run_comprehensive_tests"),
+    "nextjs": ("nextjs_test", "NextJSPortfolioTester", "run_all_tests"),
+    "rss_system": ("rss_system_test", "RSSSystemTester", "run_all_tests"),
+    "persistence": ("persistence_stress_test", "PersistenceStressTester", "run_all_tests"),
+}
+
+# Source patterns that make a test unsafe to run next to others
+EXCLUSIVE_MARKERS = [
+    (re.compile(r"\.post\([^)]*refresh"), "POST refresh"),
+    (re.compile(r"submit_refresh\("), "POST refresh"),
+    (re.compile(r"/app/data|data_dir|DATA_DIR"), "fichiers /app/data"),
+    (re.compile(r"perf_counter|percentile\("), "mesure de temps"),
+]
+SELF_CALL = re.compile(r"self\.(\w+)\(")
+
+
+class ThreadLocalStdout(io.TextIOBase):
+    """sys.stdout replacement: threads that started a capture write to their own buffer"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def start_capture(self):
+        self.local.buffer = io.StringIO()
+
+    def stop_capture(self) -> str:
+        buffer = self.local.buffer
+        del self.local.buffer
+        return buffer.getvalue()
+
+    def write(self, text: str) -> int:
+        buffer = getattr(self.local, "buffer", None)
+        return (buffer or self.stream).write(text)
+
+    def flush(self):
+        if getattr(self.local, "buffer", None) is None:
+            self.stream.flush()
+
+
+class TestTask:
+    def __init__(self, suite: str, cls: type, method: str, reasons: List[str]):
+        self.suite = suite
+        self.cls = cls
+        self.method = method
+        self.reasons = reasons
+        self.results: List[Dict[str, Any]] = []
+        self.recorder: Optional[LatencyRecorder] = None
+        self.duration = 0.0
+        self.output = ""
+
+    @property
+    def exclusive(self) -> bool:
+        return bool(self.reasons)
+
+    @property
+    def name(self) -> str:
+        return f"{self.suite}.{self.method}"
+
+
+def exclusive_reasons(cls: type, method: str, seen: Optional[set] = None) -> List[str]:
+    """Markers found in the method source, or in the tester helpers it calls"""
+    seen = seen if seen is not None else set()
+    if method in seen or not callable(getattr(cls, method, None)):
+        return []
+    seen.add(method)
+    try:
+        source = inspect.getsource(getattr(cls, method))
+    except (OSError, TypeError):
+        return []
+    reasons = [reason for pattern, reason in EXCLUSIVE_MARKERS if pattern.search(source)]
+    for helper in SELF_CALL.findall(source):
+        for reason in exclusive_reasons(cls, helper, seen):
+            if reason not in reasons:
+                reasons.append(reason)
+    return reasons
+
+
+def discover(suite: str, all_methods: bool = False) -> List[TestTask]:
+    module_name, class_name, runner = SUITES[suite]
+    cls = getattr(importlib.import_module(module_name), class_name)
+    methods = sorted((name for name in vars(cls) if name.startswith("test_")),
+                     key=lambda name: inspect.getsourcelines(getattr(cls, name))[1])
+    if not all_methods:
+        # Keep the selection and the order of the suite's own runner
+        called = SELF_CALL.findall(inspect.getsource(getattr(cls, runner)))
+        methods = [name for name in dict.fromkeys(called) if name in methods]
+    return [TestTask(suite, cls, name, exclusive_reasons(cls, name)) for name in methods]
+
+
+class SuiteRunner:
+    def __init__(self, tasks: List[TestTask], workers: int = 8):
+        self.tasks = tasks
+        self.workers = max(1, workers)
+        self.lock = threading.Lock()
+        self.stdout = ThreadLocalStdout(sys.stdout)
+
+    def run_task(self, task: TestTask) -> TestTask:
+        self.stdout.start_capture()
+        start = time.perf_counter()
+        try:
+            tester = task.cls()
+            try:
+                getattr(tester, task.method)()
+            except Exception as e:
+                tester.log_test(task.name, False, f"Exception non gérée: {e}")
+            task.results = tester.test_results
+            recorder = getattr(getattr(tester, "session", None), "recorder", None)
+            task.recorder = recorder if isinstance(recorder, LatencyRecorder) else None
+        except Exception as e:
+            task.results = [{"test": task.name, "success": False, "details": f"Testeur indisponible: {e}",
+                             "timestamp": datetime.now().isoformat(), "response_data": None}]
+        finally:
+            task.duration = time.perf_counter() - start
+            task.output = self.stdout.stop_capture()
+        return task
+
+    def report_task(self, task: TestTask):
+        passed = sum(1 for result in task.results if result["success"])
+        with self.lock:
+            tag = "🔒" if task.exclusive else "⚡"
+            print(f"{tag} {task.name} ({task.duration:.1f}s, {passed}/{len(task.results)})")
+            print(task.output, end="")
+
+    def run(self):
+        shared = [task for task in self.tasks if not task.exclusive]
+        exclusive = [task for task in self.tasks if task.exclusive]
+
+        original_stdout = sys.stdout
+        sys.stdout = self.stdout
+        try:
+            print(f"⚡ {len(shared)} tests partagés sur {self.workers} workers")
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                for future in as_completed([executor.submit(self.run_task, task) for task in shared]):
+                    self.report_task(future.result())
+
+            print(f"🔒 {len(exclusive)} tests exclusifs, un à la fois")
+            for task in exclusive:
+                self.report_task(self.run_task(task))
+        finally:
+            sys.stdout = original_stdout
+
+
+def print_plan(tasks: List[TestTask]):
+    for task in tasks:
+        if task.exclusive:
+            print(f"  🔒 {task.name}  ({', '.join(task.reasons)})")
+        else:
+            print(f"  ⚡ {task.name}")
+    print(f"\n{sum(not t.exclusive for t in tasks)} partagés, {sum(t.exclusive for t in tasks)} exclusifs")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Exécution parallèle des méthodes test_* des testeurs")
+    parser.add_argument("--suites", nargs="+", choices=sorted(SUITES), default=list(SUITES))
+    parser.add_argument("--workers", type=int, default=8, help="taille du pool pour les tests partagés")
+    parser.add_argument("--all-methods", action="store_true",
+                        help="toutes les méthodes test_*, pas seulement celles de run_all_tests")
+    parser.add_argument("--list", action="store_true", help="afficher le plan et quitter")
+    parser.add_argument("--output", default="/tmp/run_suites_results.json")
+    args = parser.parse_args()
+
+    tasks = [task for suite in args.suites for task in discover(suite, args.all_methods)]
+    if args.list:
+        print_plan(tasks)
+        return 0
+
+    print("🚀 Exécution parallèle des suites de tests")
+    print("=" * 70)
+    start_time = datetime.now()
+    SuiteRunner(tasks, args.workers).run()
+    duration = (datetime.now() - start_time).total_seconds()
+
+    test_results = []
+    recorder = LatencyRecorder()
+    for task in tasks:
+        test_results.extend({"suite": task.suite, "method": task.method, **result} for result in task.results)
+        if task.recorder is not None:
+            recorder.merge(task.recorder)
+
+    total_tests = len(test_results)
+    passed_tests = sum(1 for result in test_results if result["success"])
+    failed_tests = total_tests - passed_tests
+    serial_time = sum(task.duration for task in tasks)
+
+    print("=" * 70)
+    print("🎯 PARALLEL SUITES SUMMARY")
+    for suite in args.suites:
+        results = [result for result in test_results if result["suite"] == suite]
+        print(f"  {suite:<12} {sum(r['success'] for r in results):>4}/{len(results):<4} "
+              f"({sum(t.duration for t in tasks if t.suite == suite):.1f}s cumulées)")
+    print(f"Total Tests: {total_tests}")
+    print(f"✅ Passed: {passed_tests}")
+    print(f"❌ Failed: {failed_tests}")
+    print(f"⏱️  Duration: {duration:.2f} seconds (séquentiel: {serial_time:.2f}s, "
+          f"x{serial_time / duration if duration else 0:.1f})")
+    if total_tests:
+        print(f"📊 Success Rate: {(passed_tests / total_tests * 100):.1f}%")
+
+    if failed_tests > 0:
+        print("\n❌ FAILED TESTS:")
+        for result in test_results:
+            if not result["success"]:
+                print(f"  - [{result['suite']}] {result['test']}: {result['details']}")
+
+    recorder.print_report()
+    default_memo().print_report()
+    default_store().print_report()
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({
+            "tests": test_results,
+            "tasks": [{"suite": t.suite, "method": t.method, "exclusive": t.reasons, "duration_s": round(t.duration, 2)}
+                      for t in tasks],
+            "duration_s": round(duration, 2),
+            "serial_duration_s": round(serial_time, 2),
+            "latency": recorder.summary(),
+        }, f, indent=2, default=str, ensure_ascii=False)
+    print(f"\n📄 Detailed results saved to: {args.output}")
+
+    return 0 if failed_tests == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
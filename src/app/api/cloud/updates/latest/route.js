@@ -1,40 +1,18 @@
 import { NextResponse } from 'next/server';
-import fs from 'fs';
-import path from 'path';
-
-const CLOUD_CACHE_FILE = path.join(process.cwd(), 'data', 'cloud-cache.json');
-
-function readCloudCache() {
-  try {
-    if (fs.existsSync(CLOUD_CACHE_FILE)) {
-      const data = fs.readFileSync(CLOUD_CACHE_FILE, 'utf8');
-      return JSON.parse(data);
-    }
-    return [];
-  } catch (error) {
-    console.error('Erreur lecture cache cloud:', error);
-    return [];
-  }
-}
+import { cloudStorage } from '@/lib/cloud-storage';
 
 export async function GET(request) {
   try {
     const { searchParams } = new URL(request.url);
     const limit = parseInt(searchParams.get('limit')) || 5;
 
-    // Read all cloud updates from cache
-    let updates = readCloudCache();
-
-    // Sort by publication date (most recent first)
-    updates.sort((a, b) => new Date(b.published_date) - new Date(a.published_date));
-
-    // Get latest updates
-    const latestUpdates = updates.slice(0, limit);
+    // Get latest updates (the cache is kept sorted by publication date)
+    const { updates: latestUpdates, total } = await cloudStorage.getLatestCloudUpdates(limit);
 
     return NextResponse.json({
       updates: latestUpdates,
       count: latestUpdates.length,
-      total: updates.length
+      total: total
     });
 
   } catch (error) {
@@ -1,46 +1,22 @@
 import { NextResponse } from 'next/server';
-import fs from 'fs';
-import path from 'path';
-import CloudRSSFetcher from '@/lib/cloud-rss-fetcher';
+import { submitRefresh, waitForRefreshJob, describeRefreshJob } from '@/lib/refresh-jobs';
 
-const CLOUD_CACHE_FILE = path.join(process.cwd(), 'data', 'cloud-cache.json');
-
-// Ensure data directory exists
-function ensureDataDir() {
-  const dataDir = path.join(process.cwd(), 'data');
-  if (!fs.existsSync(dataDir)) {
-    fs.mkdirSync(dataDir, { recursive: true });
-  }
-}
-
-// Write cloud updates to cache
-function writeCloudCache(updates) {
+// Starts a background refresh job (or joins the one in progress) and answers 202 at once;
+// progress is read from the job's status_url. ?wait=true answers when the job is done.
+export async function POST(request) {
   try {
-    ensureDataDir();
-    fs.writeFileSync(CLOUD_CACHE_FILE, JSON.stringify(updates, null, 2));
-    console.log(`✅ ${updates.length} actualités Cloud sauvegardées dans le cache`);
-  } catch (error) {
-    console.error('Erreur écriture cache cloud:', error);
-  }
-}
-
-export async function POST() {
-  try {
-    console.log('🔄 Début du refresh RSS Cloud...');
-
-    const fetcher = new CloudRSSFetcher();
-    const updates = await fetcher.fetchAllFeeds();
-
-    // Save to cache
-    writeCloudCache(updates);
-
-    console.log(`✅ Refresh RSS Cloud terminé : ${updates.length} actualités`);
-
-    return NextResponse.json({
-      success: true,
-      message: `${updates.length} actualités Cloud récupérées et sauvegardées`,
-      count: updates.length
-    });
+    const { job, coalesced } = submitRefresh('cloud');
+
+    if (new URL(request.url).searchParams.get('wait') === 'true') {
+      await waitForRefreshJob(job);
+      if (job.status === 'failed') {
+        throw new Error(job.error);
+      }
+      return NextResponse.json({ ...job.result, coalesced, callers: job.callers, job: describeRefreshJob(job) });
+    }
+
+    const status = describeRefreshJob(job);
+    return NextResponse.json({ ...status, coalesced }, { status: 202, headers: { Location: status.status_url } });
 
   } catch (error) {
     console.error('❌ Erreur refresh RSS Cloud:', error);
@@ -0,0 +1,23 @@
+import { NextResponse } from 'next/server';
+import { feedCache } from '@/lib/feed-cache';
+
+// Counters of the feed download cache shared by the three fetchers
+export async function GET() {
+  return NextResponse.json(feedCache.stats(), {
+    headers: { 'Cache-Control': 'no-store' }
+  });
+}
+
+// Expire every entry (validators kept): the next refresh revalidates each feed with a
+// conditional GET instead of reusing it. Only for the tests that count feed stub requests:
+// enabled when the feeds come from the stub (RSS_FEED_BASE_URL), absent otherwise.
+export async function POST() {
+  if (!process.env.RSS_FEED_BASE_URL) {
+    return NextResponse.json(
+      { error: 'Expiration du cache de flux réservée aux tests (RSS_FEED_BASE_URL non défini)' },
+      { status: 404 }
+    );
+  }
+  const expired = feedCache.expire();
+  return NextResponse.json({ expired, cache: feedCache.stats() });
+}
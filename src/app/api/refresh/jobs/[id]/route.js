@@ -0,0 +1,19 @@
+import { NextResponse } from 'next/server';
+import { getRefreshJob, describeRefreshJob } from '@/lib/refresh-jobs';
+
+export async function GET(request, { params }) {
+  const { id } = await params;
+  const job = getRefreshJob(id);
+
+  if (!job) {
+    return NextResponse.json(
+      { error: 'Job de refresh introuvable (inconnu ou expiré)', id },
+      { status: 404 }
+    );
+  }
+
+  // Never cached: the status changes until the job is finished
+  return NextResponse.json(describeRefreshJob(job), {
+    headers: { 'Cache-Control': 'no-store' }
+  });
+}
\ No newline at end of file
@@ -4,14 +4,8 @@ import { logger } from '../../../../../lib/logger.js';
 
 export async function GET(request) {
   try {
-    const updates = await starlinkStorage.getAllStarlinkUpdates();
-    
-    // Get unique categories
-    const categories = [...new Set(
-      updates
-        .map(update => update.category)
-        .filter(category => category)
-    )];
+    // Unique categories, read from the counters maintained on write
+    const categories = await starlinkStorage.getStarlinkCategories();
     
     logger.debug(`📋 Catégories Starlink disponibles: ${categories.length}`);
     
@@ -1,35 +1,23 @@
 import { NextResponse } from 'next/server';
-import { starlinkRssFetcher } from '../../../../../lib/starlink-rss-fetcher.js';
-import { starlinkStorage } from '../../../../../lib/starlink-storage.js';
+import { submitRefresh, waitForRefreshJob, describeRefreshJob } from '../../../../../lib/refresh-jobs.js';
 import { logger } from '../../../../../lib/logger.js';
 
+// Starts a background refresh job (or joins the one in progress) and answers 202 at once;
+// progress is read from the job's status_url. ?wait=true answers when the job is done.
 export async function POST(request) {
   try {
-    logger.info('🚀 Démarrage refresh RSS Starlink...');
-    
-    // Fetch all Starlink RSS feeds
-    const allUpdates = await starlinkRssFetcher.fetchAllFeeds();
-    
-    // Store updates
-    let storedCount = 0;
-    for (const updateData of allUpdates) {
-      try {
-        await starlinkStorage.saveStarlinkUpdate(updateData);
-        storedCount++;
-      } catch (error) {
-        logger.error('Erreur stockage update Starlink:', error);
-        continue;
+    const { job, coalesced } = submitRefresh('starlink');
+
+    if (new URL(request.url).searchParams.get('wait') === 'true') {
+      await waitForRefreshJob(job);
+      if (job.status === 'failed') {
+        throw new Error(job.error);
       }
+      return NextResponse.json({ ...job.result, coalesced, callers: job.callers, job: describeRefreshJob(job) });
     }
-    
-    logger.info(`✅ ${storedCount} actualités Starlink stockées sur ${allUpdates.length} récupérées`);
-    
-    return NextResponse.json({
-      message: `${storedCount} actualités Starlink récupérées et sauvegardées`,
-      stored: storedCount,
-      total: allUpdates.length,
-      timestamp: new Date().toISOString()
-    });
+
+    const status = describeRefreshJob(job);
+    return NextResponse.json({ ...status, coalesced }, { status: 202, headers: { Location: status.status_url } });
 
   } catch (error) {
     logger.error('Erreur refresh RSS Starlink:', error);
@@ -4,21 +4,20 @@ import { logger } from '../../../../../lib/logger.js';
 
 export async function GET(request) {
   try {
-    const updates = await starlinkStorage.getAllStarlinkUpdates();
+    // Counters are maintained on write, no need to scan the updates
+    const { stats } = await starlinkStorage.loadStarlinkUpdates();
     
-    // Count by category
-    const categoryStats = {};
-    updates.forEach(update => {
-      const category = update.category || 'uncategorized';
-      categoryStats[category] = (categoryStats[category] || 0) + 1;
-    });
+    const categoryStats = { ...stats.by_category };
+    if (stats.uncategorized > 0) {
+      categoryStats.uncategorized = (categoryStats.uncategorized || 0) + stats.uncategorized;
+    }
     
-    logger.debug(`📊 Stats Starlink: ${updates.length} total`);
+    logger.debug(`📊 Stats Starlink: ${stats.total} total`);
     
     return NextResponse.json({
-      total: updates.length,
+      total: stats.total,
       categories: categoryStats,
-      last_updated: new Date().toISOString()
+      last_updated: stats.last_updated || new Date().toISOString()
     });
 
   } catch (error) {
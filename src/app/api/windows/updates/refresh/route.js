@@ -1,35 +1,22 @@
 import { NextResponse } from 'next/server';
-import { rssFetcher } from '../../../../../lib/rss-fetcher.js';
-import { storage } from '../../../../../lib/storage.js';
-import { logger } from '../../../../../lib/logger.js';
+import { submitRefresh, waitForRefreshJob, describeRefreshJob } from '../../../../../lib/refresh-jobs.js';
 
-export async function POST() {
+// Starts a background refresh job (or joins the one in progress) and answers 202 at once;
+// progress is read from the job's status_url. ?wait=true answers when the job is done.
+export async function POST(request) {
   try {
-    logger.info('🚀 Démarrage mise à jour RSS manuelle...');
-    
-    // Fetch all RSS feeds
-    const allUpdates = await rssFetcher.fetchAllFeeds();
-    
-    // Store updates in database
-    let storedCount = 0;
-    for (const updateData of allUpdates) {
-      try {
-        await storage.saveWindowsUpdate(updateData);
-        storedCount++;
-      } catch (error) {
-        console.error('Erreur stockage update:', error);
-        continue;
+    const { job, coalesced } = submitRefresh('windows');
+
+    if (new URL(request.url).searchParams.get('wait') === 'true') {
+      await waitForRefreshJob(job);
+      if (job.status === 'failed') {
+        throw new Error(job.error);
       }
+      return NextResponse.json({ ...job.result, coalesced, callers: job.callers, job: describeRefreshJob(job) });
     }
-    
-    console.log(`✅ ${storedCount} mises à jour stockées sur ${allUpdates.length} récupérées`);
-    
-    return NextResponse.json({
-      message: 'Mise à jour des flux RSS terminée',
-      stored: storedCount,
-      total: allUpdates.length,
-      timestamp: new Date().toISOString()
-    });
+
+    const status = describeRefreshJob(job);
+    return NextResponse.json({ ...status, coalesced }, { status: 202, headers: { Location: status.status_url } });
 
   } catch (error) {
     console.error('❌ Erreur refresh RSS:', error);
@@ -8,7 +8,8 @@ export async function GET() {
     return NextResponse.json({
       total: stats.total,
       by_category: stats.by_category,
-      last_updated: new Date().toISOString()
+      last_updated: stats.last_updated || new Date().toISOString(),
+      cache: storage.getCacheStats()
     });
 
   } catch (error) {
@@ -1,12 +1,14 @@
 'use client';
 
 import { useState, useEffect } from 'react';
+import { runRefreshJob, refreshLabel } from '@/lib/refresh-client';
 
 export default function VeilleCloud() {
   const [updates, setUpdates] = useState([]);
   const [stats, setStats] = useState({ total: 0 });
   const [loading, setLoading] = useState(true);
   const [refreshing, setRefreshing] = useState(false);
+  const [refreshJob, setRefreshJob] = useState(null);
   const [error, setError] = useState(null);
   const [selectedCategory, setSelectedCategory] = useState('all');
   const [filterType, setFilterType] = useState('category'); // 'category' or 'service'
@@ -59,20 +61,15 @@ export default function VeilleCloud() {
   const refreshRSS = async () => {
     try {
       setRefreshing(true);
-      const response = await fetch('/api/cloud/updates/refresh', {
-        method: 'POST'
-      });
-      
-      if (response.ok) {
-        await fetchUpdates();
-      } else {
-        throw new Error('Erreur lors du refresh RSS Cloud');
-      }
+      // Background job: poll its status, then reload the list once it is done
+      await runRefreshJob('/api/cloud/updates/refresh', { onProgress: setRefreshJob });
+      await fetchUpdates();
     } catch (error) {
       console.error('Erreur refresh RSS Cloud:', error);
       setError('Erreur lors du rafraîchissement des données RSS Cloud');
     } finally {
       setRefreshing(false);
+      setRefreshJob(null);
     }
   };
 
@@ -169,7 +166,7 @@ export default function VeilleCloud() {
                 <svg className={`w-5 h-5 ${refreshing ? 'animate-spin' : ''}`} fill="none" stroke="currentColor" viewBox="0 0 24 24">
                   <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M4 4v5h.582m15.356 2A8.001 8.001 0 004.582 9m0 0H9m11 11v-5h-.581m0 0a8.003 8.003 0 01-15.357-2m15.357 2H15" />
                 </svg>
-                <span>{refreshing ? 'Actualisation...' : 'Actualiser RSS'}</span>
+                <span>{refreshing ? refreshLabel(refreshJob) : 'Actualiser RSS'}</span>
               </button>
             </div>
 
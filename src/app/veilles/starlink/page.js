@@ -1,12 +1,14 @@
 'use client';
 
 import { useState, useEffect } from 'react';
+import { runRefreshJob, refreshLabel } from '@/lib/refresh-client';
 
 export default function VeilleStarlink() {
   const [updates, setUpdates] = useState([]);
   const [stats, setStats] = useState({ total: 0 });
   const [loading, setLoading] = useState(true);
   const [refreshing, setRefreshing] = useState(false);
+  const [refreshJob, setRefreshJob] = useState(null);
   const [error, setError] = useState(null);
   const [selectedCategory, setSelectedCategory] = useState('all');
 
@@ -83,20 +85,15 @@ export default function VeilleStarlink() {
   const refreshRSS = async () => {
     try {
       setRefreshing(true);
-      const response = await fetch('/api/starlink/updates/refresh', {
-        method: 'POST'
-      });
-      
-      if (response.ok) {
-        await fetchUpdates();
-      } else {
-        throw new Error('Erreur lors du refresh RSS Starlink');
-      }
+      // Background job: poll its status, then reload the list once it is done
+      await runRefreshJob('/api/starlink/updates/refresh', { onProgress: setRefreshJob });
+      await fetchUpdates();
     } catch (error) {
       console.error('Erreur refresh RSS Starlink:', error);
       setError('Erreur lors du rafraîchissement des données RSS Starlink');
     } finally {
       setRefreshing(false);
+      setRefreshJob(null);
     }
   };
 
@@ -185,7 +182,7 @@ export default function VeilleStarlink() {
                 <svg className={`w-5 h-5 ${refreshing ? 'animate-spin' : ''}`} fill="none" stroke="currentColor" viewBox="0 0 24 24">
                   <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M4 4v5h.582m15.356 2A8.001 8.001 0 004.582 9m0 0H9m11 11v-5h-.581m0 0a8.003 8.003 0 01-15.357-2m15.357 2H15" />
                 </svg>
-                <span>{refreshing ? 'Actualisation...' : 'Actualiser RSS'}</span>
+                <span>{refreshing ? refreshLabel(refreshJob) : 'Actualiser RSS'}</span>
               </button>
             </div>
 
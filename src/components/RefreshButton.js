@@ -1,31 +1,29 @@
 'use client';
 
 import { useState } from 'react';
+import { runRefreshJob, refreshLabel } from '@/lib/refresh-client';
 
 export default function RefreshButton() {
   const [refreshing, setRefreshing] = useState(false);
   const [message, setMessage] = useState(null);
+  const [job, setJob] = useState(null);
 
   const refreshRSS = async () => {
     try {
       setRefreshing(true);
       setMessage(null);
-      const response = await fetch('/api/windows/updates/refresh', {
-        method: 'POST'
-      });
-      
-      if (response.ok) {
-        setMessage('Actualisation réussie !');
-        // Recharger la page pour voir les nouvelles données
-        window.location.reload();
-      } else {
-        setMessage('Erreur lors de l\'actualisation');
-      }
+      // The refresh runs as a background job: follow its progress instead of holding the request
+      await runRefreshJob('/api/windows/updates/refresh', { onProgress: setJob });
+
+      setMessage('Actualisation réussie !');
+      // Recharger la page pour voir les nouvelles données
+      window.location.reload();
     } catch (error) {
       console.error('Erreur refresh RSS:', error);
-      setMessage('Erreur de connexion');
+      setMessage('Erreur lors de l\'actualisation');
     } finally {
       setRefreshing(false);
+      setJob(null);
       // Effacer le message après 3 secondes
       setTimeout(() => setMessage(null), 3000);
     }
@@ -41,7 +39,7 @@ export default function RefreshButton() {
         <svg className={`w-5 h-5 ${refreshing ? 'animate-spin' : ''}`} fill="none" stroke="currentColor" viewBox="0 0 24 24">
           <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M4 4v5h.582m15.356 2A8.001 8.001 0 004.582 9m0 0H9m11 11v-5h-.581m0 0a8.003 8.003 0 01-15.357-2m15.357 2H15" />
         </svg>
-        <span>{refreshing ? 'Actualisation...' : 'Actualiser RSS'}</span>
+        <span>{refreshing ? refreshLabel(job) : 'Actualiser RSS'}</span>
       </button>
       {message && (
         <span className={`mt-2 text-sm font-medium ${message.includes('Erreur') ? 'text-red-600' : 'text-green-600'}`}>
@@ -1,6 +1,12 @@
 // Service RSS pour récupérer et traiter les flux Cloud Computing
 import { formatDistanceToNow } from 'date-fns';
 import { fr } from 'date-fns/locale';
+import { getFetchSettings, resolveFeedUrl } from './fetch-utils.js';
+import { feedCache } from './feed-cache.js';
+import { CompiledTranslator } from './translator.js';
+import { CLOUD_TRANSLATIONS } from './translations.js';
+
+const cloudTranslator = new CompiledTranslator(CLOUD_TRANSLATIONS);
 
 class CloudRSSFetcher {
   constructor() {
@@ -61,36 +67,40 @@ class CloudRSSFetcher {
   }
 
   async fetchFeed(sourceKey) {
+    const { updates } = await this.fetchFeedDetailed(sourceKey);
+    return updates;
+  }
+
+  // Fetch one source; reports the outcome (bytes downloaded, 304) instead of throwing
+  async fetchFeedDetailed(sourceKey) {
     try {
       const source = this.sources[sourceKey];
-      if (!source) return [];
+      if (!source) return { updates: [], status: 'error', error: 'Source inconnue', bytes: 0, not_modified: false, cache: null };
 
       console.log(`☁️ Récupération du feed Cloud : ${source.name}`);
 
-      const response = await fetch(source.url, {
+      // Shared feed cache: a URL already downloaded by any fetcher within the TTL is reused, an
+      // older one is revalidated by a conditional GET (304: not downloaded nor parsed again)
+      const { items: updates, cache, notModified, bytes } = await feedCache.fetchFeed(resolveFeedUrl(source.url), {
         headers: {
           'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
           'Accept': 'application/rss+xml, application/xml, text/xml, */*',
           'Accept-Encoding': 'identity'
         },
-        next: { revalidate: 3600 } // Cache for 1 hour
+        // Parse XML manually for better control
+        parse: (xmlText) => this.parseRSSFeed(xmlText, source),
+        parseKey: `cloud:${sourceKey}`,
+        timeoutMs: getFetchSettings().timeoutMs
       });
-
-      if (!response.ok) {
-        throw new Error(`HTTP ${response.status}`);
-      }
-
-      const xmlText = await response.text();
-      
-      // Parse XML manually for better control
-      const updates = this.parseRSSFeed(xmlText, source);
       
-      console.log(`✅ ${updates.length} actualités Cloud récupérées de ${source.name}`);
-      return updates;
+      console.log(cache !== 'miss'
+        ? `♻️ ${source.name} ${cache === 'hit' ? 'en cache' : 'inchangé (304)'}, ${updates.length} actualités Cloud reprises`
+        : `✅ ${updates.length} actualités Cloud récupérées de ${source.name}`);
+      return { updates, status: { hit: 'cached', revalidated: 'not_modified', miss: 'ok' }[cache], error: null, bytes, not_modified: notModified, cache };
 
     } catch (error) {
       console.error(`❌ Erreur récupération feed Cloud ${sourceKey}:`, error);
-      return [];
+      return { updates: [], status: 'error', error: error.message, bytes: 0, not_modified: false, cache: null };
     }
   }
 
@@ -391,140 +401,8 @@ class CloudRSSFetcher {
   }
 
   translateToFrench(text) {
-    if (!text) return text;
-
-    // Comprehensive cloud-specific translations
-    const translations = {
-      // Phrases complètes d'abord (ordre important)
-      'announcing general availability': 'annonce de la disponibilité générale',
-      'now generally available': 'maintenant disponible de manière générale',
-      'public preview': 'aperçu public',
-      'private preview': 'aperçu privé',
-      'now available': 'maintenant disponible',
-      'introducing': 'présentation de',
-      'we are excited to announce': 'nous sommes ravis d\'annoncer',
-      'we are pleased to announce': 'nous sommes heureux d\'annoncer',
-      'appeared first on': 'est paru en premier sur',
-      'the post': 'l\'article',
-      'read more': 'lire la suite',
-      
-      // Cloud computing terms
-      'cloud computing': 'cloud computing',
-      'cloud': 'cloud',
-      'software as a service': 'logiciel en tant que service',
-      'platform as a service': 'plateforme en tant que service',
-      'infrastructure as a service': 'infrastructure en tant que service',
-      'function as a service': 'fonction en tant que service',
-      'saas': 'SaaS',
-      'paas': 'PaaS',
-      'iaas': 'IaaS',
-      'faas': 'FaaS',
-      
-      // Deployment models
-      'public cloud': 'cloud public',
-      'private cloud': 'cloud privé',
-      'hybrid cloud': 'cloud hybride',
-      'multi-cloud': 'multi-cloud',
-      
-      // Technical terms
-      'serverless': 'sans serveur',
-      'container': 'conteneur',
-      'containers': 'conteneurs',
-      'kubernetes': 'Kubernetes',
-      'docker': 'Docker',
-      'microservices': 'microservices',
-      'api gateway': 'passerelle API',
-      'load balancer': 'répartiteur de charge',
-      'auto-scaling': 'mise à l\'échelle automatique',
-      'elasticity': 'élasticité',
-      
-      // Storage terms
-      'storage': 'stockage',
-      'object storage': 'stockage objet',
-      'block storage': 'stockage bloc',
-      'file storage': 'stockage fichier',
-      'backup': 'sauvegarde',
-      'snapshot': 'instantané',
-      'replication': 'réplication',
-      
-      // Networking terms
-      'virtual network': 'réseau virtuel',
-      'vpc': 'VPC',
-      'subnet': 'sous-réseau',
-      'firewall': 'pare-feu',
-      'cdn': 'CDN',
-      'content delivery network': 'réseau de diffusion de contenu',
-      
-      // Security terms
-      'security': 'sécurité',
-      'encryption': 'chiffrement',
-      'authentication': 'authentification',
-      'authorization': 'autorisation',
-      'compliance': 'conformité',
-      'vulnerability': 'vulnérabilité',
-      'threat': 'menace',
-      'zero trust': 'zéro confiance',
-      
-      // DevOps terms
-      'devops': 'DevOps',
-      'ci/cd': 'CI/CD',
-      'continuous integration': 'intégration continue',
-      'continuous deployment': 'déploiement continu',
-      'pipeline': 'pipeline',
-      'automation': 'automatisation',
-      
-      // Database terms
-      'database': 'base de données',
-      'relational database': 'base de données relationnelle',
-      'nosql': 'NoSQL',
-      'data warehouse': 'entrepôt de données',
-      'big data': 'big data',
-      
-      // AI/ML terms
-      'artificial intelligence': 'intelligence artificielle',
-      'machine learning': 'apprentissage automatique',
-      'deep learning': 'apprentissage profond',
-      'neural network': 'réseau de neurones',
-      
-      // Common terms
-      'update': 'mise à jour',
-      'updates': 'mises à jour',
-      'feature': 'fonctionnalité',
-      'features': 'fonctionnalités',
-      'new features': 'nouvelles fonctionnalités',
-      'performance': 'performance',
-      'improvements': 'améliorations',
-      'enhancement': 'amélioration',
-      'enhancements': 'améliorations',
-      'release': 'version',
-      'available': 'disponible',
-      'enterprise': 'entreprise',
-      'support': 'support',
-      'management': 'gestion',
-      'administration': 'administration',
-      'monitoring': 'surveillance',
-      'logging': 'journalisation',
-      'scalability': 'évolutivité',
-      'reliability': 'fiabilité',
-      'availability': 'disponibilité',
-      'disaster recovery': 'reprise après sinistre',
-      'cost optimization': 'optimisation des coûts',
-      'migration': 'migration',
-      'deployment': 'déploiement'
-    };
-
-    let translatedText = text;
-    
-    // Sort by length descending to replace longer phrases first
-    const sortedTranslations = Object.entries(translations)
-      .sort((a, b) => b[0].length - a[0].length);
-    
-    for (const [english, french] of sortedTranslations) {
-      const regex = new RegExp(`\\b${english}\\b`, 'gi');
-      translatedText = translatedText.replace(regex, french);
-    }
-    
-    return translatedText;
+    // Dictionary compiled once into a single pass, translations memoized (see translator.js)
+    return cloudTranslator.translate(text);
   }
 
   generateId(title, link) {
@@ -538,12 +416,19 @@ class CloudRSSFetcher {
     return Math.abs(hash).toString();
   }
 
-  async fetchAllFeeds() {
+  // onSource(timing) is called as each source finishes (refresh job progress)
+  async fetchAllFeeds(onSource = null) {
     const allUpdates = [];
     
     for (const sourceKey of Object.keys(this.sources)) {
-      const updates = await this.fetchFeed(sourceKey);
-      allUpdates.push(...updates);
+      const sourceStart = Date.now();
+      const result = await this.fetchFeedDetailed(sourceKey);
+      allUpdates.push(...result.updates);
+      if (onSource) {
+        onSource({ key: sourceKey, name: this.sources[sourceKey].name, status: result.status,
+                   count: result.updates.length, duration_ms: Date.now() - sourceStart,
+                   bytes: result.bytes, not_modified: result.not_modified, cache: result.cache, error: result.error });
+      }
     }
     
     // Sort by publication date (most recent first)
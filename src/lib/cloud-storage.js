@@ -0,0 +1,187 @@
+import { promises as fs } from 'fs';
+import path from 'path';
+import { writeJSONAtomic } from './json-persistence.js';
+
+const DAY_MS = 24 * 60 * 60 * 1000;
+
+class CloudStorage {
+  constructor() {
+    this.dataDir = path.join(process.cwd(), 'data');
+    this.cloudCacheFile = path.join(this.dataDir, 'cloud-cache.json');
+    // Parsed snapshot of cloudCacheFile, reused while its mtime and size are unchanged
+    this.cache = null;
+  }
+
+  async ensureDataDir() {
+    try {
+      await fs.access(this.dataDir);
+    } catch {
+      await fs.mkdir(this.dataDir, { recursive: true });
+    }
+  }
+
+  // Counters and distinct values saved alongside the updates
+  computeStats(updates, lastUpdated) {
+    const stats = {
+      total: updates.length,
+      by_category: {},
+      by_provider: {},
+      by_service_type: {},
+      categories: [],
+      providers: [],
+      service_types: [],
+      last_updated: lastUpdated || null
+    };
+    const categories = new Set();
+    const providers = new Set();
+    const serviceTypes = new Set();
+
+    for (const update of updates) {
+      const category = update.category || 'unknown';
+      stats.by_category[category] = (stats.by_category[category] || 0) + 1;
+
+      const provider = update.cloud_provider || 'unknown';
+      stats.by_provider[provider] = (stats.by_provider[provider] || 0) + 1;
+
+      const serviceType = update.service_type || 'unknown';
+      stats.by_service_type[serviceType] = (stats.by_service_type[serviceType] || 0) + 1;
+
+      if (update.category) categories.add(update.category);
+      if (update.cloud_provider) providers.add(update.cloud_provider);
+      if (update.service_type) serviceTypes.add(update.service_type);
+    }
+
+    stats.categories = Array.from(categories).sort();
+    stats.providers = Array.from(providers).sort();
+    stats.service_types = Array.from(serviceTypes).sort();
+    return stats;
+  }
+
+  // Updates sorted by publication date (most recent first) plus their timestamps,
+  // so "recent N days" counts are a binary search
+  buildSnapshot(data) {
+    // Older caches were a bare array of updates
+    const raw = Array.isArray(data) ? { updates: data } : data;
+    const updates = [...(raw.updates || [])]
+      .sort((a, b) => new Date(b.published_date) - new Date(a.published_date));
+    const publishedTimes = updates
+      .map(update => new Date(update.published_date).getTime())
+      .filter(time => !Number.isNaN(time))
+      .sort((a, b) => b - a);
+
+    return {
+      updates,
+      total: updates.length,
+      lastUpdated: raw.lastUpdated || null,
+      stats: raw.stats || this.computeStats(updates, raw.lastUpdated),
+      publishedTimes
+    };
+  }
+
+  async loadCloudUpdates() {
+    try {
+      await this.ensureDataDir();
+
+      const stat = await fs.stat(this.cloudCacheFile);
+      if (this.cache && this.cache.mtimeMs === stat.mtimeMs && this.cache.size === stat.size) {
+        return this.cache.data;
+      }
+
+      const fileContent = await fs.readFile(this.cloudCacheFile, 'utf8');
+      const snapshot = this.buildSnapshot(JSON.parse(fileContent));
+      this.cache = { mtimeMs: stat.mtimeMs, size: stat.size, data: snapshot };
+      return snapshot;
+    } catch (error) {
+      if (error.code !== 'ENOENT') {
+        console.error('Erreur lecture cache cloud:', error);
+      }
+      this.cache = null;
+      return this.buildSnapshot([]);
+    }
+  }
+
+  async saveCloudUpdates(updates) {
+    try {
+      await this.ensureDataDir();
+
+      const lastUpdated = new Date().toISOString();
+      const snapshot = this.buildSnapshot({ updates, lastUpdated });
+      const data = {
+        updates: snapshot.updates,
+        total: snapshot.total,
+        lastUpdated,
+        stats: snapshot.stats
+      };
+
+      await writeJSONAtomic(this.cloudCacheFile, data);
+      console.log(`✅ ${updates.length} actualités Cloud sauvegardées dans le cache`);
+
+      // Our own write: refresh the snapshot without re-reading the file
+      const stat = await fs.stat(this.cloudCacheFile);
+      this.cache = { mtimeMs: stat.mtimeMs, size: stat.size, data: snapshot };
+      return data;
+    } catch (error) {
+      this.cache = null;
+      console.error('Erreur écriture cache cloud:', error);
+      throw error;
+    }
+  }
+
+  async getCloudUpdates({ category = null, provider = null, serviceType = null } = {}) {
+    const { updates } = await this.loadCloudUpdates();
+
+    // Snapshot is already sorted by publication date, filters keep that order
+    return updates.filter(update =>
+      (!category || category === 'all' || update.category === category) &&
+      (!provider || provider === 'all' || update.cloud_provider === provider) &&
+      (!serviceType || serviceType === 'all' || update.service_type === serviceType)
+    );
+  }
+
+  async getLatestCloudUpdates(limit = 5) {
+    const { updates, total } = await this.loadCloudUpdates();
+    return { updates: updates.slice(0, limit), total };
+  }
+
+  countPublishedSince(publishedTimes, since) {
+    // publishedTimes is sorted newest first: find the first entry not after `since`
+    let low = 0;
+    let high = publishedTimes.length;
+    while (low < high) {
+      const mid = (low + high) >> 1;
+      if (publishedTimes[mid] > since) {
+        low = mid + 1;
+      } else {
+        high = mid;
+      }
+    }
+    return low;
+  }
+
+  async getCloudStats() {
+    const { stats, publishedTimes } = await this.loadCloudUpdates();
+    const now = Date.now();
+
+    return {
+      total: stats.total,
+      by_category: { ...stats.by_category },
+      by_provider: { ...stats.by_provider },
+      by_service_type: { ...stats.by_service_type },
+      recent_7_days: this.countPublishedSince(publishedTimes, now - 7 * DAY_MS),
+      recent_30_days: this.countPublishedSince(publishedTimes, now - 30 * DAY_MS),
+      last_updated: stats.last_updated
+    };
+  }
+
+  async getCloudCategories() {
+    const { stats } = await this.loadCloudUpdates();
+
+    return {
+      categories: [...stats.categories],
+      providers: [...stats.providers],
+      service_types: [...stats.service_types]
+    };
+  }
+}
+
+export const cloudStorage = new CloudStorage();
@@ -0,0 +1,173 @@
+// Cache des téléchargements de flux, partagé par les trois fetchers (Windows, Cloud, Starlink)
+// Une URL configurée dans plusieurs veilles (Le Monde Informatique – Sécurité, IT-Connect)
+// n'est téléchargée qu'une fois par fenêtre de fraîcheur, quel que soit le fetcher qui la demande.
+import { fetchTextWithTimeout } from './fetch-utils.js';
+
+const DEFAULT_TTL_MS = 5 * 60 * 1000;
+const DEFAULT_MAX_ENTRIES = 64;
+const DEFAULT_MAX_BYTES = 16 * 1024 * 1024;
+// Stamped by the parsers at parse time: items reused from an earlier cycle get them again
+const TIMESTAMP_FIELDS = ['created_at', 'updated_at'];
+
+function positiveInt(value, fallback) {
+  const parsed = parseInt(value);
+  return parsed > 0 ? parsed : fallback;
+}
+
+// Freshness window and size bounds (configurable)
+export function getFeedCacheSettings() {
+  return {
+    ttlMs: positiveInt(process.env.NEXT_PUBLIC_RSS_FEED_CACHE_TTL_MS, DEFAULT_TTL_MS),
+    maxEntries: positiveInt(process.env.NEXT_PUBLIC_RSS_FEED_CACHE_MAX_ENTRIES, DEFAULT_MAX_ENTRIES),
+    maxBytes: positiveInt(process.env.NEXT_PUBLIC_RSS_FEED_CACHE_MAX_BYTES, DEFAULT_MAX_BYTES)
+  };
+}
+
+// One entry per feed URL, in least-recently-used order (Map insertion order):
+// { body, bytes, etag, lastModified, fetchedAt, parsed: Map(parseKey -> items) }.
+// Within ttlMs an entry is served without any request; after that it is revalidated with a
+// conditional GET (If-None-Match / If-Modified-Since), so a 304 still skips download and parsing.
+export class FeedCache {
+  constructor(settings = getFeedCacheSettings()) {
+    this.ttlMs = settings.ttlMs;
+    this.maxEntries = settings.maxEntries;
+    this.maxBytes = settings.maxBytes;
+    this.entries = new Map();
+    this.inFlight = new Map();
+    this.totalBytes = 0;
+    this.counters = { hits: 0, revalidated: 0, misses: 0, evictions: 0 };
+  }
+
+  // Download (or reuse) a feed and return the items parse(body) gives for it. parseKey names
+  // the parser: the same URL read by two fetchers is parsed once per fetcher, never shared.
+  // Resolves to { items, cache: 'hit' | 'revalidated' | 'miss', notModified, bytes }, bytes being
+  // the body size downloaded by this call; HTTP errors and timeouts throw (and are not cached).
+  async fetchFeed(url, { headers = {}, parse, parseKey = 'default', timeoutMs }) {
+    let entry = this.entries.get(url);
+    let cache = 'hit';
+    let bytes = 0;
+
+    if (entry && Date.now() - entry.fetchedAt < this.ttlMs) {
+      this.touch(url, entry);
+    } else if (this.inFlight.has(url)) {
+      // Another fetcher is downloading this URL right now: share its download
+      entry = await this.inFlight.get(url);
+    } else {
+      const download = this.download(url, entry, headers, timeoutMs);
+      const shared = download.then(({ entry }) => entry);
+      // The failure reaches this caller through `download`; joiners get it from `shared`
+      shared.catch(() => {});
+      this.inFlight.set(url, shared);
+      try {
+        ({ entry, cache } = await download);
+      } finally {
+        this.inFlight.delete(url);
+      }
+      bytes = cache === 'miss' ? entry.bytes : 0;
+    }
+    this.counters[{ hit: 'hits', revalidated: 'revalidated', miss: 'misses' }[cache]]++;
+
+    const reused = entry.parsed.has(parseKey);
+    if (!reused) {
+      entry.parsed.set(parseKey, parse(entry.body));
+    }
+    // Copies; reused items are restamped as a new parse would have, so updated_at keeps moving
+    const now = new Date().toISOString();
+    return {
+      items: entry.parsed.get(parseKey).map(item => {
+        const copy = { ...item };
+        if (reused) {
+          TIMESTAMP_FIELDS.filter(field => field in copy).forEach(field => { copy[field] = now; });
+        }
+        return copy;
+      }),
+      cache,
+      notModified: cache === 'revalidated',
+      bytes
+    };
+  }
+
+  async download(url, previous, headers, timeoutMs) {
+    const conditional = {};
+    if (previous && previous.etag) conditional['If-None-Match'] = previous.etag;
+    if (previous && previous.lastModified) conditional['If-Modified-Since'] = previous.lastModified;
+
+    const { response, text } = await fetchTextWithTimeout(url, {
+      headers: { ...headers, ...conditional },
+      // This cache and the validators replace the Next.js data cache, which would hide upstream changes
+      cache: 'no-store'
+    }, timeoutMs);
+
+    if (response.status === 304 && previous) {
+      previous.fetchedAt = Date.now();
+      // Re-stored rather than touched: it may have been evicted while the request was out
+      this.store(url, previous);
+      return { entry: previous, cache: 'revalidated' };
+    }
+    if (!response.ok) {
+      throw new Error(`HTTP ${response.status}`);
+    }
+
+    const entry = {
+      body: text,
+      bytes: Buffer.byteLength(text, 'utf-8'),
+      etag: response.headers.get('etag'),
+      lastModified: response.headers.get('last-modified'),
+      fetchedAt: Date.now(),
+      parsed: new Map()
+    };
+    this.store(url, entry);
+    return { entry, cache: 'miss' };
+  }
+
+  touch(url, entry) {
+    this.entries.delete(url);
+    this.entries.set(url, entry);
+  }
+
+  store(url, entry) {
+    const previous = this.entries.get(url);
+    if (previous) {
+      this.totalBytes -= previous.bytes;
+      this.entries.delete(url);
+    }
+    this.entries.set(url, entry);
+    this.totalBytes += entry.bytes;
+    // Evict least recently used entries, but always keep the one just stored
+    for (const [key, old] of this.entries) {
+      if (this.entries.size <= this.maxEntries && this.totalBytes <= this.maxBytes) break;
+      if (key === url) continue;
+      this.entries.delete(key);
+      this.totalBytes -= old.bytes;
+      this.counters.evictions++;
+    }
+  }
+
+  // Mark every entry stale: the next fetch of each URL revalidates it with its validators
+  // (conditional GET) instead of serving it from memory. Returns the number of entries.
+  expire() {
+    for (const entry of this.entries.values()) {
+      entry.fetchedAt = 0;
+    }
+    return this.entries.size;
+  }
+
+  stats() {
+    const { hits, revalidated, misses, evictions } = this.counters;
+    const lookups = hits + revalidated + misses;
+    return {
+      entries: this.entries.size,
+      bytes: this.totalBytes,
+      hits,
+      revalidated,
+      misses,
+      evictions,
+      hit_rate: lookups ? Math.round((hits / lookups) * 1000) / 1000 : 0,
+      ttl_ms: this.ttlMs
+    };
+  }
+}
+
+// Kept on globalThis: Next.js can evaluate this module once per route bundle, and the
+// refresh routes and the scheduler must all share the same downloads
+export const feedCache = globalThis.__feedCache || (globalThis.__feedCache = new FeedCache());
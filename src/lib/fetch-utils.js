@@ -0,0 +1,73 @@
+// Outils de récupération des flux : pool de concurrence borné et délais par requête
+
+const DEFAULT_CONCURRENCY = 4;
+const DEFAULT_TIMEOUT_MS = 10000;
+const DEFAULT_REFRESH_BUDGET_MS = 30000;
+
+function positiveInt(value, fallback) {
+  const parsed = parseInt(value);
+  return parsed > 0 ? parsed : fallback;
+}
+
+// Concurrency cap, per-request deadline and overall refresh budget (configurable)
+export function getFetchSettings() {
+  return {
+    concurrency: positiveInt(process.env.NEXT_PUBLIC_RSS_CONCURRENCY, DEFAULT_CONCURRENCY),
+    timeoutMs: positiveInt(process.env.NEXT_PUBLIC_RSS_TIMEOUT_MS, DEFAULT_TIMEOUT_MS),
+    budgetMs: positiveInt(process.env.NEXT_PUBLIC_RSS_REFRESH_BUDGET_MS, DEFAULT_REFRESH_BUDGET_MS)
+  };
+}
+
+// RSS_FEED_BASE_URL points every feed at a local stand-in server (feed_stub_server.py):
+// https://<host>/<path>?<query> becomes <base>/feeds/<host>/<path>?<query>
+export function resolveFeedUrl(url) {
+  const base = process.env.RSS_FEED_BASE_URL;
+  if (!base) return url;
+  const { host, pathname, search } = new URL(url);
+  return `${base.replace(/\/+$/, '')}/feeds/${host}${pathname}${search}`;
+}
+
+export class FetchTimeoutError extends Error {
+  constructor(url, timeoutMs) {
+    super(`Timeout après ${timeoutMs} ms`);
+    this.name = 'FetchTimeoutError';
+    this.url = url;
+    this.timeoutMs = timeoutMs;
+  }
+}
+
+// fetch() and read the body as text, aborting both if they take longer than timeoutMs
+export async function fetchTextWithTimeout(url, options = {}, timeoutMs = DEFAULT_TIMEOUT_MS) {
+  const controller = new AbortController();
+  const timer = setTimeout(() => controller.abort(), timeoutMs);
+  try {
+    const response = await fetch(url, { ...options, signal: controller.signal });
+    const text = await response.text();
+    return { response, text };
+  } catch (error) {
+    if (controller.signal.aborted) {
+      throw new FetchTimeoutError(url, timeoutMs);
+    }
+    throw error;
+  } finally {
+    clearTimeout(timer);
+  }
+}
+
+// Run worker(item, index) over items with at most `limit` calls in flight.
+// Results keep the order of items.
+export async function mapWithConcurrency(items, limit, worker) {
+  const results = new Array(items.length);
+  let next = 0;
+
+  async function runWorker() {
+    while (next < items.length) {
+      const index = next++;
+      results[index] = await worker(items[index], index);
+    }
+  }
+
+  const workers = Array.from({ length: Math.min(Math.max(limit, 1), items.length) }, runWorker);
+  await Promise.all(workers);
+  return results;
+}
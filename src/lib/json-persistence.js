@@ -0,0 +1,72 @@
+// Persistance JSON partagée : écriture compacte, asynchrone et atomique
+import { randomUUID } from 'crypto';
+import { promises as fs } from 'fs';
+import path from 'path';
+
+// One promise chain per file for writes, and another for read-modify-write sequences.
+// Kept on globalThis, like single-flight: a refresh route and the scheduler may be separate
+// module instances and must still queue behind each other on the same file
+const { writeQueues, mutationQueues } = globalThis.__jsonPersistenceQueues ||
+  (globalThis.__jsonPersistenceQueues = { writeQueues: new Map(), mutationQueues: new Map() });
+
+function enqueue(queues, key, task) {
+  const previous = queues.get(key) || Promise.resolve();
+  const current = previous.catch(() => {}).then(task);
+  queues.set(key, current);
+  // Drop the chain once idle so the map does not grow with every write
+  current.catch(() => {}).finally(() => {
+    if (queues.get(key) === current) {
+      queues.delete(key);
+    }
+  });
+  return current;
+}
+
+async function syncDirectory(dirPath) {
+  // Persist the rename itself; not supported on every platform, so best effort
+  let handle;
+  try {
+    handle = await fs.open(dirPath, 'r');
+    await handle.sync();
+  } catch {
+    // ignore
+  } finally {
+    if (handle) await handle.close().catch(() => {});
+  }
+}
+
+async function writeNow(filePath, data) {
+  const payload = JSON.stringify(data);
+  // Unique per write, even across module instances of the same process
+  const tempPath = `${filePath}.${process.pid}.${randomUUID()}.tmp`;
+
+  const handle = await fs.open(tempPath, 'w');
+  try {
+    await handle.writeFile(payload, 'utf-8');
+    await handle.sync();
+  } finally {
+    await handle.close();
+  }
+
+  try {
+    // rename() replaces the file in one step: readers see the old or the new content, never a mix
+    await fs.rename(tempPath, filePath);
+  } catch (error) {
+    await fs.unlink(tempPath).catch(() => {});
+    throw error;
+  }
+  await syncDirectory(path.dirname(filePath));
+
+  return Buffer.byteLength(payload, 'utf-8');
+}
+
+// Write `data` as compact JSON through a temp file, fsync and rename.
+// Writes to the same file are applied in call order. Resolves to the bytes written.
+export function writeJSONAtomic(filePath, data) {
+  return enqueue(writeQueues, filePath, () => writeNow(filePath, data));
+}
+
+// Run a load/modify/save sequence on `filePath` without interleaving with another one
+export function withFileLock(filePath, task) {
+  return enqueue(mutationQueues, filePath, task);
+}
@@ -0,0 +1,49 @@
+// Côté navigateur : lance un refresh (202 + id de job) et suit son statut jusqu'à la fin
+
+const POLL_INITIAL_MS = 500;
+const POLL_MAX_MS = 3000;
+const DEFAULT_TIMEOUT_MS = 5 * 60 * 1000;
+
+// POST `refreshUrl`, then poll the job status with a growing interval.
+// onProgress(status) receives each intermediate status; resolves to the final one.
+export async function runRefreshJob(refreshUrl, { onProgress = null, timeoutMs = DEFAULT_TIMEOUT_MS } = {}) {
+  const response = await fetch(refreshUrl, { method: 'POST' });
+  let status = await response.json().catch(() => ({}));
+  if (!response.ok) {
+    throw new Error(status.error || `Erreur HTTP ${response.status}`);
+  }
+  if (response.status !== 202) {
+    // Synchronous answer: the refresh is already done
+    return status;
+  }
+
+  const deadline = Date.now() + timeoutMs;
+  let interval = POLL_INITIAL_MS;
+  while (status.status === 'queued' || status.status === 'running') {
+    if (onProgress) onProgress(status);
+    if (Date.now() > deadline) {
+      throw new Error('Le refresh prend trop de temps');
+    }
+    await new Promise(resolve => setTimeout(resolve, interval));
+    interval = Math.min(interval * 1.5, POLL_MAX_MS);
+
+    const poll = await fetch(status.status_url, { cache: 'no-store' });
+    if (!poll.ok) {
+      throw new Error(`Statut du refresh indisponible (HTTP ${poll.status})`);
+    }
+    status = await poll.json();
+  }
+
+  if (status.status === 'failed') {
+    throw new Error(status.error || 'Le refresh a échoué');
+  }
+  return status;
+}
+
+// Button label while a job runs: "Actualisation... 3/7 sources"
+export function refreshLabel(status) {
+  if (!status) return 'Actualisation...';
+  if (status.status === 'queued') return 'En attente...';
+  const { done, total } = status.progress || {};
+  return total ? `Actualisation... ${done}/${total} sources` : 'Actualisation...';
+}
@@ -0,0 +1,152 @@
+// Jobs de refresh asynchrones : POST /refresh répond 202 avec un id de job,
+// GET /api/refresh/jobs/[id] donne l'état, la progression par source et les durées
+import { randomUUID } from 'crypto';
+import { refreshWindows, refreshStarlink, refreshCloud, refreshSources } from './refresh-tasks.js';
+
+const RUNNERS = {
+  windows: refreshWindows,
+  starlink: refreshStarlink,
+  cloud: refreshCloud
+};
+
+// One refresh at a time by default: each one holds a whole cache in memory (1 GB VPS)
+const MAX_RUNNING = Math.max(1, parseInt(process.env.REFRESH_MAX_RUNNING_JOBS || '1', 10) || 1);
+const KEEP_FINISHED_MS = 60 * 60 * 1000;
+const KEEP_FINISHED_COUNT = 50;
+
+// Kept on globalThis, like single-flight: the routes may be separate module instances
+const registry = globalThis.__refreshJobs || (globalThis.__refreshJobs = {
+  jobs: new Map(),    // id -> job, finished ones kept for a while
+  active: new Map(),  // kind -> queued or running job
+  queue: [],
+  running: 0
+});
+
+function prune() {
+  const finished = [...registry.jobs.values()].filter(job => job.finished_at);
+  const cutoff = Date.now() - KEEP_FINISHED_MS;
+  finished.forEach((job, index) => {
+    if (job.finished_at < cutoff || index < finished.length - KEEP_FINISHED_COUNT) {
+      registry.jobs.delete(job.id);
+    }
+  });
+}
+
+async function run(job) {
+  job.status = 'running';
+  job.started_at = Date.now();
+  try {
+    const { result, coalesced } = await RUNNERS[job.kind]((timing) => {
+      job.sources[timing.key] = { ...job.sources[timing.key], ...timing };
+    });
+    job.result = result;
+    // Joined a refresh started elsewhere (scheduler): no per-source progress for this job
+    job.joined = coalesced;
+    job.status = 'succeeded';
+  } catch (error) {
+    job.status = 'failed';
+    job.error = error.message;
+  } finally {
+    job.finished_at = Date.now();
+    registry.running--;
+    if (registry.active.get(job.kind) === job) {
+      registry.active.delete(job.kind);
+    }
+    job.resolve(job);
+    drain();
+  }
+}
+
+function drain() {
+  while (registry.running < MAX_RUNNING && registry.queue.length > 0) {
+    registry.running++;
+    run(registry.queue.shift());
+  }
+}
+
+// Queue a refresh of `kind`, or return the one already queued or running.
+// Resolves immediately: { job, coalesced }
+export function submitRefresh(kind) {
+  if (!RUNNERS[kind]) {
+    throw new Error(`Type de refresh inconnu: ${kind}`);
+  }
+  const active = registry.active.get(kind);
+  if (active) {
+    active.callers++;
+    return { job: active, coalesced: true };
+  }
+
+  const job = {
+    id: randomUUID(),
+    kind,
+    status: 'queued',
+    callers: 1,
+    created_at: Date.now(),
+    started_at: null,
+    finished_at: null,
+    sources: {},
+    result: null,
+    error: null,
+    joined: false
+  };
+  for (const { key, name } of refreshSources(kind)) {
+    job.sources[key] = { key, name, status: 'pending' };
+  }
+  job.done = new Promise(resolve => { job.resolve = resolve; });
+
+  prune();
+  registry.jobs.set(job.id, job);
+  registry.active.set(kind, job);
+  registry.queue.push(job);
+  drain();
+  return { job, coalesced: false };
+}
+
+// Queued or running job of `kind`, null when none
+export function activeRefreshJob(kind) {
+  return registry.active.get(kind) || null;
+}
+
+export function getRefreshJob(id) {
+  return registry.jobs.get(id) || null;
+}
+
+// Resolves to the job once it has succeeded or failed
+export function waitForRefreshJob(job) {
+  return job.done;
+}
+
+function iso(ms) {
+  return ms ? new Date(ms).toISOString() : null;
+}
+
+// Public view of a job, as returned by the refresh and status routes
+export function describeRefreshJob(job) {
+  const now = Date.now();
+  const sources = Object.values(job.sources);
+  const result = job.result || {};
+  return {
+    id: job.id,
+    kind: job.kind,
+    status: job.status,
+    status_url: `/api/refresh/jobs/${job.id}`,
+    callers: job.callers,
+    joined: job.joined,
+    created_at: iso(job.created_at),
+    started_at: iso(job.started_at),
+    finished_at: iso(job.finished_at),
+    // Waiting for a slot, then fetching and storing
+    queue_ms: (job.started_at || now) - job.created_at,
+    run_ms: job.started_at ? (job.finished_at || now) - job.started_at : null,
+    duration_ms: (job.finished_at || now) - job.created_at,
+    progress: {
+      done: sources.filter(source => source.status !== 'pending').length,
+      total: sources.length
+    },
+    sources,
+    stored: result.stored ?? result.count ?? null,
+    fetched: result.total ?? result.count ?? null,
+    result: job.result,
+    error: job.error
+  };
+}
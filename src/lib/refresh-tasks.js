@@ -0,0 +1,154 @@
+// Refresh des trois veilles (fetch + sauvegarde), coalescés par single-flight
+// Routes /refresh, RefreshButton et planificateur passent tous par ici : des appels
+// simultanés partagent le même cycle fetch/merge/save et reçoivent le même résultat.
+import { rssFetcher } from './rss-fetcher.js';
+import { storage } from './storage.js';
+import { starlinkRssFetcher } from './starlink-rss-fetcher.js';
+import { starlinkStorage } from './starlink-storage.js';
+import CloudRSSFetcher from './cloud-rss-fetcher.js';
+import { cloudStorage } from './cloud-storage.js';
+import { logger } from './logger.js';
+import { feedCache } from './feed-cache.js';
+import { singleFlight } from './single-flight.js';
+
+export const REFRESH_KEYS = {
+  windows: 'refresh:windows',
+  starlink: 'refresh:starlink',
+  cloud: 'refresh:cloud'
+};
+
+const cloudRssFetcher = new CloudRSSFetcher();
+
+// Sources of each kind, in fetch order (listed by refresh job status before they run)
+export function refreshSources(kind) {
+  const sources = {
+    windows: rssFetcher.sources,
+    starlink: starlinkRssFetcher.sources,
+    cloud: cloudRssFetcher.sources
+  }[kind] || {};
+  return Object.entries(sources).map(([key, source]) => ({ key, name: source.name }));
+}
+
+// Wrap onSource to total what the sources cost: bytes of bodies downloaded, feeds not
+// downloaded (shared feed cache hit, or 304) and the hit rate of the feed cache
+function trackTransfer(onSource) {
+  const transfer = { bytes_downloaded: 0, feeds_skipped: 0, feeds: 0, cache_hits: 0, cache_hit_rate: 0 };
+  const track = (timing) => {
+    transfer.bytes_downloaded += timing.bytes || 0;
+    transfer.feeds_skipped += timing.cache === 'hit' || timing.cache === 'revalidated' ? 1 : 0;
+    transfer.cache_hits += timing.cache === 'hit' ? 1 : 0;
+    transfer.feeds += 1;
+    transfer.cache_hit_rate = Math.round((transfer.cache_hits / transfer.feeds) * 1000) / 1000;
+    if (onSource) onSource(timing);
+  };
+  return { track, transfer };
+}
+
+// Per-refresh transfer totals plus the process-wide feed cache counters
+function transferReport(transfer) {
+  return { ...transfer, cache: feedCache.stats() };
+}
+
+async function runWindowsRefresh(onSource) {
+  logger.info('🚀 Démarrage mise à jour RSS Windows...');
+
+  // Fetch all RSS feeds (concurrently, within the refresh budget)
+  const { track, transfer } = trackTransfer(onSource);
+  const fetchResult = await rssFetcher.fetchAllFeedsDetailed(track);
+  const allUpdates = fetchResult.updates;
+
+  // Store updates in database: one load/merge/save cycle for the whole batch
+  let added = 0;
+  let updated = 0;
+  if (allUpdates.length > 0) {
+    const result = await storage.saveWindowsUpdatesBulk(allUpdates);
+    if (result) {
+      added = result.added;
+      updated = result.updated;
+    }
+  }
+  const storedCount = added + updated;
+
+  console.log(`✅ ${storedCount} mises à jour stockées sur ${allUpdates.length} récupérées`);
+
+  return {
+    message: 'Mise à jour des flux RSS terminée',
+    stored: storedCount,
+    added: added,
+    updated: updated,
+    total: allUpdates.length,
+    fetch: {
+      duration_ms: fetchResult.duration_ms,
+      budget_ms: fetchResult.budget_ms,
+      budget_exceeded: fetchResult.budget_exceeded,
+      timeout_ms: fetchResult.timeout_ms,
+      concurrency: fetchResult.concurrency,
+      sources: fetchResult.sources
+    },
+    transfer: transferReport(transfer),
+    timestamp: new Date().toISOString()
+  };
+}
+
+async function runStarlinkRefresh(onSource) {
+  logger.info('🚀 Démarrage refresh RSS Starlink...');
+
+  // Fetch all Starlink RSS feeds
+  const { track, transfer } = trackTransfer(onSource);
+  const allUpdates = await starlinkRssFetcher.fetchAllFeeds(track);
+
+  // Store updates
+  let storedCount = 0;
+  for (const updateData of allUpdates) {
+    try {
+      await starlinkStorage.saveStarlinkUpdate(updateData);
+      storedCount++;
+    } catch (error) {
+      logger.error('Erreur stockage update Starlink:', error);
+      continue;
+    }
+  }
+
+  logger.info(`✅ ${storedCount} actualités Starlink stockées sur ${allUpdates.length} récupérées`);
+
+  return {
+    message: `${storedCount} actualités Starlink récupérées et sauvegardées`,
+    stored: storedCount,
+    total: allUpdates.length,
+    transfer: transferReport(transfer),
+    timestamp: new Date().toISOString()
+  };
+}
+
+async function runCloudRefresh(onSource) {
+  console.log('🔄 Début du refresh RSS Cloud...');
+
+  const { track, transfer } = trackTransfer(onSource);
+  const updates = await cloudRssFetcher.fetchAllFeeds(track);
+
+  // Save to cache (stats are recomputed with the data)
+  await cloudStorage.saveCloudUpdates(updates);
+
+  console.log(`✅ Refresh RSS Cloud terminé : ${updates.length} actualités`);
+
+  return {
+    success: true,
+    message: `${updates.length} actualités Cloud récupérées et sauvegardées`,
+    count: updates.length,
+    transfer: transferReport(transfer)
+  };
+}
+
+// Each resolves to { result, coalesced, callers, startedAt } (see singleFlight).
+// onSource only sees the sources of a run this call started, not of one it joined.
+export function refreshWindows(onSource = null) {
+  return singleFlight(REFRESH_KEYS.windows, () => runWindowsRefresh(onSource));
+}
+
+export function refreshStarlink(onSource = null) {
+  return singleFlight(REFRESH_KEYS.starlink, () => runStarlinkRefresh(onSource));
+}
+
+export function refreshCloud(onSource = null) {
+  return singleFlight(REFRESH_KEYS.cloud, () => runCloudRefresh(onSource));
+}
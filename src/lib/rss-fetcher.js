@@ -3,6 +3,12 @@ import { parseStringPromise } from 'xml2js';
 import { formatDistanceToNow } from 'date-fns';
 import { fr } from 'date-fns/locale';
 import { logger } from './logger';
+import { getFetchSettings, mapWithConcurrency, resolveFeedUrl, FetchTimeoutError } from './fetch-utils.js';
+import { feedCache } from './feed-cache.js';
+import { CompiledTranslator } from './translator.js';
+import { WINDOWS_TRANSLATIONS } from './translations.js';
+
+const windowsTranslator = new CompiledTranslator(WINDOWS_TRANSLATIONS);
 
 class WindowsRSSFetcher {
   constructor() {
@@ -59,34 +65,45 @@ class WindowsRSSFetcher {
   }
 
   async fetchFeed(sourceKey) {
+    const { updates } = await this.fetchFeedDetailed(sourceKey, getFetchSettings().timeoutMs);
+    return updates;
+  }
+
+  // Fetch one source within timeoutMs; reports the outcome instead of throwing
+  async fetchFeedDetailed(sourceKey, timeoutMs) {
     try {
       const source = this.sources[sourceKey];
-      if (!source) return [];
+      if (!source) return { updates: [], status: 'error', error: 'Source inconnue', bytes: 0, not_modified: false, cache: null };
 
       logger.rss(`📡 Récupération du feed : ${source.name}`);
 
-      const response = await fetch(source.url, {
+      // Shared feed cache: a URL already downloaded by any fetcher within the TTL is reused, an
+      // older one is revalidated by a conditional GET (304: not downloaded nor parsed again)
+      const { items: updates, cache, notModified, bytes } = await feedCache.fetchFeed(resolveFeedUrl(source.url), {
         headers: {
           'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         },
-        next: { revalidate: parseInt(process.env.NEXT_PUBLIC_RSS_CACHE_TIME) || 3600 } // Cache configurable
+        // Parse XML manually for better control
+        parse: (xmlText) => this.parseRSSFeed(xmlText, source),
+        parseKey: `windows:${sourceKey}`,
+        timeoutMs
       });
-
-      if (!response.ok) {
-        throw new Error(`HTTP ${response.status}`);
-      }
-
-      const xmlText = await response.text();
       
-      // Parse XML manually for better control
-      const updates = this.parseRSSFeed(xmlText, source);
-      
-      logger.rss(`✅ ${updates.length} mises à jour récupérées de ${source.name}`);
-      return updates;
+      logger.rss(cache !== 'miss'
+        ? `♻️ ${source.name} ${cache === 'hit' ? 'en cache' : 'inchangé (304)'}, ${updates.length} mises à jour reprises`
+        : `✅ ${updates.length} mises à jour récupérées de ${source.name}`);
+      return { updates, status: { hit: 'cached', revalidated: 'not_modified', miss: 'ok' }[cache], error: null, bytes, not_modified: notModified, cache };
 
     } catch (error) {
       logger.error(`❌ Erreur récupération feed ${sourceKey}:`, error);
-      return [];
+      return {
+        updates: [],
+        status: error instanceof FetchTimeoutError ? 'timeout' : 'error',
+        error: error.message,
+        bytes: 0,
+        not_modified: false,
+        cache: null
+      };
     }
   }
 
@@ -344,89 +361,8 @@ class WindowsRSSFetcher {
   }
 
   translateSimple(text) {
-    if (!text) return text;
-
-    // Improved translation with better context handling
-    const translations = {
-      // Phrases complètes d'abord (ordre important)
-      'tired of all the restarts? get hotpatching for windows server': 'fatigué de tous les redémarrages ? obtenez les correctifs à chaud pour Windows Server',
-      'join us at windows server summit': 'rejoignez-nous au Windows Server Summit',
-      'learn more about our latest innovations': 'en savoir plus sur nos dernières innovations',
-      'now generally available with advanced security': 'maintenant généralement disponible avec une sécurité avancée',
-      'enhanced security and performance': 'sécurité et performances améliorées',
-      'improved performance and cloud agility': 'performances améliorées et agilité cloud',
-      'subscription service': 'service par abonnement',
-      'infrastructure management': 'gestion d\'infrastructure',
-      'cloud capabilities': 'capacités cloud',
-      'efficient it operations': 'opérations IT efficaces',
-      'we are excited to announce': 'nous avons le plaisir d\'annoncer',
-      'we are pleased to announce': 'nous sommes heureux d\'annoncer',
-      'appeared first on': 'est paru en premier sur',
-      'the post': 'l\'article',
-      'this post': 'cet article',
-      
-      // Technical terms
-      'hotpatching': 'correctifs à chaud',
-      'patching': 'application de correctifs',
-      'restarts': 'redémarrages',
-      'reboot': 'redémarrage',
-      'windows server': 'Windows Server',
-      'server': 'serveur',
-      'security': 'sécurité',
-      'update': 'mise à jour',
-      'updates': 'mises à jour',
-      'patch': 'correctif',
-      'patches': 'correctifs',
-      'vulnerability': 'vulnérabilité',
-      'vulnerabilities': 'vulnérabilités',
-      'feature': 'fonctionnalité',
-      'features': 'fonctionnalités',
-      'new features': 'nouvelles fonctionnalités',
-      'performance': 'performances',
-      'improvements': 'améliorations',
-      'enhancement': 'amélioration',
-      'enhancements': 'améliorations',
-      'release': 'version',
-      'preview': 'aperçu',
-      'available': 'disponible',
-      'now available': 'maintenant disponible',
-      'generally available': 'généralement disponible',
-      'public preview': 'aperçu public',
-      'enterprise': 'entreprise',
-      'cloud': 'cloud',
-      'datacenter': 'centre de données',
-      'support': 'prise en charge',
-      'management': 'gestion',
-      'administration': 'administration',
-      'deployment': 'déploiement',
-      'configuration': 'configuration',
-      'installation': 'installation',
-      'upgrade': 'mise à niveau',
-      'migration': 'migration',
-      
-      // Time expressions
-      'and': 'et',
-      'with': 'avec',
-      'for': 'pour',
-      'from': 'de',
-      'to': 'vers',
-      'in': 'dans',
-      'on': 'sur',
-      'at': 'à'
-    };
-    
-    let translatedText = text;
-    
-    // Apply translations in order of length (longest phrases first)
-    const sortedTranslations = Object.entries(translations).sort((a, b) => b[0].length - a[0].length);
-    
-    for (const [english, french] of sortedTranslations) {
-      // Use case-insensitive replacement with word boundaries when appropriate
-      const regex = new RegExp(`\\b${english.replace(/[.*+?^${}()|[\]\\]/g, '\\$&')}\\b`, 'gi');
-      translatedText = translatedText.replace(regex, french);
-    }
-    
-    return translatedText;
+    // Dictionary compiled once into a single pass, translations memoized (see translator.js)
+    return windowsTranslator.translate(text);
   }
 
   isFrenchContent(text) {
@@ -458,27 +394,62 @@ class WindowsRSSFetcher {
   }
 
   async fetchAllFeeds() {
-    const allUpdates = [];
-    
-    for (const sourceKey of Object.keys(this.sources)) {
-      try {
-        const updates = await this.fetchFeed(sourceKey);
-        allUpdates.push(...updates);
-        
-        // Délai configurable entre les requêtes
-        const delay = parseInt(process.env.NEXT_PUBLIC_RSS_REQUEST_DELAY) || 1000;
-        await new Promise(resolve => setTimeout(resolve, delay));
-      } catch (error) {
-        logger.error(`❌ Erreur source ${sourceKey}:`, error);
-        continue;
-      }
-    }
+    const { updates } = await this.fetchAllFeedsDetailed();
+    return updates;
+  }
+
+  // Fetch every source concurrently (bounded pool), each within its own deadline
+  // and all within the refresh budget; returns the updates and per-source timings.
+  // onSource(timing) is called as each source finishes (refresh job progress).
+  async fetchAllFeedsDetailed(onSource = null) {
+    const { concurrency, timeoutMs, budgetMs } = getFetchSettings();
+    const startedAt = Date.now();
+    const deadline = startedAt + budgetMs;
+
+    const results = await mapWithConcurrency(Object.keys(this.sources), concurrency, async (sourceKey) => {
+      const sourceStart = Date.now();
+      const remaining = deadline - sourceStart;
+      const result = remaining > 0
+        ? await this.fetchFeedDetailed(sourceKey, Math.min(timeoutMs, remaining))
+        : { updates: [], status: 'skipped', error: 'Budget de refresh épuisé', bytes: 0, not_modified: false, cache: null };
+
+      const timing = {
+        key: sourceKey,
+        name: this.sources[sourceKey].name,
+        status: result.status,
+        count: result.updates.length,
+        duration_ms: Date.now() - sourceStart,
+        bytes: result.bytes,
+        not_modified: result.not_modified,
+        cache: result.cache,
+        error: result.error
+      };
+      if (onSource) onSource(timing);
+      return { ...timing, updates: result.updates };
+    });
+
+    // Sources are concatenated in declaration order, whatever order they finished in
+    const allUpdates = results.flatMap(result => result.updates);
     
     // Sort by publication date (newest first)
     allUpdates.sort((a, b) => new Date(b.published_date) - new Date(a.published_date));
     
-    logger.rss(`🎯 Total mises à jour récupérées : ${allUpdates.length}`);
-    return allUpdates;
+    const durationMs = Date.now() - startedAt;
+    const bytesDownloaded = results.reduce((sum, result) => sum + result.bytes, 0);
+    const feedsSkipped = results.filter(result => result.cache === 'hit' || result.cache === 'revalidated').length;
+    logger.rss(`🎯 Total mises à jour récupérées : ${allUpdates.length} en ${durationMs} ms ` +
+      `(${bytesDownloaded} octets, ${feedsSkipped} flux non téléchargés)`);
+    return {
+      updates: allUpdates,
+      sources: results.map(({ updates, ...timing }) => timing),
+      bytes_downloaded: bytesDownloaded,
+      feeds_skipped: feedsSkipped,
+      duration_ms: durationMs,
+      budget_ms: budgetMs,
+      budget_exceeded: durationMs > budgetMs,
+      timeout_ms: timeoutMs,
+      concurrency
+    };
   }
 }
 
@@ -1,6 +1,8 @@
 // Planificateur RSS intégré pour Next.js
 import { rssFetcher } from './rss-fetcher.js';
 import { storage } from './storage.js';
+import { submitRefresh, waitForRefreshJob, activeRefreshJob } from './refresh-jobs.js';
+import { singleFlight } from './single-flight.js';
 
 class RSSScheduler {
   constructor() {
@@ -61,19 +63,15 @@ class RSSScheduler {
     try {
       console.log(`🌅 [${new Date().toLocaleTimeString()}] Mise à jour quotidienne démarrée...`);
       
-      // Fetch all RSS feeds
-      const allUpdates = await rssFetcher.fetchAllFeeds();
-      
-      // Store in database using BULK update to avoid O(N) file I/O
-      // This fixes the memory leak/crash issue on 1GB VPS
-      if (allUpdates && allUpdates.length > 0) {
-        const result = await storage.saveWindowsUpdatesBulk(allUpdates);
-        if (result) {
-            console.log(`✅ Mise à jour quotidienne terminée: ${result.added} ajoutés, ${result.updated} mis à jour`);
-        }
-      } else {
-        console.log(`✅ Mise à jour quotidienne terminée: 0 éléments récupérés`);
+      // Submitted like POST /api/windows/updates/refresh: joins a queued or running refresh,
+      // waits for a slot under REFRESH_MAX_RUNNING_JOBS and is listed in /api/refresh/jobs
+      const { job, coalesced } = submitRefresh('windows');
+      await waitForRefreshJob(job);
+      if (job.status === 'failed') {
+        throw new Error(job.error);
       }
+      console.log(`✅ Mise à jour quotidienne terminée (job ${job.id}): ${job.result.added} ajoutés, ` +
+        `${job.result.updated} mis à jour` + (coalesced ? ' (refresh déjà en cours partagé)' : ''));
       
     } catch (error) {
       console.error('❌ Erreur mise à jour quotidienne:', error);
@@ -83,18 +81,30 @@ class RSSScheduler {
   async hourlySecurityCheck() {
     try {
       console.log(`🔍 [${new Date().toLocaleTimeString()}] Vérification sécurité...`);
-      
-      // Fetch only security updates
-      const securityUpdates = await rssFetcher.fetchFeed("microsoft_security");
-      
-      // Filter critical updates
-      const criticalUpdates = securityUpdates.filter(u => u.severity === "Critical");
 
-      if (criticalUpdates.length > 0) {
-        // Use bulk update here too
-        const result = await storage.saveWindowsUpdatesBulk(criticalUpdates);
-        console.log(`🚨 ${criticalUpdates.length} mises à jour critiques détectées (${result ? result.added : 0} nouvelles)`);
-      } else {
+      // A full refresh in progress already fetches and stores the security feed
+      if (activeRefreshJob('windows')) {
+        const { job } = submitRefresh('windows');
+        await waitForRefreshJob(job);
+        console.log(`✅ Vérification sécurité couverte par le refresh en cours (job ${job.id})`);
+        return;
+      }
+
+      const { result: criticalUpdates, coalesced } = await singleFlight('refresh:windows-security', async () => {
+        // Fetch only security updates
+        const securityUpdates = await rssFetcher.fetchFeed("microsoft_security");
+
+        // Filter critical updates
+        const critical = securityUpdates.filter(u => u.severity === "Critical");
+        if (critical.length > 0) {
+          // Use bulk update here too
+          const result = await storage.saveWindowsUpdatesBulk(critical);
+          console.log(`🚨 ${critical.length} mises à jour critiques détectées (${result ? result.added : 0} nouvelles)`);
+        }
+        return critical;
+      });
+
+      if (criticalUpdates.length === 0 && !coalesced) {
         console.log("✅ Aucune nouvelle mise à jour critique");
       }
       
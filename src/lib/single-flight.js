@@ -0,0 +1,31 @@
+// Coalescing des jobs : un seul job en cours par clé, partagé par tous les appelants
+
+// Kept on globalThis: Next.js can evaluate this module once per route bundle, and the
+// refresh routes and the scheduler must all see the same in-flight jobs
+const jobs = globalThis.__singleFlightJobs || (globalThis.__singleFlightJobs = new Map());
+
+// Run task() unless a job with the same key is already running, in which case wait for that one.
+// Resolves to { result, coalesced, callers, startedAt }; a failure is shared by every caller too.
+export async function singleFlight(key, task) {
+  let job = jobs.get(key);
+  const coalesced = Boolean(job);
+  if (!job) {
+    job = { callers: 0, startedAt: new Date().toISOString(), promise: null };
+    job.promise = Promise.resolve()
+      .then(task)
+      .finally(() => {
+        // The next call after completion starts a fresh job
+        if (jobs.get(key) === job) {
+          jobs.delete(key);
+        }
+      });
+    jobs.set(key, job);
+  }
+  job.callers++;
+  const result = await job.promise;
+  return { result, coalesced, callers: job.callers, startedAt: job.startedAt };
+}
+
+export function isInFlight(key) {
+  return jobs.has(key);
+}
@@ -1,6 +1,12 @@
 // Service RSS pour récupérer et traiter les flux Starlink/SpaceX
 import { formatDistanceToNow } from 'date-fns';
 import { fr } from 'date-fns/locale';
+import { getFetchSettings, resolveFeedUrl } from './fetch-utils.js';
+import { feedCache } from './feed-cache.js';
+import { CompiledTranslator } from './translator.js';
+import { STARLINK_TRANSLATIONS } from './translations.js';
+
+const starlinkTranslator = new CompiledTranslator(STARLINK_TRANSLATIONS);
 
 class StarlinkRSSFetcher {
   constructor() {
@@ -33,34 +39,38 @@ class StarlinkRSSFetcher {
   }
 
   async fetchFeed(sourceKey) {
+    const { updates } = await this.fetchFeedDetailed(sourceKey);
+    return updates;
+  }
+
+  // Fetch one source; reports the outcome (bytes downloaded, 304) instead of throwing
+  async fetchFeedDetailed(sourceKey) {
     try {
       const source = this.sources[sourceKey];
-      if (!source) return [];
+      if (!source) return { updates: [], status: 'error', error: 'Source inconnue', bytes: 0, not_modified: false, cache: null };
 
       console.log(`🛰️ Récupération du feed Starlink : ${source.name}`);
 
-      const response = await fetch(source.url, {
+      // Shared feed cache: a URL already downloaded by any fetcher within the TTL is reused, an
+      // older one is revalidated by a conditional GET (304: not downloaded nor parsed again)
+      const { items: updates, cache, notModified, bytes } = await feedCache.fetchFeed(resolveFeedUrl(source.url), {
         headers: {
           'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         },
-        next: { revalidate: 3600 } // Cache for 1 hour
+        // Parse XML manually for better control
+        parse: (xmlText) => this.parseRSSFeed(xmlText, source),
+        parseKey: `starlink:${sourceKey}`,
+        timeoutMs: getFetchSettings().timeoutMs
       });
-
-      if (!response.ok) {
-        throw new Error(`HTTP ${response.status}`);
-      }
-
-      const xmlText = await response.text();
-      
-      // Parse XML manually for better control
-      const updates = this.parseRSSFeed(xmlText, source);
       
-      console.log(`✅ ${updates.length} actualités Starlink récupérées de ${source.name}`);
-      return updates;
+      console.log(cache !== 'miss'
+        ? `♻️ ${source.name} ${cache === 'hit' ? 'en cache' : 'inchangé (304)'}, ${updates.length} actualités Starlink reprises`
+        : `✅ ${updates.length} actualités Starlink récupérées de ${source.name}`);
+      return { updates, status: { hit: 'cached', revalidated: 'not_modified', miss: 'ok' }[cache], error: null, bytes, not_modified: notModified, cache };
 
     } catch (error) {
       console.error(`❌ Erreur récupération feed Starlink ${sourceKey}:`, error);
-      return [];
+      return { updates: [], status: 'error', error: error.message, bytes: 0, not_modified: false, cache: null };
     }
   }
 
@@ -300,85 +310,8 @@ class StarlinkRSSFetcher {
   }
 
   translateToFrench(text) {
-    if (!text) return text;
-
-    // Improved French translation for space/Starlink content
-    const translations = {
-      // Phrases complètes Starlink
-      'starlink satellites launched successfully': 'satellites Starlink lancés avec succès',
-      'spacex launches starlink mission': 'SpaceX lance une mission Starlink',
-      'falcon 9 rocket launches': 'la fusée Falcon 9 décolle',
-      'successful satellite deployment': 'déploiement de satellites réussi',
-      'internet constellation expansion': 'expansion de la constellation internet',
-      'global internet coverage': 'couverture internet mondiale',
-      'low earth orbit satellites': 'satellites en orbite basse terrestre',
-      'space exploration milestone': 'étape de l\'exploration spatiale',
-      'rocket landing successful': 'atterrissage de fusée réussi',
-      'crew dragon mission': 'mission Crew Dragon',
-      'international space station': 'station spatiale internationale',
-      
-      // Technical Starlink terms
-      'starlink': 'Starlink',
-      'spacex': 'SpaceX',
-      'falcon 9': 'Falcon 9',
-      'falcon heavy': 'Falcon Heavy',
-      'starship': 'Starship',
-      'dragon': 'Dragon',
-      'crew dragon': 'Crew Dragon',
-      'cargo dragon': 'Cargo Dragon',
-      'satellites': 'satellites',
-      'satellite': 'satellite',
-      'constellation': 'constellation',
-      'internet service': 'service internet',
-      'broadband': 'haut débit',
-      'launch': 'lancement',
-      'launched': 'lancé',
-      'launches': 'lance',
-      'launching': 'lancement',
-      'mission': 'mission',
-      'orbit': 'orbite',
-      'orbital': 'orbital',
-      'deployment': 'déploiement',
-      'booster': 'propulseur',
-      'landing': 'atterrissage',
-      'recovery': 'récupération',
-      'successful': 'réussi',
-      'milestone': 'étape importante',
-      'expansion': 'expansion',
-      'coverage': 'couverture',
-      'global': 'mondiale',
-      'space': 'espace',
-      'rocket': 'fusée',
-      'spacecraft': 'vaisseau spatial',
-      
-      // Common space terms
-      'and': 'et',
-      'with': 'avec',
-      'for': 'pour',
-      'from': 'de',
-      'to': 'vers',
-      'in': 'dans',
-      'on': 'sur',
-      'at': 'à',
-      'the': 'le/la',
-      'new': 'nouveau',
-      'latest': 'dernier',
-      'first': 'premier',
-      'next': 'prochain'
-    };
-    
-    let translatedText = text;
-    
-    // Apply translations in order of length (longest phrases first)
-    const sortedTranslations = Object.entries(translations).sort((a, b) => b[0].length - a[0].length);
-    
-    for (const [english, french] of sortedTranslations) {
-      // Use case-insensitive replacement with word boundaries when appropriate
-      const regex = new RegExp(`\\b${english.replace(/[.*+?^${}()|[\]\\]/g, '\\$&')}\\b`, 'gi');
-      translatedText = translatedText.replace(regex, french);
-    }
-    
-    return translatedText;
+    // Dictionary compiled once into a single pass, translations memoized (see translator.js)
+    return starlinkTranslator.translate(text);
   }
 
   isFrenchContent(text) {
@@ -408,19 +341,23 @@ class StarlinkRSSFetcher {
     return Math.abs(hash).toString();
   }
 
-  async fetchAllFeeds() {
+  // onSource(timing) is called as each source finishes (refresh job progress)
+  async fetchAllFeeds(onSource = null) {
     const allUpdates = [];
     
     for (const sourceKey of Object.keys(this.sources)) {
-      try {
-        const updates = await this.fetchFeed(sourceKey);
-        allUpdates.push(...updates);
-        
-        // Small delay between requests to be respectful
+      const sourceStart = Date.now();
+      const result = await this.fetchFeedDetailed(sourceKey);
+      allUpdates.push(...result.updates);
+      if (onSource) {
+        onSource({ key: sourceKey, name: this.sources[sourceKey].name, status: result.status,
+                   count: result.updates.length, duration_ms: Date.now() - sourceStart,
+                   bytes: result.bytes, not_modified: result.not_modified, cache: result.cache, error: result.error });
+      }
+
+      // Small delay between downloads to be respectful (a cache hit or a 304 costs the source nothing)
+      if (result.cache !== 'hit' && result.cache !== 'revalidated') {
         await new Promise(resolve => setTimeout(resolve, 1000));
-      } catch (error) {
-        console.error(`❌ Erreur source Starlink ${sourceKey}:`, error);
-        continue;
       }
     }
     
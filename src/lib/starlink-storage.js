@@ -1,11 +1,14 @@
 import { promises as fs } from 'fs';
 import path from 'path';
 import { logger } from './logger.js';
+import { writeJSONAtomic, withFileLock } from './json-persistence.js';
 
 class StarlinkStorage {
   constructor() {
     this.dataDir = path.join(process.cwd(), 'data');
     this.starlinkCacheFile = path.join(this.dataDir, 'starlink-cache.json');
+    // Parsed snapshot of starlinkCacheFile, reused while its mtime and size are unchanged
+    this.cache = null;
   }
 
   async ensureDataDir() {
@@ -16,21 +19,47 @@ class StarlinkStorage {
     }
   }
 
+  // Category counters, total and last-updated value saved alongside the updates
+  computeStats(updates, lastUpdated) {
+    const byCategory = {};
+    let uncategorized = 0;
+    for (const update of updates) {
+      if (update.category) {
+        byCategory[update.category] = (byCategory[update.category] || 0) + 1;
+      } else {
+        uncategorized++;
+      }
+    }
+    return {
+      total: updates.length,
+      by_category: byCategory,
+      uncategorized,
+      last_updated: lastUpdated || null
+    };
+  }
+
   async saveStarlinkUpdates(updates) {
     try {
       await this.ensureDataDir();
       
+      const lastUpdated = new Date().toISOString();
       const data = {
         updates,
-        lastUpdated: new Date().toISOString(),
-        total: updates.length
+        lastUpdated,
+        total: updates.length,
+        stats: this.computeStats(updates, lastUpdated)
       };
       
-      await fs.writeFile(this.starlinkCacheFile, JSON.stringify(data, null, 2));
+      await writeJSONAtomic(this.starlinkCacheFile, data);
       console.log(`✅ ${updates.length} actualités Starlink sauvegardées`);
+
+      // Our own write: refresh the snapshot without re-reading the file
+      const stat = await fs.stat(this.starlinkCacheFile);
+      this.cache = { mtimeMs: stat.mtimeMs, size: stat.size, data };
       
       return data;
     } catch (error) {
+      this.cache = null;
       console.error('❌ Erreur sauvegarde Starlink:', error);
       throw error;
     }
@@ -39,21 +68,31 @@ class StarlinkStorage {
   async loadStarlinkUpdates() {
     try {
       await this.ensureDataDir();
+
+      const stat = await fs.stat(this.starlinkCacheFile);
+      if (this.cache && this.cache.mtimeMs === stat.mtimeMs && this.cache.size === stat.size) {
+        return this.cache.data;
+      }
       
       const fileContent = await fs.readFile(this.starlinkCacheFile, 'utf-8');
       const data = JSON.parse(fileContent);
       
       console.log(`📖 ${data.total || 0} actualités Starlink chargées du cache`);
       
-      return {
-        updates: data.updates || [],
+      const updates = data.updates || [];
+      const snapshot = {
+        updates,
         total: data.total || 0,
-        lastUpdated: data.lastUpdated
+        lastUpdated: data.lastUpdated,
+        stats: data.stats || this.computeStats(updates, data.lastUpdated)
       };
+      this.cache = { mtimeMs: stat.mtimeMs, size: stat.size, data: snapshot };
+      return snapshot;
     } catch (error) {
       if (error.code === 'ENOENT') {
         console.log('📝 Aucun cache Starlink trouvé, retour données vides');
-        return { updates: [], total: 0, lastUpdated: null };
+        this.cache = null;
+        return { updates: [], total: 0, lastUpdated: null, stats: this.computeStats([], null) };
       }
       
       console.error('❌ Erreur chargement cache Starlink:', error);
@@ -63,37 +102,20 @@ class StarlinkStorage {
 
   async getStarlinkStats() {
     const data = await this.loadStarlinkUpdates();
+    const { by_category, uncategorized } = data.stats;
     
-    const stats = {
+    return {
       total: data.total || 0,
       lastUpdated: data.lastUpdated,
-      categories: {}
+      categories: uncategorized > 0
+        ? { ...by_category, unknown: (by_category.unknown || 0) + uncategorized }
+        : { ...by_category }
     };
-
-    // Count by categories
-    if (data.updates) {
-      data.updates.forEach(update => {
-        const category = update.category || 'unknown';
-        stats.categories[category] = (stats.categories[category] || 0) + 1;
-      });
-    }
-
-    return stats;
   }
 
   async getStarlinkCategories() {
     const data = await this.loadStarlinkUpdates();
-    const categories = new Set();
-    
-    if (data.updates) {
-      data.updates.forEach(update => {
-        if (update.category) {
-          categories.add(update.category);
-        }
-      });
-    }
-    
-    return Array.from(categories);
+    return Object.keys(data.stats.by_category);
   }
 
   async getLatestStarlinkUpdates(limit = 10) {
@@ -103,8 +125,8 @@ class StarlinkStorage {
       return [];
     }
     
-    // Sort by publication date (newest first) and limit
-    const sortedUpdates = data.updates
+    // Sort a copy by publication date (newest first): the snapshot is shared
+    const sortedUpdates = [...data.updates]
       .sort((a, b) => new Date(b.published_date) - new Date(a.published_date))
       .slice(0, limit);
     
@@ -136,10 +158,15 @@ class StarlinkStorage {
   }
 
   async saveStarlinkUpdate(updateData) {
+    // Load, append and save as one step so parallel calls do not lose entries
+    return withFileLock(this.starlinkCacheFile, () => this.appendStarlinkUpdate(updateData));
+  }
+
+  async appendStarlinkUpdate(updateData) {
     try {
       // Load existing updates
       const existingData = await this.loadStarlinkUpdates();
-      let updates = existingData.updates || [];
+      let updates = [...(existingData.updates || [])];
 
       // Check if update already exists (by ID or title+link)
       const exists = updates.some(update => 
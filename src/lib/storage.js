@@ -1,11 +1,15 @@
 // Service de stockage JSON local pour remplacer MongoDB
 import fs from 'fs';
 import path from 'path';
+import { writeJSONAtomic, withFileLock } from './json-persistence.js';
 
 class JSONStorage {
   constructor() {
     this.dataDir = path.join(process.cwd(), 'data');
     this.dataFile = path.join(this.dataDir, 'rss-cache.json');
+    // Parsed snapshot of dataFile, reused while its mtime and size are unchanged
+    this.cache = null;
+    this.cacheStats = { hits: 0, misses: 0 };
     this.ensureDataDir();
   }
 
@@ -19,38 +23,80 @@ class JSONStorage {
     }
   }
 
+  // Convert date strings back to Date objects for consistency
+  withDates(update) {
+    return {
+      ...update,
+      published_date: new Date(update.published_date),
+      created_at: new Date(update.created_at),
+      updated_at: new Date(update.updated_at)
+    };
+  }
+
   async loadData() {
     try {
       if (fs.existsSync(this.dataFile)) {
+        const stat = fs.statSync(this.dataFile);
+        if (this.cache && this.cache.mtimeMs === stat.mtimeMs && this.cache.size === stat.size) {
+          this.cacheStats.hits++;
+          return this.cache.data;
+        }
+        this.cacheStats.misses++;
+
         const data = fs.readFileSync(this.dataFile, 'utf-8');
         const parsed = JSON.parse(data);
         
-        // Convert date strings back to Date objects for consistency
         if (parsed.updates) {
-          parsed.updates = parsed.updates.map(update => ({
-            ...update,
-            published_date: new Date(update.published_date),
-            created_at: new Date(update.created_at),
-            updated_at: new Date(update.updated_at)
-          }));
+          parsed.updates = parsed.updates.map(update => this.withDates(update));
+        }
+        // Files written before stats were persisted: count once, then reuse
+        if (!parsed.stats) {
+          parsed.stats = this.computeStats(parsed.updates || [], parsed.lastUpdated);
         }
         
+        this.cache = { mtimeMs: stat.mtimeMs, size: stat.size, data: parsed, views: null };
         return parsed;
       }
     } catch (error) {
       console.error('Erreur chargement données:', error);
     }
     
+    this.cache = null;
     return {
       updates: [],
       lastUpdated: new Date(),
+      stats: this.computeStats([], null),
       version: '1.0'
     };
   }
 
+  // Category counters, total and last-updated value saved alongside the updates
+  computeStats(updates, lastUpdated) {
+    const byCategory = {};
+    for (const update of updates) {
+      const category = update.category || 'unknown';
+      byCategory[category] = (byCategory[category] || 0) + 1;
+    }
+    return {
+      total: updates.length,
+      by_category: byCategory,
+      last_updated: lastUpdated instanceof Date ? lastUpdated.toISOString() : (lastUpdated || null)
+    };
+  }
+
+  getCacheStats() {
+    const lookups = this.cacheStats.hits + this.cacheStats.misses;
+    return {
+      hits: this.cacheStats.hits,
+      misses: this.cacheStats.misses,
+      hit_rate: lookups > 0 ? this.cacheStats.hits / lookups : 0
+    };
+  }
+
   async saveData(data) {
     try {
       // Prepare data for JSON serialization
+      const lastUpdated = new Date().toISOString();
       const dataToSave = {
         ...data,
         updates: data.updates.map(update => ({
@@ -59,13 +105,25 @@ class JSONStorage {
           created_at: update.created_at instanceof Date ? update.created_at.toISOString() : update.created_at,
           updated_at: update.updated_at instanceof Date ? update.updated_at.toISOString() : update.updated_at
         })),
-        lastUpdated: new Date().toISOString()
+        stats: this.computeStats(data.updates, lastUpdated),
+        lastUpdated
       };
 
-      fs.writeFileSync(this.dataFile, JSON.stringify(dataToSave, null, 2), 'utf-8');
+      await writeJSONAtomic(this.dataFile, dataToSave);
+
+      // Our own write: refresh the snapshot without re-reading the file
+      const stat = await fs.promises.stat(this.dataFile);
+      const snapshot = { ...dataToSave, updates: dataToSave.updates.map(update => this.withDates(update)) };
+      this.cache = {
+        mtimeMs: stat.mtimeMs,
+        size: stat.size,
+        data: snapshot,
+        views: this.buildSortedViews(snapshot.updates)
+      };
       return true;
     } catch (error) {
       console.error('Erreur sauvegarde données:', error);
+      this.cache = null;
       return false;
     }
   }
@@ -77,10 +135,21 @@ class JSONStorage {
   }
 
   async saveWindowsUpdatesBulk(newUpdates) {
+    // Concurrent merges would each start from the same snapshot and drop the other's entries
+    return withFileLock(this.dataFile, () => this.mergeWindowsUpdates(newUpdates));
+  }
+
+  async mergeWindowsUpdates(newUpdates) {
     try {
-      const data = await this.loadData();
+      // Work on a copy so the cached snapshot is never left half-merged
+      const snapshot = await this.loadData();
+      const data = { ...snapshot, updates: [...snapshot.updates] };
       let addedCount = 0;
       let updatedCount = 0;
+
+      // Index existing entries by title and by link once, so each lookup is O(1)
+      const titleIndex = this.buildIndex(data.updates, 'title');
+      const linkIndex = this.buildIndex(data.updates, 'link');
       
       for (const updateData of newUpdates) {
          // Convert dates to Date objects if they're strings
@@ -88,19 +157,21 @@ class JSONStorage {
             updateData.published_date = new Date(updateData.published_date);
         }
 
-        // Check if update already exists
-        const existingIndex = data.updates.findIndex(existing => 
-            existing.title === updateData.title || existing.link === updateData.link
-        );
+        // Check if update already exists (first entry matching title or link)
+        const existingIndex = this.findIndexed(titleIndex, linkIndex, updateData);
 
         if (existingIndex !== -1) {
             // Update existing
+            const existing = data.updates[existingIndex];
             updateData.updated_at = new Date();
             // Preserve original created_at
-            if (data.updates[existingIndex].created_at) {
-                updateData.created_at = data.updates[existingIndex].created_at;
+            if (existing.created_at) {
+                updateData.created_at = existing.created_at;
             }
-            data.updates[existingIndex] = { ...data.updates[existingIndex], ...updateData };
+            const merged = { ...existing, ...updateData };
+            this.reindex(titleIndex, existing.title, merged.title, existingIndex);
+            this.reindex(linkIndex, existing.link, merged.link, existingIndex);
+            data.updates[existingIndex] = merged;
             updatedCount++;
         } else {
             // Add new
@@ -108,6 +179,8 @@ class JSONStorage {
             updateData.created_at = new Date();
             updateData.updated_at = new Date();
             data.updates.push(updateData);
+            this.addToIndex(titleIndex, updateData.title, data.updates.length - 1);
+            this.addToIndex(linkIndex, updateData.link, data.updates.length - 1);
             addedCount++;
         }
       }
@@ -128,8 +201,78 @@ class JSONStorage {
     }
   }
 
+  // Map a field value to the ascending list of positions holding it
+  buildIndex(updates, field) {
+    const index = new Map();
+    updates.forEach((update, position) => this.addToIndex(index, update[field], position));
+    return index;
+  }
+
+  addToIndex(index, key, position) {
+    const positions = index.get(key);
+    if (!positions) {
+      index.set(key, [position]);
+    } else {
+      // Keep positions sorted so the first one matches Array.findIndex
+      let i = positions.length;
+      while (i > 0 && positions[i - 1] > position) i--;
+      positions.splice(i, 0, position);
+    }
+  }
+
+  reindex(index, oldKey, newKey, position) {
+    if (oldKey === newKey) return;
+    const positions = index.get(oldKey);
+    if (positions) {
+      const i = positions.indexOf(position);
+      if (i !== -1) positions.splice(i, 1);
+      if (positions.length === 0) index.delete(oldKey);
+    }
+    this.addToIndex(index, newKey, position);
+  }
+
+  findIndexed(titleIndex, linkIndex, updateData) {
+    const byTitle = titleIndex.get(updateData.title);
+    const byLink = linkIndex.get(updateData.link);
+    const candidates = [];
+    if (byTitle) candidates.push(byTitle[0]);
+    if (byLink) candidates.push(byLink[0]);
+    return candidates.length > 0 ? Math.min(...candidates) : -1;
+  }
+
+  // Updates sorted by published_date (newest first), overall and per category
+  buildSortedViews(updates) {
+    const all = [...updates].sort((a, b) => b.published_date - a.published_date);
+    const byCategory = new Map();
+    for (const update of all) {
+      if (!byCategory.has(update.category)) {
+        byCategory.set(update.category, []);
+      }
+      byCategory.get(update.category).push(update);
+    }
+    return { all, byCategory };
+  }
+
+  async getSortedViews() {
+    const data = await this.loadData();
+    if (!this.cache || this.cache.data !== data) {
+      return this.buildSortedViews(data.updates);
+    }
+    if (!this.cache.views) {
+      this.cache.views = this.buildSortedViews(data.updates);
+    }
+    return this.cache.views;
+  }
+
   async getWindowsUpdates(category = null, limit = 50, sortBy = 'published_date') {
     try {
+      if (sortBy === 'published_date') {
+        // Views are already sorted: a top-N query is a slice
+        const views = await this.getSortedViews();
+        const updates = category ? (views.byCategory.get(category) || []) : views.all;
+        return updates.slice(0, limit);
+      }
+
       const data = await this.loadData();
       let updates = [...data.updates];
 
@@ -138,11 +281,6 @@ class JSONStorage {
         updates = updates.filter(update => update.category === category);
       }
 
-      // Sort by specified field
-      if (sortBy === 'published_date') {
-        updates.sort((a, b) => new Date(b.published_date) - new Date(a.published_date));
-      }
-
       // Limit results
       return updates.slice(0, limit);
     } catch (error) {
@@ -157,26 +295,20 @@ class JSONStorage {
 
   async getUpdateStats() {
     try {
-      const data = await this.loadData();
-      const stats = {};
-
-      // Count by category
-      data.updates.forEach(update => {
-        const category = update.category || 'unknown';
-        stats[category] = (stats[category] || 0) + 1;
-      });
+      // Counters are maintained on write, reading them is O(1)
+      const { stats } = await this.loadData();
 
       return {
-        total: data.updates.length,
-        by_category: stats,
-        last_updated: new Date()
+        total: stats.total,
+        by_category: { ...stats.by_category },
+        last_updated: stats.last_updated
       };
     } catch (error) {
       console.error('Erreur calcul stats:', error);
       return {
         total: 0,
         by_category: {},
-        last_updated: new Date()
+        last_updated: null
       };
     }
   }
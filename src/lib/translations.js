@@ -0,0 +1,256 @@
+// Dictionnaires anglais → français des trois veilles, compilés par translator.js
+// Ordre d'application : la clé la plus longue d'abord (voir CompiledTranslator)
+
+// Veille Windows / Microsoft (WindowsRSSFetcher.translateSimple)
+export const WINDOWS_TRANSLATIONS = {
+  // Phrases complètes d'abord (ordre important)
+  'tired of all the restarts? get hotpatching for windows server': 'fatigué de tous les redémarrages ? obtenez les correctifs à chaud pour Windows Server',
+  'join us at windows server summit': 'rejoignez-nous au Windows Server Summit',
+  'learn more about our latest innovations': 'en savoir plus sur nos dernières innovations',
+  'now generally available with advanced security': 'maintenant généralement disponible avec une sécurité avancée',
+  'enhanced security and performance': 'sécurité et performances améliorées',
+  'improved performance and cloud agility': 'performances améliorées et agilité cloud',
+  'subscription service': 'service par abonnement',
+  'infrastructure management': 'gestion d\'infrastructure',
+  'cloud capabilities': 'capacités cloud',
+  'efficient it operations': 'opérations IT efficaces',
+  'we are excited to announce': 'nous avons le plaisir d\'annoncer',
+  'we are pleased to announce': 'nous sommes heureux d\'annoncer',
+  'appeared first on': 'est paru en premier sur',
+  'the post': 'l\'article',
+  'this post': 'cet article',
+
+  // Technical terms
+  'hotpatching': 'correctifs à chaud',
+  'patching': 'application de correctifs',
+  'restarts': 'redémarrages',
+  'reboot': 'redémarrage',
+  'windows server': 'Windows Server',
+  'server': 'serveur',
+  'security': 'sécurité',
+  'update': 'mise à jour',
+  'updates': 'mises à jour',
+  'patch': 'correctif',
+  'patches': 'correctifs',
+  'vulnerability': 'vulnérabilité',
+  'vulnerabilities': 'vulnérabilités',
+  'feature': 'fonctionnalité',
+  'features': 'fonctionnalités',
+  'new features': 'nouvelles fonctionnalités',
+  'performance': 'performances',
+  'improvements': 'améliorations',
+  'enhancement': 'amélioration',
+  'enhancements': 'améliorations',
+  'release': 'version',
+  'preview': 'aperçu',
+  'available': 'disponible',
+  'now available': 'maintenant disponible',
+  'generally available': 'généralement disponible',
+  'public preview': 'aperçu public',
+  'enterprise': 'entreprise',
+  'cloud': 'cloud',
+  'datacenter': 'centre de données',
+  'support': 'prise en charge',
+  'management': 'gestion',
+  'administration': 'administration',
+  'deployment': 'déploiement',
+  'configuration': 'configuration',
+  'installation': 'installation',
+  'upgrade': 'mise à niveau',
+  'migration': 'migration',
+
+  // Time expressions
+  'and': 'et',
+  'with': 'avec',
+  'for': 'pour',
+  'from': 'de',
+  'to': 'vers',
+  'in': 'dans',
+  'on': 'sur',
+  'at': 'à'
+};
+
+// Veille Cloud (CloudRSSFetcher.translateToFrench)
+export const CLOUD_TRANSLATIONS = {
+  // Phrases complètes d'abord (ordre important)
+  'announcing general availability': 'annonce de la disponibilité générale',
+  'now generally available': 'maintenant disponible de manière générale',
+  'public preview': 'aperçu public',
+  'private preview': 'aperçu privé',
+  'now available': 'maintenant disponible',
+  'introducing': 'présentation de',
+  'we are excited to announce': 'nous sommes ravis d\'annoncer',
+  'we are pleased to announce': 'nous sommes heureux d\'annoncer',
+  'appeared first on': 'est paru en premier sur',
+  'the post': 'l\'article',
+  'read more': 'lire la suite',
+
+  // Cloud computing terms
+  'cloud computing': 'cloud computing',
+  'cloud': 'cloud',
+  'software as a service': 'logiciel en tant que service',
+  'platform as a service': 'plateforme en tant que service',
+  'infrastructure as a service': 'infrastructure en tant que service',
+  'function as a service': 'fonction en tant que service',
+  'saas': 'SaaS',
+  'paas': 'PaaS',
+  'iaas': 'IaaS',
+  'faas': 'FaaS',
+
+  // Deployment models
+  'public cloud': 'cloud public',
+  'private cloud': 'cloud privé',
+  'hybrid cloud': 'cloud hybride',
+  'multi-cloud': 'multi-cloud',
+
+  // Technical terms
+  'serverless': 'sans serveur',
+  'container': 'conteneur',
+  'containers': 'conteneurs',
+  'kubernetes': 'Kubernetes',
+  'docker': 'Docker',
+  'microservices': 'microservices',
+  'api gateway': 'passerelle API',
+  'load balancer': 'répartiteur de charge',
+  'auto-scaling': 'mise à l\'échelle automatique',
+  'elasticity': 'élasticité',
+
+  // Storage terms
+  'storage': 'stockage',
+  'object storage': 'stockage objet',
+  'block storage': 'stockage bloc',
+  'file storage': 'stockage fichier',
+  'backup': 'sauvegarde',
+  'snapshot': 'instantané',
+  'replication': 'réplication',
+
+  // Networking terms
+  'virtual network': 'réseau virtuel',
+  'vpc': 'VPC',
+  'subnet': 'sous-réseau',
+  'firewall': 'pare-feu',
+  'cdn': 'CDN',
+  'content delivery network': 'réseau de diffusion de contenu',
+
+  // Security terms
+  'security': 'sécurité',
+  'encryption': 'chiffrement',
+  'authentication': 'authentification',
+  'authorization': 'autorisation',
+  'compliance': 'conformité',
+  'vulnerability': 'vulnérabilité',
+  'threat': 'menace',
+  'zero trust': 'zéro confiance',
+
+  // DevOps terms
+  'devops': 'DevOps',
+  'ci/cd': 'CI/CD',
+  'continuous integration': 'intégration continue',
+  'continuous deployment': 'déploiement continu',
+  'pipeline': 'pipeline',
+  'automation': 'automatisation',
+
+  // Database terms
+  'database': 'base de données',
+  'relational database': 'base de données relationnelle',
+  'nosql': 'NoSQL',
+  'data warehouse': 'entrepôt de données',
+  'big data': 'big data',
+
+  // AI/ML terms
+  'artificial intelligence': 'intelligence artificielle',
+  'machine learning': 'apprentissage automatique',
+  'deep learning': 'apprentissage profond',
+  'neural network': 'réseau de neurones',
+
+  // Common terms
+  'update': 'mise à jour',
+  'updates': 'mises à jour',
+  'feature': 'fonctionnalité',
+  'features': 'fonctionnalités',
+  'new features': 'nouvelles fonctionnalités',
+  'performance': 'performance',
+  'improvements': 'améliorations',
+  'enhancement': 'amélioration',
+  'enhancements': 'améliorations',
+  'release': 'version',
+  'available': 'disponible',
+  'enterprise': 'entreprise',
+  'support': 'support',
+  'management': 'gestion',
+  'administration': 'administration',
+  'monitoring': 'surveillance',
+  'logging': 'journalisation',
+  'scalability': 'évolutivité',
+  'reliability': 'fiabilité',
+  'availability': 'disponibilité',
+  'disaster recovery': 'reprise après sinistre',
+  'cost optimization': 'optimisation des coûts',
+  'migration': 'migration',
+  'deployment': 'déploiement'
+};
+
+// Veille Starlink (StarlinkRSSFetcher.translateToFrench)
+export const STARLINK_TRANSLATIONS = {
+  // Phrases complètes Starlink
+  'starlink satellites launched successfully': 'satellites Starlink lancés avec succès',
+  'spacex launches starlink mission': 'SpaceX lance une mission Starlink',
+  'falcon 9 rocket launches': 'la fusée Falcon 9 décolle',
+  'successful satellite deployment': 'déploiement de satellites réussi',
+  'internet constellation expansion': 'expansion de la constellation internet',
+  'global internet coverage': 'couverture internet mondiale',
+  'low earth orbit satellites': 'satellites en orbite basse terrestre',
+  'space exploration milestone': 'étape de l\'exploration spatiale',
+  'rocket landing successful': 'atterrissage de fusée réussi',
+  'crew dragon mission': 'mission Crew Dragon',
+  'international space station': 'station spatiale internationale',
+
+  // Technical Starlink terms
+  'starlink': 'Starlink',
+  'spacex': 'SpaceX',
+  'falcon 9': 'Falcon 9',
+  'falcon heavy': 'Falcon Heavy',
+  'starship': 'Starship',
+  'dragon': 'Dragon',
+  'crew dragon': 'Crew Dragon',
+  'cargo dragon': 'Cargo Dragon',
+  'satellites': 'satellites',
+  'satellite': 'satellite',
+  'constellation': 'constellation',
+  'internet service': 'service internet',
+  'broadband': 'haut débit',
+  'launch': 'lancement',
+  'launched': 'lancé',
+  'launches': 'lance',
+  'launching': 'lancement',
+  'mission': 'mission',
+  'orbit': 'orbite',
+  'orbital': 'orbital',
+  'deployment': 'déploiement',
+  'booster': 'propulseur',
+  'landing': 'atterrissage',
+  'recovery': 'récupération',
+  'successful': 'réussi',
+  'milestone': 'étape importante',
+  'expansion': 'expansion',
+  'coverage': 'couverture',
+  'global': 'mondiale',
+  'space': 'espace',
+  'rocket': 'fusée',
+  'spacecraft': 'vaisseau spatial',
+
+  // Common space terms
+  'and': 'et',
+  'with': 'avec',
+  'for': 'pour',
+  'from': 'de',
+  'to': 'vers',
+  'in': 'dans',
+  'on': 'sur',
+  'at': 'à',
+  'the': 'le/la',
+  'new': 'nouveau',
+  'latest': 'dernier',
+  'first': 'premier',
+  'next': 'prochain'
+};
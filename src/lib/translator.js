@@ -0,0 +1,168 @@
+// Traduction par dictionnaire anglais → français, compilée une seule fois
+// L'ancienne version construisait une RegExp et faisait un replace complet par entrée du
+// dictionnaire, pour chaque titre et chaque description. Ici le dictionnaire devient une seule
+// alternative (clés les plus longues d'abord), parcourue en une passe, et les textes déjà
+// traduits sont mémorisés dans un LRU borné. Le résultat reste celui des passes successives :
+// les rares textes où une traduction peut former une nouvelle clé avec ses voisins prennent
+// le chemin exact (passes successives, RegExp compilées une fois).
+
+const DEFAULT_CACHE_SIZE = 2000;
+
+function escapeRegExp(text) {
+  return text.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+}
+
+const isWordChar = (char) => /\w/.test(char);
+
+// Entries in application order: longest English phrase first (stable for equal lengths)
+function orderedEntries(dictionary) {
+  return Object.entries(dictionary).sort((a, b) => b[0].length - a[0].length);
+}
+
+function applySequential(entries, text) {
+  let translatedText = text;
+  for (const [english, french] of entries) {
+    const regex = new RegExp(`\\b${escapeRegExp(english)}\\b`, 'gi');
+    translatedText = translatedText.replace(regex, french);
+  }
+  return translatedText;
+}
+
+// Reference version: one case-insensitive, word-bounded replace pass per entry, longest first.
+// CompiledTranslator gives the same output; kept for the translator benchmark.
+export function translateSequential(dictionary, text) {
+  if (!text) return text;
+  return applySequential(orderedEntries(dictionary), text);
+}
+
+// Regex alternative for the entry at `index`. The sequential version replaces a longer entry
+// before a shorter one even when the shorter one starts first in the text; where the end of
+// this key can be the start of a longer key, a negative lookahead leaves the text to that key.
+function alternative(entries, index) {
+  const key = entries[index][0].toLowerCase();
+  const lookaheads = [];
+  for (let offset = 1; offset < key.length; offset++) {
+    if (isWordChar(key[offset - 1]) || !isWordChar(key[offset])) continue;
+    const overlap = key.slice(offset);
+    for (const [english] of entries.slice(0, index)) {
+      const longer = english.toLowerCase();
+      if (longer.length > overlap.length && longer.startsWith(overlap)) {
+        lookaheads.push(`(?!${escapeRegExp(longer.slice(overlap.length))}\\b)`);
+      }
+    }
+  }
+  return escapeRegExp(key) + lookaheads.join('');
+}
+
+// Can a later (shorter) key match across an edge of `text` once it sits in a sentence, i.e.
+// cover part of it and part of its neighbours? Word boundaries hold at both edges of a
+// replacement, so the key must have a non-word character where it crosses an edge.
+function crossesEdge(text, key) {
+  for (let start = 1 - key.length; start < text.length; start++) {
+    const end = start + key.length;
+    if (start >= 0 && end <= text.length) continue;
+    if (start < 0 && isWordChar(key[-start - 1])) continue;
+    if (end > text.length && isWordChar(key[text.length - start])) continue;
+    const from = Math.max(0, start);
+    const to = Math.min(text.length, end);
+    if (text.slice(from, to) === key.slice(from - start, to - start)) return true;
+  }
+  return false;
+}
+
+export class CompiledTranslator {
+  constructor(dictionary, { cacheSize = DEFAULT_CACHE_SIZE } = {}) {
+    const entries = orderedEntries(dictionary);
+    const keys = entries.map(([english]) => english.toLowerCase());
+    // The sequential passes also rewrite what earlier passes wrote: each French text is
+    // stored as it comes out of the passes of the entries that follow it
+    this.replacements = new Map();
+    // Entries whose French text, or one of its intermediate forms, can combine with the
+    // surrounding words into a later key: texts where they match take the exact path
+    this.edgeKeys = new Set();
+    entries.forEach(([, french], index) => {
+      const key = keys[index];
+      if (this.replacements.has(key)) return;
+      const forms = [french];
+      for (const entry of entries.slice(index + 1)) {
+        const next = applySequential([entry], forms[forms.length - 1]);
+        if (next !== forms[forms.length - 1]) forms.push(next);
+      }
+      this.replacements.set(key, forms[forms.length - 1]);
+      const later = keys.slice(index + 1);
+      if (forms.some(form => later.some(other => crossesEdge(form.toLowerCase(), other)))) {
+        this.edgeKeys.add(key);
+      }
+    });
+    this.regex = entries.length
+      ? new RegExp(`\\b(?:${entries.map((entry, index) => alternative(entries, index)).join('|')})\\b`, 'gi')
+      : null;
+    // Exact path: the sequential passes with their regexes compiled once, skipping the
+    // entries whose key does not occur in the text
+    this.passes = entries.map(([english, french], index) => ({
+      key: keys[index],
+      regex: new RegExp(`\\b${escapeRegExp(english)}\\b`, 'gi'),
+      french
+    }));
+    this.cacheSize = cacheSize;
+    this.cache = new Map();
+    this.hits = 0;
+    this.misses = 0;
+    this.exact = 0;
+  }
+
+  translate(text) {
+    if (!text || !this.regex) return text;
+
+    const cached = this.cache.get(text);
+    if (cached !== undefined) {
+      // Most recently used last, so the first key is the one to evict
+      this.cache.delete(text);
+      this.cache.set(text, cached);
+      this.hits++;
+      return cached;
+    }
+    this.misses++;
+
+    let atEdge = false;
+    let translated = text.replace(this.regex, (match) => {
+      const key = match.toLowerCase();
+      atEdge = atEdge || this.edgeKeys.has(key);
+      return this.replacements.get(key) ?? match;
+    });
+    if (atEdge) {
+      translated = this.translateExact(text);
+    }
+    this.cache.set(text, translated);
+    if (this.cache.size > this.cacheSize) {
+      this.cache.delete(this.cache.keys().next().value);
+    }
+    return translated;
+  }
+
+  translateExact(text) {
+    this.exact++;
+    let translated = text;
+    let lower = text.toLowerCase();
+    for (const { key, regex, french } of this.passes) {
+      if (!lower.includes(key)) continue;
+      const next = translated.replace(regex, french);
+      if (next !== translated) {
+        translated = next;
+        lower = translated.toLowerCase();
+      }
+    }
+    return translated;
+  }
+
+  stats() {
+    const lookups = this.hits + this.misses;
+    return {
+      entries: this.cache.size,
+      hits: this.hits,
+      misses: this.misses,
+      exact: this.exact,
+      hit_rate: lookups ? Math.round((this.hits / lookups) * 1000) / 1000 : 0
+    };
+  }
+}
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Générateur de caches synthétiques pour les trois stockages JSON
+Écrit rss-cache.json, starlink-cache.json et cloud-cache.json au format des
+fichiers produits par l'application (mêmes champs que ceux vérifiés par les
+testeurs et cache_validator.py), avec une taille, une répartition des catégories
+et des fournisseurs, une longueur de texte et un étalement des dates réglables.
+Les fichiers sont écrits en flux (compact, comme writeJSONAtomic) : des millions
+d'entrées ne demandent pas plus de mémoire que quelques-unes. Les stats ne sont pas
+écrites, le serveur les recalcule au premier chargement.
+
+Usage:
+    python synthetic_cache.py --size 100000 --out-dir /tmp/data
+    python synthetic_cache.py --kind cloud --size 50000 --provider-mix AWS=5,Azure=3,GCP=2
+    python synthetic_cache.py --kind windows --size 1000000 --category-mix security=1,serveur=3 \\
+        --text-length 800 --spread-days 1825
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+DATA_DIR = os.environ.get("RSS_DATA_DIR", "/app/data")
+
+FILES = {
+    "windows": "rss-cache.json",
+    "starlink": "starlink-cache.json",
+    "cloud": "cloud-cache.json",
+}
+
+WINDOWS_CATEGORIES = ["particuliers", "serveur", "security", "entreprise", "iot"]
+STARLINK_CATEGORIES = ["spacex", "space"]
+CLOUD_CATEGORIES = ["infrastructure", "cloud", "securite", "devops"]
+CLOUD_PROVIDERS = ["AWS", "Azure", "GCP", "OVH", "IBM", "Oracle"]
+SERVICE_TYPES = ["SaaS", "PaaS", "IaaS", "FaaS"]
+
+SOURCES = {
+    "windows": ["Windows Server Blog", "Microsoft Security Response Center", "SQL Server Blog", "Azure Blog"],
+    "starlink": ["SpaceX News", "Space.com", "SpaceNews"],
+    "cloud": ["AWS News Blog", "Azure Updates", "Google Cloud Blog", "LeMagIT Cloud"],
+}
+TITLES = {
+    "windows": ["Mise à jour cumulative", "Correctif de sécurité", "Nouvelle version de Windows Server",
+                "Amélioration des performances", "Préversion de fonctionnalité"],
+    "starlink": ["Lancement Starlink", "Nouveau lot de satellites", "Mise à jour du réseau Starlink",
+                 "Essai de Starship", "Couverture étendue"],
+    "cloud": ["Nouveau service managé", "Disponibilité générale", "Baisse de prix", "Nouvelle région",
+              "Mise à jour de sécurité"],
+}
+WORDS = ("mise à jour sécurité serveur réseau performance service client données cloud déploiement "
+         "version correctif stockage infrastructure satellite lancement orbite disponibilité région "
+         "fonctionnalité administration entreprise migration conteneur").split()
+
+Mix = Union[None, List[str], Dict[str, float]]
+
+
+def iso(dt: datetime) -> str:
+    return dt.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def parse_mix(spec: Optional[str]) -> Optional[Dict[str, float]]:
+    """"security=3,serveur=1" -> {"security": 3.0, "serveur": 1.0} (a bare name weighs 1)"""
+    if not spec:
+        return None
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight) if weight else 1.0
+    return mix
+
+
+def picker(rng: random.Random, mix: Mix, default: List[str]) -> Callable[[], Any]:
+    """Draw from a list (uniform) or a {value: weight} mix"""
+    if isinstance(mix, dict):
+        values, weights = list(mix), list(mix.values())
+        return lambda: rng.choices(values, weights)[0]
+    values = list(mix or default)
+    return lambda: rng.choice(values)
+
+
+def text(rng: random.Random, length: int) -> str:
+    words = []
+    size = 0
+    while size < length:
+        word = rng.choice(WORDS)
+        words.append(word)
+        size += len(word) + 1
+    return (" ".join(words)[:length].rstrip().capitalize() + ".") if length else ""
+
+
+def iter_updates(kind: str, size: int, seed: int = 42, categories: Mix = None, providers: Mix = None,
+                 text_length: int = 240, spread_days: float = 365, now: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+    """Yield `size` synthetic updates with the field schema of `kind`"""
+    rng = random.Random(seed)
+    now = now or datetime.now(timezone.utc)
+    stamp = iso(now)
+    category = picker(rng, categories, {"windows": WINDOWS_CATEGORIES, "starlink": STARLINK_CATEGORIES,
+                                        "cloud": CLOUD_CATEGORIES}[kind])
+    provider = picker(rng, providers, CLOUD_PROVIDERS)
+    spread_minutes = int(spread_days * 24 * 60)
+
+    for i in range(size):
+        cat = category()
+        title = f"{rng.choice(TITLES[kind])} {i}"
+        update = {
+            "id": f"bench-{kind}-{i}",
+            "title": title,
+            "description": text(rng, text_length),
+            "link": f"https://bench.local/{kind}/{i}",
+            "published_date": iso(now - timedelta(minutes=rng.randint(0, spread_minutes))),
+            "category": cat,
+        }
+        if kind == "windows":
+            update.update({
+                "version": rng.choice(["Windows 11 24H2", "Windows Server 2025", "Windows 10 22H2", None]),
+                "kb_number": f"KB{5000000 + i}" if rng.random() < 0.5 else None,
+                "severity": rng.choice(["Critique", "Important", "Modéré"]) if cat == "security" else None,
+                "tags": [cat],
+            })
+        elif kind == "starlink":
+            update.update({
+                "mission": f"Starlink Group {rng.randint(1, 12)}-{rng.randint(1, 30)}" if rng.random() < 0.6 else None,
+                "satellite_count": rng.choice([21, 22, 23, 24, None]),
+                "tags": [cat, "starlink"],
+            })
+        else:
+            cloud_provider = provider()
+            update.update({
+                "service_type": rng.choice(SERVICE_TYPES + [None]),
+                "cloud_provider": cloud_provider,
+                "tags": [cat] + ([cloud_provider.lower()] if cloud_provider else []),
+            })
+        update.update({"source": rng.choice(SOURCES[kind]), "created_at": stamp, "updated_at": stamp})
+        yield update
+
+
+def top_level(kind: str, size: int, now: datetime) -> Dict[str, Any]:
+    """Top-level keys of each cache file, besides "updates" """
+    if kind == "windows":
+        return {"lastUpdated": iso(now), "version": "1.0"}
+    return {"total": size, "lastUpdated": iso(now)}
+
+
+def build_cache(kind: str, size: int, **options) -> Dict[str, Any]:
+    """In-memory payload of a synthetic cache file"""
+    now = options.setdefault("now", datetime.now(timezone.utc))
+    return {"updates": list(iter_updates(kind, size, **options)), **top_level(kind, size, now)}
+
+
+def build_windows_cache(size: int, seed: int = 42, categories: Mix = None, **options) -> Dict[str, Any]:
+    """Build a synthetic rss-cache.json payload with `size` updates"""
+    return build_cache("windows", size, seed=seed, categories=categories, **options)
+
+
+def write_cache(path: str, kind: str, size: int, **options) -> int:
+    """Stream a synthetic cache to `path` (temp file + rename) and return its size in bytes"""
+    now = options.setdefault("now", datetime.now(timezone.utc))
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write('{"updates":[')
+        for index, update in enumerate(iter_updates(kind, size, **options)):
+            if index:
+                f.write(",")
+            f.write(json.dumps(update, ensure_ascii=False, separators=(",", ":")))
+        f.write("]")
+        for key, value in top_level(kind, size, now).items():
+            f.write(f",{json.dumps(key)}:{json.dumps(value)}")
+        f.write("}")
+    os.replace(temp_path, path)
+    return os.path.getsize(path)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Génération de caches JSON synthétiques")
+    parser.add_argument("--kind", choices=["all"] + list(FILES), default="all")
+    parser.add_argument("--size", type=int, default=10000, help="nombre d'entrées par cache")
+    parser.add_argument("--out-dir", default=DATA_DIR)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--category-mix", default=None, metavar="CAT=W,...",
+                        help="répartition des catégories (défaut: catégories réelles, uniforme)")
+    parser.add_argument("--provider-mix", default=None, metavar="PROVIDER=W,...",
+                        help="répartition des fournisseurs cloud")
+    parser.add_argument("--text-length", type=int, default=240, help="longueur des descriptions (caractères)")
+    parser.add_argument("--spread-days", type=float, default=365, help="étalement des dates de publication")
+    args = parser.parse_args()
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    kinds = list(FILES) if args.kind == "all" else [args.kind]
+    for kind in kinds:
+        path = os.path.join(args.out_dir, FILES[kind])
+        size = write_cache(path, kind, args.size, seed=args.seed, categories=parse_mix(args.category_mix),
+                           providers=parse_mix(args.provider_mix), text_length=args.text_length,
+                           spread_days=args.spread_days)
+        print(f"📝 {path}: {args.size} entrées, {size / 1e6:.1f} Mo")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
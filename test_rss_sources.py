@@ -1,36 +1,22 @@
 #!/usr/bin/env python3
 """
 Test individual RSS sources to see which ones are working
+
+Usage:
+    python test_rss_sources.py                 # sequential probe (1 source at a time)
+    python test_rss_sources.py --concurrent    # all sources at once, rate-limited per host
 """
 
-import requests
+import argparse
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
 
-def test_rss_source(name, url):
-    try:
-        print(f"Testing {name}: {url}")
-        response = requests.get(url, timeout=15, headers={
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
-        
-        print(f"  Status: {response.status_code}")
-        print(f"  Content-Type: {response.headers.get('content-type', 'N/A')}")
-        print(f"  Content Length: {len(response.text)} chars")
-        
-        if response.status_code == 200:
-            content = response.text.lower()
-            if 'rss' in content or 'xml' in content or '<item>' in content:
-                print(f"  ✅ Valid RSS/XML content detected")
-            else:
-                print(f"  ❌ No RSS/XML content detected")
-        else:
-            print(f"  ❌ HTTP Error")
-            
-        print()
-        
-    except Exception as e:
-        print(f"  ❌ Error: {str(e)}")
-        print()
+import requests
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+REQUEST_TIMEOUT = 15
 
 # Test all RSS sources from the fetcher
 sources = {
@@ -43,9 +29,146 @@ sources = {
     "Windows IT Pro Blog": "https://techcommunity.microsoft.com/plugins/custom/microsoft/o365/custom-blog-rss?tid=-8648868647972695810"
 }
 
-print("🔍 Testing Individual RSS Sources")
-print("=" * 50)
 
-for name, url in sources.items():
-    test_rss_source(name, url)
-    time.sleep(1)  # Be respectful to servers
\ No newline at end of file
+class HostRateLimiter:
+    """Enforce a minimum delay between two requests sent to the same host"""
+
+    def __init__(self, min_interval: float = 1.0):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_slot = {}
+
+    def wait(self, url: str):
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def probe_rss_source(name, url, limiter=None):
+    """Fetch one source and return its verdict without printing anything"""
+    result = {
+        "name": name,
+        "url": url,
+        "status": None,
+        "content_type": "N/A",
+        "length": 0,
+        "rss_detected": False,
+        "error": None,
+        "duration": 0.0,
+    }
+    if limiter:
+        limiter.wait(url)
+
+    start = time.perf_counter()
+    try:
+        response = requests.get(url, timeout=REQUEST_TIMEOUT, headers={'User-Agent': USER_AGENT})
+        result["status"] = response.status_code
+        result["content_type"] = response.headers.get('content-type', 'N/A')
+        result["length"] = len(response.text)
+        if response.status_code == 200:
+            content = response.text.lower()
+            result["rss_detected"] = 'rss' in content or 'xml' in content or '<item>' in content
+    except Exception as e:
+        result["error"] = str(e)
+    result["duration"] = time.perf_counter() - start
+    return result
+
+
+def print_probe_result(result):
+    print(f"Testing {result['name']}: {result['url']}")
+    if result["error"]:
+        print(f"  ❌ Error: {result['error']}")
+    else:
+        print(f"  Status: {result['status']}")
+        print(f"  Content-Type: {result['content_type']}")
+        print(f"  Content Length: {result['length']} chars")
+
+        if result["status"] == 200:
+            if result["rss_detected"]:
+                print(f"  ✅ Valid RSS/XML content detected")
+            else:
+                print(f"  ❌ No RSS/XML content detected")
+        else:
+            print(f"  ❌ HTTP Error")
+    print(f"  ⏱️  {result['duration']:.2f}s")
+    print()
+
+
+def test_rss_source(name, url):
+    print_probe_result(probe_rss_source(name, url))
+
+
+def probe_sequential(sources, delay=1.0):
+    # Be respectful to servers: only wait when the previous request went to the same host
+    limiter = HostRateLimiter(delay)
+    results = []
+    for name, url in sources.items():
+        result = probe_rss_source(name, url, limiter)
+        print_probe_result(result)
+        results.append(result)
+    return results
+
+
+def probe_host(host_sources, limiter):
+    """Probe the sources of one host in order, spaced by the limiter"""
+    return [probe_rss_source(name, url, limiter) for name, url in host_sources]
+
+
+def probe_concurrent(sources, max_workers=8, host_interval=1.0):
+    """Probe every source at once, with at most max_workers requests in flight
+    and at least host_interval seconds between two requests to the same host.
+    One task per host: a host's spacing delay never holds more than one pool slot,
+    the other slots keep probing the other hosts meanwhile."""
+    limiter = HostRateLimiter(host_interval)
+    by_host = {}
+    for name, url in sources.items():
+        by_host.setdefault(urlparse(url).netloc, []).append((name, url))
+    results = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(probe_host, host_sources, limiter) for host_sources in by_host.values()]
+        for future in as_completed(futures):
+            for result in future.result():
+                print_probe_result(result)
+                results.append(result)
+    return results
+
+
+def print_summary(results, wall_time):
+    print("=" * 50)
+    print("📊 Timings per source")
+    for result in sorted(results, key=lambda r: r["duration"], reverse=True):
+        verdict = "✅" if result["rss_detected"] else "❌"
+        print(f"  {verdict} {result['duration']:6.2f}s  {result['name']}")
+    working = sum(1 for r in results if r["rss_detected"])
+    print(f"\n{working}/{len(results)} sources with valid RSS/XML")
+    print(f"⏱️  Total wall-clock time: {wall_time:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Probe the configured RSS sources")
+    parser.add_argument("--concurrent", action="store_true",
+                        help="probe all sources at once instead of one after another")
+    parser.add_argument("--max-workers", type=int, default=8,
+                        help="maximum number of requests in flight (concurrent mode)")
+    parser.add_argument("--host-interval", type=float, default=1.0,
+                        help="minimum seconds between two requests to the same host")
+    args = parser.parse_args()
+
+    print("🔍 Testing Individual RSS Sources")
+    print("=" * 50)
+
+    start = time.perf_counter()
+    if args.concurrent:
+        results = probe_concurrent(sources, args.max_workers, args.host_interval)
+    else:
+        results = probe_sequential(sources, args.host_interval)
+    print_summary(results, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Benchmark du traducteur compilé (src/lib/translator.js) face à la version séquentielle
+La version séquentielle (translateSequential) est l'ancien algorithme des fetchers : une
+RegExp et un replace complet par entrée du dictionnaire. Le script génère un corpus de
+titres et descriptions mêlant les clés du dictionnaire (casse variée), leurs traductions
+et des mots de remplissage, puis le fait traduire par node :
+    - sortie identique exigée, texte par texte, pour chaque dictionnaire ;
+    - durée de la version séquentielle, du traducteur compilé à froid (LRU vide) et
+      à chaud (textes encore dans le LRU rejoués, comme au refresh suivant).
+
+Usage:
+    python translator_benchmark.py                          # 20000 textes par dictionnaire
+    python translator_benchmark.py --texts 200000 --dictionaries cloud
+    python translator_benchmark.py --corpus titles.json     # liste JSON de textes réels
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+from typing import Any, Dict, List
+
+from node_bridge import lib_module_url, run_node
+
+DICTIONARIES = {
+    "windows": "WINDOWS_TRANSLATIONS",
+    "cloud": "CLOUD_TRANSLATIONS",
+    "starlink": "STARLINK_TRANSLATIONS",
+}
+FILLER = ("the a of our is it get more now new this post your how what why team blog week "
+          "customers today announced during launch summit").split()
+SEPARATORS = [" ", " ", " ", ", ", ". ", " - ", ": ", "? ", " (", ") "]
+MAX_SAMPLES = 5
+
+
+def load_dictionaries() -> Dict[str, Dict[str, str]]:
+    """{kind: {english: french}} as exported by src/lib/translations.js"""
+    return run_node(f"""
+const translations = await import('{lib_module_url("translations.js")}');
+const names = {json.dumps(DICTIONARIES)};
+emit(Object.fromEntries(Object.entries(names).map(([kind, name]) => [kind, translations[name]])));
+""")
+
+
+def build_corpus(dictionary: Dict[str, str], size: int, seed: int = 42, max_parts: int = 24) -> List[str]:
+    """Texts mixing dictionary keys (any case), French values, words cut out of both and filler"""
+    rng = random.Random(seed)
+    keys = list(dictionary)
+    values = list(dictionary.values())
+    words = [word for phrase in keys + values for word in phrase.replace("?", " ").split()] + FILLER
+
+    def token() -> str:
+        draw = rng.random()
+        text = rng.choice(keys) if draw < 0.3 else rng.choice(values) if draw < 0.4 else rng.choice(words)
+        case = rng.random()
+        if case < 0.15:
+            return text.upper()
+        if case < 0.4:
+            return text[:1].upper() + text[1:]
+        return text
+
+    corpus = []
+    for _ in range(size):
+        parts = []
+        for _ in range(rng.randint(1, max_parts)):
+            parts.append(token())
+            parts.append(rng.choice(SEPARATORS))
+        corpus.append("".join(parts).strip())
+    return corpus
+
+
+def run_benchmark(kind: str, corpus: List[str], cache_size: int) -> Dict[str, Any]:
+    """Translate the corpus with both implementations in one node process"""
+    with tempfile.TemporaryDirectory() as workdir:
+        with open(os.path.join(workdir, "corpus.json"), "w", encoding="utf-8") as f:
+            json.dump(corpus, f, ensure_ascii=False)
+        return run_node(f"""
+import fs from 'fs';
+const {{ CompiledTranslator, translateSequential }} = await import('{lib_module_url("translator.js")}');
+const translations = await import('{lib_module_url("translations.js")}');
+const dictionary = translations['{DICTIONARIES[kind]}'];
+const corpus = JSON.parse(fs.readFileSync('corpus.json', 'utf-8'));
+const time = (fn) => {{
+  const start = process.hrtime.bigint();
+  const out = corpus.map(fn);
+  return {{ out, ms: Number(process.hrtime.bigint() - start) / 1e6 }};
+}};
+
+const sequential = time(text => translateSequential(dictionary, text));
+const compileStart = process.hrtime.bigint();
+const translator = new CompiledTranslator(dictionary, {{ cacheSize: {cache_size} }});
+const compileMs = Number(process.hrtime.bigint() - compileStart) / 1e6;
+const cold = time(text => translator.translate(text));
+// Next refresh: the texts still in the LRU come back
+const recent = corpus.slice(-{cache_size});
+const warmStart = process.hrtime.bigint();
+const warmOut = recent.map(text => translator.translate(text));
+const warm = {{ out: warmOut, ms: Number(process.hrtime.bigint() - warmStart) / 1e6 }};
+const offset = corpus.length - recent.length;
+
+const mismatches = [];
+let mismatchCount = 0;
+corpus.forEach((text, index) => {{
+  if (cold.out[index] !== sequential.out[index] ||
+      (index >= offset && warm.out[index - offset] !== sequential.out[index])) {{
+    mismatchCount++;
+    if (mismatches.length < {MAX_SAMPLES}) {{
+      mismatches.push({{ text, expected: sequential.out[index], compiled: cold.out[index] }});
+    }}
+  }}
+}});
+emit({{
+  entries: Object.keys(dictionary).length,
+  texts: corpus.length,
+  changed: corpus.filter((text, index) => sequential.out[index] !== text).length,
+  sequential_ms: sequential.ms,
+  compile_ms: compileMs,
+  cold_ms: cold.ms,
+  warm_ms: warm.ms,
+  warm_texts: recent.length,
+  cache: translator.stats(),
+  mismatch_count: mismatchCount,
+  mismatches
+}});
+""", cwd=workdir, timeout=1800)
+
+
+def print_result(kind: str, result: Dict[str, Any]):
+    status = "✅" if result["mismatch_count"] == 0 else "❌"
+    speedup = result["sequential_ms"] / result["cold_ms"] if result["cold_ms"] else 0
+    print(f"{status} {kind}: {result['texts']} textes ({result['changed']} modifiés), "
+          f"{result['entries']} entrées, {result['mismatch_count']} différence(s)")
+    print(f"    séquentiel {result['sequential_ms']:.0f} ms, compilé {result['cold_ms']:.0f} ms à froid "
+          f"(x{speedup:.1f}, compilation {result['compile_ms']:.1f} ms, {result['cache']['exact']} textes "
+          f"par le chemin exact)")
+    print(f"    à chaud: {result['warm_texts']} textes rejoués en {result['warm_ms']:.1f} ms "
+          f"(LRU {result['cache']['entries']} entrées, taux de succès {result['cache']['hit_rate']})")
+    for sample in result["mismatches"]:
+        print(f"    - {sample['text'][:80]!r}")
+        print(f"      attendu {sample['expected'][:80]!r}")
+        print(f"      compilé {sample['compiled'][:80]!r}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Traducteur compilé vs traduction séquentielle")
+    parser.add_argument("--dictionaries", nargs="+", choices=list(DICTIONARIES), default=list(DICTIONARIES))
+    parser.add_argument("--texts", type=int, default=20000, help="taille du corpus synthétique par dictionnaire")
+    parser.add_argument("--corpus", default=None, metavar="JSON",
+                        help="liste JSON de textes à utiliser à la place du corpus synthétique")
+    parser.add_argument("--cache-size", type=int, default=2000, help="taille du LRU du traducteur compilé")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="/tmp/translator_benchmark_results.json")
+    args = parser.parse_args()
+
+    print("🚀 Benchmark du traducteur compilé")
+    print("=" * 70)
+    custom = None
+    if args.corpus:
+        with open(args.corpus, "r", encoding="utf-8") as f:
+            custom = [text for text in json.load(f) if isinstance(text, str)]
+
+    dictionaries = load_dictionaries()
+    results = {}
+    for kind in args.dictionaries:
+        corpus = custom if custom is not None else build_corpus(dictionaries[kind], args.texts, args.seed)
+        results[kind] = run_benchmark(kind, corpus, args.cache_size)
+        print_result(kind, results[kind])
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"\n📄 Detailed results saved to: {args.output}")
+
+    return 0 if all(result["mismatch_count"] == 0 for result in results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())